@@ -5,134 +5,3072 @@ Documentation build script for Soliplex multi-project documentation.
 
 This script copies documentation from git submodules in the projects/ directory
 into the docs/ directory for Zensical to build. It handles:
-- Updating git submodules
+- Updating git submodules (concurrent, shallow, docs-only)
 - Copying docs/ directories from each project
 - Converting README.md to index.md for projects without docs/
+- Transforming content on the way (MDX to Markdown, README links), cached by hash
+- Incrementally syncing changed files using an on-disk manifest
 - Validating that all referenced files exist
+- Checking internal links and anchors in the copied Markdown
+- Skipping builds whose inputs match the last successful build
+- Writing a machine-readable JSON report of timings and counts
 """
 
+import asyncio
+import ctypes
+import errno
+import hashlib
+import json
+import os
 import platform
+import posixpath
+import re
 import shutil
+import ssl
 import subprocess
+import struct
 import sys
+import threading
+import time
+import tomllib
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urljoin, urlsplit
 
 # Configure stdout for UTF-8 on Windows
 if platform.system() == 'Windows':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+# Local state kept between runs (manifests, caches); never committed
+CACHE_DIR = Path('.build-cache')
+MANIFEST_VERSION = 1
+INVENTORY_VERSION = 1
+REPORT_VERSION = 1
+ASSET_INDEX_VERSION = 1
 
-def update_submodules(skip_update: bool = False) -> bool:
-    """Update all git submodules to latest commit."""
+# Worker pool defaults for the copy stages
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+PARALLEL_FILE_THRESHOLD = 64
+
+# Link checking: cache format and the Markdown constructs that are parsed
+LINK_CACHE_VERSION = 2
+LINK_FENCE_RE = re.compile(r'^(`{3,}|~{3,})')
+LINK_CODE_SPAN_RE = re.compile(r'(`+).+?\1')
+LINK_HEADING_RE = re.compile(r'^#{1,6}\s+(.+?)\s*#*\s*$')
+LINK_ATTR_ID_RE = re.compile(r'\{[^}]*#([\w-]+)[^}]*\}\s*$')
+LINK_INLINE_RE = re.compile(r'!?\[[^\]]*\]\(\s*(<[^>]*>|[^)\s]+)(?:\s+["\'(][^)]*)?\)')
+LINK_REFDEF_RE = re.compile(r'^\s{0,3}\[[^\]]+\]:\s*(\S+)')
+LINK_HTML_RE = re.compile(r'<(?:a|img)\b[^>]*?\b(?:href|src)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+LINK_AUTOLINK_RE = re.compile(r'<((?:https?|ftp)://[^\s<>]+|mailto:[^\s<>]+)>', re.IGNORECASE)
+LINK_BARE_URL_RE = re.compile(r'(?<![\w/@])https?://[^\s<>"\'`]+', re.IGNORECASE)
+LINK_BARE_URL_TRAIL = '.,:;!?*_~\'"'
+LINK_HTML_ID_RE = re.compile(r'<[a-z][^>]*?\b(?:id|name)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+LINK_EXTERNAL_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
+
+# External link checking
+EXTERNAL_LINK_CACHE_VERSION = 1
+EXTERNAL_LINK_RE = re.compile(r'^https?://[^/?#\s]+', re.IGNORECASE)
+EXTERNAL_LINK_CONCURRENCY = 32
+EXTERNAL_LINK_PER_HOST = 4
+EXTERNAL_LINK_TIMEOUT = 15.0
+EXTERNAL_LINK_MAX_REDIRECTS = 5
+EXTERNAL_LINK_DRAIN_LIMIT = 64 * 1024
+EXTERNAL_LINK_TTL_OK = 7 * 24 * 3600
+EXTERNAL_LINK_TTL_FAILED = 3600
+EXTERNAL_LINK_USER_AGENT = 'soliplex-docs-link-check/1.0'
+
+# Post-build pipeline files that change the deployed site; part of the
+# build fingerprint (relative to the repository root)
+FINGERPRINT_PIPELINE_FILES = [
+    'scripts/optimize-site.py',
+    'scripts/deploy-site.py',
+    '.github/workflows/build-docs.yml',
+]
+
+# Submodule fetch: shallow depth and the only paths checked out
+SUBMODULE_DEPTH = 1
+SUBMODULE_SPARSE_PATHS = ['/docs/', '/README.md']
+
+# How synced files are created in docs/
+MATERIALIZE_MODES = ['copy', 'hardlink', 'reflink', 'symlink', 'auto']
+AUTO_MATERIALIZE_ORDER = ['reflink', 'hardlink']
+FICLONE = 0x40049409
+
+# Size-aware copying: files below COPY_LARGE_FILE are copied with a single
+# read and write, larger ones inside the kernel; files below COPY_SMALL_FILE
+# are handed to the file pool in batches
+COPY_SMALL_FILE = 64 * 1024
+COPY_LARGE_FILE = 1024 * 1024
+COPY_BATCH_FILES = 64
+COPY_BATCH_BYTES = 1024 * 1024
+COPY_BUFFER = 1024 * 1024
+COPY_SIZE_CLASSES = ['small', 'medium', 'large']
+O_BINARY = getattr(os, 'O_BINARY', 0)
+
+# Staged builds: projects are copied next to docs/ and swapped in atomically
+STAGING_DIR = '.docs-staging'
+PREVIOUS_DIR = '.docs-previous'
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+# Watch mode: inotify event layout and flags from <sys/inotify.h>
+INOTIFY_EVENT = struct.Struct('iIII')
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+INOTIFY_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM
+    | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+WATCH_DEBOUNCE = 0.15
+WATCH_MAX_DELAY = 1.0
+WATCH_POLL_INTERVAL = 0.5
+
+# Daemon mode: local rebuild endpoint and request coalescing
+DAEMON_BIND = '127.0.0.1'
+DAEMON_PORT = 9002
+DAEMON_DEBOUNCE = 2.0
+DAEMON_MAX_DELAY = 30.0
+
+# Content transforms: enabled by default, and the constructs they rewrite
+DEFAULT_TRANSFORMS = ['snippets', 'mdx', 'readme-links']
+SNIPPET_GRAPH_VERSION = 1
+GIT_METADATA_VERSION = 1
+SNIPPET_LINE_RE = re.compile(r'^(?P<indent>[ \t]*)--8<--[ \t]+(["\'])(?P<path>.+?)\2[ \t]*$')
+SNIPPET_BLOCK_RE = re.compile(r'^(?P<indent>[ \t]*)--8<--[ \t]*$')
+SNIPPET_SECTION_RE = re.compile(r'--8<--[ \t]+\[(start|end):([\w-]+)\]')
+SNIPPET_RANGES_RE = re.compile(r'^[\d,:]*$')
+MDX_STATEMENT_RE = re.compile(
+    r'^(?:import\s+(?:.+\s+from\s+)?["\'][^"\']+["\']'
+    r'|export\s+(?:const|let|var)\s+\w+\s*=\s*[^{\[(]*?);?\s*$'
+)
+MDX_COMMENT_RE = re.compile(r'\{/\*(.*?)\*/\}')
+TRANSFORM_INLINE_RE = re.compile(r'(!?\[[^\]]*\]\(\s*)(<?)([^)\s>]+)(>?)')
+TRANSFORM_REFDEF_RE = re.compile(r'^(\s{0,3}\[[^\]]+\]:\s*<?)([^\s>]+)')
+TRANSFORM_HTML_RE = re.compile(r'(<(?:a|img)\b[^>]*?\b(?:href|src)\s*=\s*["\'])([^"\']+)', re.IGNORECASE)
+
+
+_renameat2 = None
+
+
+def exchange_paths(a: Path, b: Path) -> bool:
+    """
+    Atomically swap two existing paths with renameat2(RENAME_EXCHANGE).
+
+    Returns False where that is unsupported (not Linux, old glibc or
+    kernel, or a filesystem without exchange support).
+    """
+    global _renameat2
+    if platform.system() != 'Linux':
+        return False
+    if _renameat2 is None:
+        _renameat2 = getattr(ctypes.CDLL(None, use_errno=True), 'renameat2', False)
+        if _renameat2:
+            _renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    if not _renameat2:
+        return False
+
+    if _renameat2(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE) == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+    raise OSError(err, os.strerror(err), str(a), None, str(b))
+
+
+class DocsGenerations:
+    """
+    Builds projects next to docs/ and swaps them in atomically.
+
+    A clean copy writes each project into .docs-staging/<project> and, once
+    it is complete, exchanges it with docs/<project> in a single
+    renameat2(RENAME_EXCHANGE) call on Linux, or two renames elsewhere. The
+    replaced tree is kept as .docs-previous/<project> so --rollback can swap
+    it back. A project whose copy fails is never swapped in, so docs/ keeps
+    its last good generation.
+
+    Only clean copies are staged. Incremental, watch and daemon syncs
+    update docs/ in place file by file (each file atomically), so a
+    failure part way leaves that project partly synced until the next
+    sync, and they create no generation to roll back to.
+    """
+
+    def __init__(self, docs_dir: Path):
+        self.docs_dir = docs_dir
+        self.staging_dir = docs_dir.parent / STAGING_DIR
+        self.previous_dir = docs_dir.parent / PREVIOUS_DIR
+        self.swaps = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> Path:
+        """Return an empty staging directory for a project."""
+        staged = self.staging_dir / name
+        if staged.exists():
+            shutil.rmtree(staged)
+        staged.mkdir(parents=True)
+        return staged
+
+    def discard(self, name: str) -> None:
+        shutil.rmtree(self.staging_dir / name, ignore_errors=True)
+
+    def _swap(self, incoming: Path, live: Path, outgoing: Path) -> str:
+        """Move incoming to live and the old live tree to outgoing; returns how."""
+        if not live.exists():
+            os.rename(incoming, live)
+            return 'new'
+        if exchange_paths(incoming, live):
+            os.rename(incoming, outgoing)
+            return 'exchange'
+        os.rename(live, outgoing)
+        os.rename(incoming, live)
+        return 'rename'
+
+    def commit(self, name: str) -> str:
+        """Swap a staged project into docs/, keeping the replaced one as the previous generation."""
+        previous = self.previous_dir / name
+        if previous.exists():
+            shutil.rmtree(previous)
+        previous.parent.mkdir(parents=True, exist_ok=True)
+        method = self._swap(self.staging_dir / name, self.docs_dir / name, previous)
+        with self._lock:
+            self.swaps[method] = self.swaps.get(method, 0) + 1
+        return method
+
+    def rollback(self, name: str) -> str:
+        """
+        Swap a project's previous generation back into docs/.
+
+        The current tree becomes the previous generation, so rolling back
+        twice restores the newer build.
+        """
+        previous = self.previous_dir / name
+        if not previous.is_dir():
+            raise FileNotFoundError(f"No previous generation of {name}")
+        parked = self.staging_dir / f'{name}.rollback'
+        if parked.exists():
+            shutil.rmtree(parked)
+        parked.parent.mkdir(parents=True, exist_ok=True)
+        method = self._swap(previous, self.docs_dir / name, parked)
+        if parked.exists():
+            os.rename(parked, previous)
+        return method
+
+    def available(self) -> List[str]:
+        """Projects that have a previous generation to roll back to."""
+        if not self.previous_dir.is_dir():
+            return []
+        return sorted(entry.name for entry in os.scandir(self.previous_dir) if entry.is_dir())
+
+    def cleanup(self) -> None:
+        """Remove the staging directory once nothing is left in it."""
+        try:
+            self.staging_dir.rmdir()
+        except OSError:
+            pass
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path(project: str) -> Path:
+    """Return the location of a project's sync manifest."""
+    return CACHE_DIR / 'manifests' / f'{project}.json'
+
+
+def load_manifest(project: str) -> Dict[str, Dict]:
+    """
+    Load the sync manifest for a project.
+
+    Returns:
+        Mapping of destination-relative path to its recorded
+        size, mtime_ns and sha256. Empty if missing or unreadable.
+        sha256 is None for files written by a clean copy, which does
+        not hash its sources.
+    """
+    path = manifest_path(project)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_manifest(project: str, files: Dict[str, Dict]) -> None:
+    """Write a project's sync manifest atomically."""
+    path = manifest_path(project)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, f, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def scan_tree(root: Path) -> Dict[str, os.stat_result]:
+    """
+    Return every regular file under root keyed by POSIX relative path.
+
+    Symlinks count as files even when dangling (stat'ed without following
+    them), so links left behind by --materialize symlink get cleaned up.
+    """
+    files = {}
+    if not root.is_dir():
+        return files
+
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file() or (entry.is_symlink() and not entry.is_dir()):
+                    rel = Path(entry.path).relative_to(root).as_posix()
+                    try:
+                        files[rel] = entry.stat()
+                    except FileNotFoundError:
+                        files[rel] = entry.stat(follow_symlinks=False)
+    return files
+
+
+def count_markdown(files) -> int:
+    """Count .md and .mdx paths in an iterable of relative paths."""
+    return sum(1 for rel in files if rel.endswith(('.md', '.mdx')))
+
+
+def remove_empty_dirs(root: Path) -> None:
+    """Remove empty directories below root, deepest first."""
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        if Path(dirpath) != root and not dirnames and not filenames:
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+
+
+def map_ordered(
+    func: Callable,
+    items: List,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> List:
+    """
+    Apply func to every item, optionally on a thread pool.
+
+    Results are always returned in input order so that anything derived
+    from them (counts, error lists, output) is deterministic.
+    """
+    if executor is None or len(items) < 2:
+        return [func(item) for item in items]
+    return list(executor.map(func, items))
+
+
+def run_git(*args: str, cwd: Optional[Path] = None) -> str:
+    """Run a git command and return its stdout, raising CalledProcessError on failure."""
+    result = subprocess.run(
+        ['git', *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout
+
+
+def read_submodules(repo_root: Path) -> List[Dict[str, str]]:
+    """
+    Parse .gitmodules into one {name, path, url, branch} dict per path.
+
+    Duplicate sections for the same path are collapsed, last one wins.
+    """
+    gitmodules = repo_root / '.gitmodules'
+    if not gitmodules.exists():
+        return []
+
+    try:
+        output = run_git(
+            'config', '-f', str(gitmodules),
+            '--get-regexp', r'^submodule\..*\.(path|url|branch)$'
+        )
+    except subprocess.CalledProcessError:
+        return []
+
+    sections = {}
+    for line in output.splitlines():
+        key, _, value = line.partition(' ')
+        name, _, field = key[len('submodule.'):].rpartition('.')
+        sections.setdefault(name, {'name': name})[field] = value.strip()
+
+    by_path = {}
+    for sub in sections.values():
+        if 'path' in sub and 'url' in sub:
+            by_path[sub['path']] = sub
+    return [by_path[path] for path in sorted(by_path)]
+
+
+def fetch_submodule(sub: Dict[str, str], repo_root: Path, git_dir: Path, depth: int) -> None:
+    """
+    Bring one submodule to the tip of its remote branch with docs-only content.
+
+    New submodules are cloned shallow, blobless and without checkout, so
+    only the blobs under SUBMODULE_SPARSE_PATHS are ever downloaded.
+    Existing ones fetch the branch tip at the same depth and move to it
+    the way `git submodule update --remote` would; with depth 0 a shallow
+    one is unshallowed to full history.
+    """
+    path = repo_root / sub['path']
+    module_dir = git_dir / 'modules' / sub['name']
+    ref = sub.get('branch', 'HEAD')
+    shallow = [f'--depth={depth}'] if depth > 0 else []
+
+    if not (path / '.git').exists() and not module_dir.exists():
+        path.mkdir(parents=True, exist_ok=True)
+        module_dir.parent.mkdir(parents=True, exist_ok=True)
+        run_git(
+            'clone', '--quiet', '--no-checkout', '--filter=blob:none', *shallow,
+            '--separate-git-dir', str(module_dir.resolve()),
+            sub['url'], str(path)
+        )
+        run_git('sparse-checkout', 'set', '--no-cone', *SUBMODULE_SPARSE_PATHS, cwd=path)
+        if ref != 'HEAD':
+            run_git('fetch', '--quiet', '--filter=blob:none', *shallow, 'origin', ref, cwd=path)
+            run_git('update-ref', '--no-deref', 'HEAD', 'FETCH_HEAD', cwd=path)
+        run_git('read-tree', '-mu', 'HEAD', cwd=path)
+        return
+
+    force = []
+    if not (path / '.git').exists():
+        # Module was cloned before but its worktree is gone (e.g. deinit)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / '.git').write_text(f'gitdir: {module_dir.resolve()}\n')
+        force = ['--force']
+
+    run_git('sparse-checkout', 'set', '--no-cone', *SUBMODULE_SPARSE_PATHS, cwd=path)
+    if depth <= 0 and run_git('rev-parse', '--is-shallow-repository', cwd=path).strip() == 'true':
+        shallow = ['--unshallow']
+    run_git('fetch', '--quiet', '--filter=blob:none', *shallow, 'origin', ref, cwd=path)
+    run_git('checkout', '--quiet', *force, '--detach', 'FETCH_HEAD', cwd=path)
+
+
+def update_submodules(
+    skip_update: bool = False,
+    jobs: int = 1,
+    depth: int = SUBMODULE_DEPTH,
+    repo_root: Path = Path('.'),
+    timings: Optional[Dict[str, float]] = None
+) -> bool:
+    """
+    Update all git submodules to the latest commit of their remote branch.
+
+    Submodules are fetched concurrently, shallow (depth 0 = full history),
+    as partial clones with a sparse checkout of docs/ and README.md only.
+    URLs come from .gitmodules, so pointing them (or a git `insteadOf`
+    rule) at local bare repositories works for testing.
+    """
     if skip_update:
         print("⏭️  Skipping git submodule update (--no-update flag)")
         return True
 
     print("📥 Updating git submodules...")
     try:
-        result = subprocess.run(
-            ['git', 'submodule', 'update', '--init', '--recursive', '--remote'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print("✅ Submodules updated successfully")
-        return True
+        git_dir = Path(run_git('rev-parse', '--git-dir', cwd=repo_root).strip())
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to update submodules: {e.stderr}")
         return False
+    if not git_dir.is_absolute():
+        git_dir = repo_root / git_dir
 
+    submodules = read_submodules(repo_root)
 
-def clean_docs_directory(docs_dir: Path, projects: List[str]) -> None:
-    """Remove existing project directories from docs/."""
-    print("\n🧹 Cleaning existing project documentation...")
-    for project in projects:
-        dest = docs_dir / project
-        if dest.exists() and dest.is_dir():
-            shutil.rmtree(dest)
-            print(f"   Removed docs/{project}/")
+    # Equivalent of `git submodule init`; config writes are serialized
+    for sub in submodules:
+        try:
+            run_git('config', f"submodule.{sub['name']}.url", sub['url'], cwd=repo_root)
+        except subprocess.CalledProcessError:
+            pass
 
+    def worker(sub: Dict[str, str]):
+        start = time.perf_counter()
+        try:
+            fetch_submodule(sub, repo_root, git_dir, depth)
+            error = None
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr or str(e)).strip()
+        return error, time.perf_counter() - start
 
-def copy_project_docs(
-    projects_with_docs: Dict[str, str],
-    docs_dir: Path
-) -> Tuple[int, List[str]]:
-    """Copy docs/ directories from projects to main docs/."""
-    print("\n📚 Copying documentation from projects...")
-    copied = 0
-    errors = []
+    ok = True
+    executor = ThreadPoolExecutor(max(1, jobs)) if jobs > 1 else None
+    try:
+        results = map_ordered(worker, submodules, executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-    for name, source_path in projects_with_docs.items():
-        src = Path(source_path)
-        if not src.exists():
-            errors.append(f"Source directory not found: {source_path}")
+    for sub, (error, elapsed) in zip(submodules, results):
+        if timings is not None:
+            timings[sub['path']] = elapsed
+        if error:
+            ok = False
+            print(f"   ❌ {sub['path']:30s} [{elapsed:.2f}s] {error}")
+        else:
+            print(f"   ✓ {sub['path']:30s} [{elapsed:.2f}s]")
+
+    if ok:
+        print("✅ Submodules updated successfully")
+    else:
+        print("❌ Failed to update submodules")
+    return ok
+
+
+def reflink_file(src: Path, dest: Path) -> None:
+    """Create dest as a copy-on-write clone of src (Linux FICLONE)."""
+    import fcntl
+
+    with open(src, 'rb') as s, open(dest, 'wb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.unlink(dest)
+            raise
+    shutil.copystat(src, dest)
+
+
+def size_class(size: int) -> str:
+    """Name the copy size class of a file ('small', 'medium' or 'large')."""
+    if size < COPY_SMALL_FILE:
+        return 'small'
+    return 'medium' if size < COPY_LARGE_FILE else 'large'
+
+
+def write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def kernel_copy(src_fd: int, dest_fd: int, size: int) -> str:
+    """
+    Copy size bytes between descriptors without going through user space.
+
+    Tries copy_file_range (which filesystems may turn into a reflink or a
+    server-side copy), then sendfile, then a buffered loop. Each step
+    continues from the current file offsets, so a fallback after a partial
+    copy picks up where the previous one stopped.
+
+    Returns:
+        The method that finished the copy
+    """
+    remaining = size
+    for method in ('copy_file_range', 'sendfile'):
+        if not hasattr(os, method):
+            continue
+        try:
+            while remaining > 0:
+                if method == 'copy_file_range':
+                    copied = os.copy_file_range(src_fd, dest_fd, remaining)
+                else:
+                    copied = os.sendfile(dest_fd, src_fd, None, remaining)
+                if copied == 0:
+                    return method
+                remaining -= copied
+            return method
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.ENOTSUP):
+                raise
+
+    while True:
+        chunk = os.read(src_fd, COPY_BUFFER)
+        if not chunk:
+            return 'read'
+        write_all(dest_fd, chunk)
+
+
+def copy_file(src: Path, dest: Path, st: Optional[os.stat_result] = None) -> str:
+    """
+    Copy src to dest keeping its permission bits and timestamps.
+
+    Unlike shutil.copy2, the source is stat'ed at most once (not at all if
+    st is given), permissions are set when dest is created and timestamps
+    through the open descriptor; no xattrs or flags are copied. Files
+    below COPY_LARGE_FILE are read and written in one call each, larger
+    ones are handed to kernel_copy.
+
+    Returns:
+        The method used ('read', 'copy_file_range' or 'sendfile')
+    """
+    st = st or os.stat(src)
+    src_fd = os.open(src, os.O_RDONLY | O_BINARY)
+    try:
+        dest_fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY, st.st_mode & 0o777)
+        try:
+            if st.st_size >= COPY_LARGE_FILE:
+                method = kernel_copy(src_fd, dest_fd, st.st_size)
+            else:
+                method = 'read'
+                remaining = st.st_size
+                while remaining > 0:
+                    data = os.read(src_fd, remaining)
+                    if not data:
+                        break
+                    write_all(dest_fd, data)
+                    remaining -= len(data)
+            if os.utime in os.supports_fd:
+                os.utime(dest_fd, ns=(st.st_atime_ns, st.st_mtime_ns))
+        finally:
+            os.close(dest_fd)
+    finally:
+        os.close(src_fd)
+    if os.utime not in os.supports_fd:
+        os.utime(dest, ns=(st.st_atime_ns, st.st_mtime_ns))
+    return method
+
+
+def map_batched(
+    func: Callable,
+    items: List,
+    sizes: List[int],
+    executor: Optional[ThreadPoolExecutor] = None
+) -> List:
+    """
+    Like map_ordered, but small items are submitted to the pool in batches.
+
+    Items below COPY_SMALL_FILE are grouped up to COPY_BATCH_FILES items or
+    COPY_BATCH_BYTES per task, so thousands of tiny files do not pay one
+    pool round trip each; larger items get a task of their own.
+    """
+    if executor is None or len(items) < 2:
+        return [func(item) for item in items]
+
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for item, size in zip(items, sizes):
+        if size >= COPY_SMALL_FILE:
+            batches.append([item])
             continue
+        if batch and (len(batch) >= COPY_BATCH_FILES or batch_bytes + size > COPY_BATCH_BYTES):
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append(item)
+        batch_bytes += size
+    if batch:
+        batches.append(batch)
+
+    results = {}
+    for chunk in executor.map(lambda chunk: [(item, func(item)) for item in chunk], batches):
+        results.update(chunk)
+    return [results[item] for item in items]
+
+
+def link_file(src: Path, dest: Path, mode: str) -> None:
+    """Create dest from src using a zero-copy materialization mode."""
+    if mode == 'hardlink':
+        os.link(src, dest)
+    elif mode == 'reflink':
+        reflink_file(src, dest)
+    elif mode == 'symlink':
+        os.symlink(os.path.abspath(src), dest)
+    else:
+        raise ValueError(f"Unknown materialization mode: {mode}")
+
+
+def probe_materialize_mode(sample: Optional[Path], dest_dir: Path) -> str:
+    """
+    Find the cheapest materialization mode that works from sample's filesystem into dest_dir.
 
-        dest = docs_dir / name
+    Tries reflink, then hardlink, and falls back to copy. Symlinks are
+    never picked automatically because they tie docs/ to projects/ at
+    serve time; request them explicitly with --materialize symlink.
+    """
+    if sample is None:
+        return 'copy'
+
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    probe = dest_dir / f'.materialize-probe-{os.getpid()}'
+    for mode in AUTO_MATERIALIZE_ORDER:
         try:
-            shutil.copytree(src, dest)
-            file_count = len(list(dest.rglob('*.md'))) + len(list(dest.rglob('*.mdx')))
-            print(f"   ✓ {name:20s} → docs/{name}/ ({file_count} files)")
-            copied += 1
-        except Exception as e:
-            errors.append(f"Failed to copy {source_path}: {e}")
+            link_file(sample, probe, mode)
+        except (OSError, ImportError):
+            continue
+        finally:
+            if probe.is_symlink() or probe.exists():
+                probe.unlink()
+        return mode
+    return 'copy'
 
-    return copied, errors
 
+def split_front_matter(text: str) -> Tuple[str, str]:
+    """Split a page into (front_matter_block, body); the block is '' if absent."""
+    if not text.startswith('---'):
+        return '', text
+    lines = text.splitlines(keepends=True)
+    if lines[0].rstrip('\r\n') != '---':
+        return '', text
+    for i in range(1, len(lines)):
+        if lines[i].rstrip('\r\n') in ('---', '...'):
+            return ''.join(lines[:i + 1]), ''.join(lines[i + 1:])
+    return '', text
 
-def copy_readme_only_projects(
-    readme_projects: List[str],
-    docs_dir: Path
-) -> Tuple[int, List[str]]:
-    """Copy README.md as index.md for projects without docs/ directory."""
-    print("\n📄 Copying README.md files for projects without docs/...")
-    copied = 0
-    errors = []
 
-    for project in readme_projects:
-        readme = Path(f'projects/{project}/README.md')
-        if not readme.exists():
-            errors.append(f"README.md not found for project: {project}")
-            continue
+def inject_front_matter(text: str, fields: Dict[str, object]) -> str:
+    """
+    Add fields to a page's YAML front matter, creating it if needed.
+
+    Keys the page already sets are left alone. Values are written as JSON,
+    which YAML reads back unchanged.
+    """
+    block, body = split_front_matter(text)
+    lines = block.splitlines(keepends=True)[1:-1] if block else []
+    present = {line.split(':', 1)[0].strip() for line in lines if ':' in line and not line[0].isspace()}
+    added = [
+        f'{key}: {json.dumps(value, ensure_ascii=False)}\n'
+        for key, value in fields.items()
+        if key not in present and value is not None
+    ]
+    if not added:
+        return text
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    return '---\n' + ''.join(lines) + ''.join(added) + '---\n' + body
+
+
+def rewrite_markdown_lines(text: str, rewrite_line: Callable[[str], str]) -> str:
+    """Apply rewrite_line to every line outside fenced code blocks."""
+    out = []
+    fence = None
+    for line in text.splitlines(keepends=True):
+        match = LINK_FENCE_RE.match(line.lstrip())
+        if fence:
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                fence = None
+            out.append(line)
+        elif match:
+            fence = match.group(1)
+            out.append(line)
+        else:
+            out.append(rewrite_line(line))
+    return ''.join(out)
+
+
+def rewrite_links(text: str, rewrite: Callable[[str, bool], str]) -> str:
+    """
+    Rewrite link targets in Markdown and inline HTML.
+
+    rewrite(target, is_image) returns the new target. Inline links,
+    reference definitions and <a href>/<img src> are covered; code
+    blocks and code spans are left untouched.
+    """
+    def inline(match: re.Match) -> str:
+        target = match.group(3)
+        return match.group(1) + match.group(2) + rewrite(target, match.group(1).startswith('!')) + match.group(4)
+
+    def refdef(match: re.Match) -> str:
+        return match.group(1) + rewrite(match.group(2), False)
+
+    def html(match: re.Match) -> str:
+        is_image = match.group(1).lower().startswith('<img')
+        return match.group(1) + rewrite(match.group(2), is_image)
+
+    def segment(part: str) -> str:
+        part = TRANSFORM_INLINE_RE.sub(inline, part)
+        part = TRANSFORM_REFDEF_RE.sub(refdef, part)
+        return TRANSFORM_HTML_RE.sub(html, part)
+
+    def line_rewrite(line: str) -> str:
+        out = []
+        pos = 0
+        for span in LINK_CODE_SPAN_RE.finditer(line):
+            out.append(segment(line[pos:span.start()]))
+            out.append(span.group(0))
+            pos = span.end()
+        out.append(segment(line[pos:]))
+        return ''.join(out)
+
+    return rewrite_markdown_lines(text, line_rewrite)
+
+
+def split_link_target(target: str) -> Tuple[str, str]:
+    """Split a link target into (path, suffix) where suffix is any ?query or #fragment."""
+    for i, char in enumerate(target):
+        if char in '?#':
+            return target[:i], target[i:]
+    return target, ''
+
+
+def is_relative_target(path: str) -> bool:
+    """True for a non-empty relative path (no scheme, no leading slash)."""
+    return bool(path) and not path.startswith('/') and not LINK_EXTERNAL_RE.match(path)
+
+
+def parse_snippet_spec(spec: str) -> Tuple[str, Optional[List[Tuple[int, Optional[int]]]], Optional[str]]:
+    """
+    Split a snippet reference into (path, line_ranges, section).
+
+    Supports file.md, file.md:3:5, file.md:3, file.md:1:2,6:8 and
+    file.md:section as pymdownx.snippets does.
+    """
+    path, sep, rest = spec.rpartition(':')
+    if not sep or not path or '/' in rest:
+        return spec, None, None
+    if SNIPPET_RANGES_RE.match(rest):
+        # rest may be the end of a start:end pair, so re-split from the first colon
+        path, _, rest = spec.partition(':')
+        ranges = []
+        for part in rest.split(','):
+            start, _, end = part.partition(':')
+            ranges.append((int(start) if start else 1, int(end) if end else None))
+        return path, ranges, None
+    return path, None, rest
+
+
+class SnippetGraph:
+    """
+    Resolves pymdownx.snippets includes at sync time and tracks who includes what.
+
+    Snippet paths are looked up under the configured base paths, with paths
+    into docs/<project>/ mapped back to the project's source docs/ (which may
+    not have been copied yet), and finally under the including project's
+    repository root. The page -> snippets graph is kept in
+    .build-cache/snippets.json; a page's transform signature includes the
+    hashes of the snippets it used last time, so editing a snippet re-renders
+    only the pages that include it.
+    """
+
+    def __init__(
+        self,
+        base_paths: Optional[List[Path]] = None,
+        project_sources: Optional[Dict[str, Path]] = None,
+        docs_dir: Path = Path('docs'),
+        projects_root: Path = Path('projects')
+    ):
+        self.base_paths = base_paths or [Path('.')]
+        self.project_sources = project_sources or {}
+        self.docs_dir = docs_dir
+        self.projects_root = projects_root
+        self.pages = self._load()
+        self.seen = set()
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _path() -> Path:
+        return CACHE_DIR / 'snippets.json'
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self._path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != SNIPPET_GRAPH_VERSION:
+            return {}
+        return data.get('pages', {})
+
+    def locate(self, path: str, project: str) -> Optional[Path]:
+        """Find the file a snippet path refers to, or None if it does not exist."""
+        roots = list(self.base_paths) + [self.projects_root / project]
+        for root in roots:
+            candidate = Path(posixpath.normpath((root / path).as_posix()))
+            try:
+                rel = candidate.relative_to(self.docs_dir)
+            except ValueError:
+                rel = None
+            if rel is not None and rel.parts and rel.parts[0] in self.project_sources:
+                candidate = Path(self.project_sources[rel.parts[0]]).joinpath(*rel.parts[1:])
+            elif os.path.relpath(candidate, root).startswith('..'):
+                continue  # outside the base path, as with restrict_base_path
+            if candidate.is_file():
+                return candidate
+        return None
+
+    def digest(self, path: str, project: str) -> str:
+        """Content hash of a snippet, memoized while its size and mtime are unchanged."""
+        located = self.locate(path, project)
+        if located is None:
+            return 'missing'
+        st = located.stat()
+        key = (str(located), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            digest = hash_file(located)
+            with self._lock:
+                self._digests[key] = digest
+        return digest
+
+    def signature(self, page: str, project: str) -> str:
+        """Identify the snippet contents a page was last rendered with."""
+        with self._lock:
+            self.seen.add(page)
+            deps = list(self.pages.get(page, {}).get('deps', []))
+        return ','.join(f'{dep}={self.digest(dep, project)[:16]}' for dep in deps)
+
+    def resolve(self, text: str, page: str, project: str) -> str:
+        """Inline every snippet include in text and record the page's dependencies."""
+        if '--8<--' not in text:
+            with self._lock:
+                self.pages.pop(page, None)
+            return text
+        deps = set()
+        errors = []
+        lines = self._expand(text.splitlines(), project, [page], deps, errors)
+        with self._lock:
+            self.pages[page] = {'deps': sorted(deps), 'errors': errors}
+        result = '\n'.join(lines)
+        return result + '\n' if text.endswith(('\n', '\r')) else result
+
+    def _expand(self, lines: List[str], project: str, stack: List[str], deps: Set[str], errors: List[str]) -> List[str]:
+        out = []
+        block = None  # indentation of an open multi-line --8<-- block
+        for line in lines:
+            if block is not None:
+                if SNIPPET_BLOCK_RE.match(line):
+                    block = None
+                elif line.strip() and not line.strip().startswith(';'):
+                    included = self._include(line.strip(), project, block, stack, deps, errors)
+                    out.extend(included if included is not None else [line])
+                continue
+            match = SNIPPET_LINE_RE.match(line)
+            if match:
+                included = self._include(match.group('path'), project, match.group('indent'), stack, deps, errors)
+                out.extend(included if included is not None else [line])
+                continue
+            match = SNIPPET_BLOCK_RE.match(line)
+            if match:
+                block = match.group('indent')
+                continue
+            out.append(line)
+        return out
+
+    def _include(
+        self,
+        spec: str,
+        project: str,
+        indent: str,
+        stack: List[str],
+        deps: Set[str],
+        errors: List[str]
+    ) -> Optional[List[str]]:
+        """Return the indented lines of one include, or None to leave the line as is."""
+        path, ranges, section = parse_snippet_spec(spec)
+        if LINK_EXTERNAL_RE.match(path):
+            return None
+        deps.add(path)
+        located = self.locate(path, project)
+        if located is None:
+            errors.append(f"missing snippet '{path}'")
+            return None
+        if path in stack:
+            errors.append(f"snippet cycle: {' → '.join(stack[1:] + [path])}")
+            return None
+        try:
+            lines = located.read_text(encoding='utf-8').splitlines()
+        except (OSError, UnicodeDecodeError) as e:
+            errors.append(f"unreadable snippet '{path}': {e}")
+            return None
+
+        if section is not None:
+            selected = []
+            inside = False
+            found = False
+            for line in lines:
+                marker = SNIPPET_SECTION_RE.search(line)
+                if marker and marker.group(2) == section:
+                    inside = marker.group(1) == 'start'
+                    found = found or inside
+                elif inside:
+                    selected.append(line)
+            if not found:
+                errors.append(f"section '{section}' not found in snippet '{path}'")
+                return None
+            lines = selected
+        elif ranges is not None:
+            lines = [line for start, end in ranges for line in lines[start - 1:end]]
+
+        lines = [line for line in lines if not SNIPPET_SECTION_RE.search(line)]
+        expanded = self._expand(lines, project, stack + [path], deps, errors)
+        return [indent + line if line else line for line in expanded]
+
+    def errors(self) -> List[str]:
+        """Problems found in the pages seen during this run."""
+        with self._lock:
+            return [
+                f"{page}: {error}"
+                for page in sorted(self.seen)
+                for error in self.pages.get(page, {}).get('errors', [])
+            ]
+
+    def save(self) -> None:
+        """Persist the include graph, with a reverse snippet -> pages index for humans."""
+        with self._lock:
+            pages = dict(self.pages)
+        used_by = {}
+        for page, entry in sorted(pages.items()):
+            for dep in entry.get('deps', []):
+                used_by.setdefault(dep, []).append(page)
+        path = self._path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': SNIPPET_GRAPH_VERSION, 'pages': pages, 'snippets': used_by}, f, indent=1)
+        os.replace(tmp, path)
+
+
+class GitMetadata:
+    """
+    Last change (date, author, commit) of every docs file, from one git log per project.
+
+    Each project's history is read with a single `git log --name-only`
+    stream, run concurrently across projects. Results are cached in
+    .build-cache/git-metadata.json keyed on the project's HEAD; when HEAD
+    moves forward only the new commits (old..new) are scanned.
+
+    Shallow clones only know part of the history: the boundary commit lists
+    every file as added, so files whose newest change is the boundary have
+    no reliable date and are left out.
+    """
+
+    def __init__(self, projects_root: Path, use_cache: bool = True):
+        self.projects_root = projects_root
+        self.projects = self._load() if use_cache else {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _path() -> Path:
+        return CACHE_DIR / 'git-metadata.json'
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self._path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != GIT_METADATA_VERSION:
+            return {}
+        return data.get('projects', {})
+
+    @staticmethod
+    def read_log(project_dir: Path, revisions: str) -> Tuple[Dict[str, List[str]], int]:
+        """
+        Map each path touched in revisions to its newest [date, author, sha].
+
+        Returns:
+            Tuple of (files, commit_count)
+        """
+        output = run_git(
+            '-c', 'core.quotePath=false', 'log', '--no-renames', '--name-only',
+            '--format=%x1e%H%x1f%aI%x1f%an', revisions, '--', 'docs', 'README.md',
+            cwd=project_dir
+        )
+        files = {}
+        records = output.split('\x1e')[1:]
+        for record in records:
+            header, _, names = record.partition('\n')
+            sha, date, author = header.split('\x1f')
+            for name in names.splitlines():
+                if name and name not in files:
+                    files[name] = [date, author, sha]
+        return files, len(records)
+
+    def update(self, name: str) -> Dict:
+        """
+        Bring one project's metadata up to date with its HEAD.
+
+        Returns:
+            Summary {mode, files, commits, undated} where mode is 'cached',
+            'incremental', 'full' or 'unavailable'
+        """
+        project_dir = self.projects_root / name
+        if not (project_dir / '.git').exists():
+            return {'mode': 'unavailable', 'files': 0, 'commits': 0, 'undated': 0}
+        try:
+            head = run_git('rev-parse', 'HEAD', cwd=project_dir).strip()
+            shallow_file = Path(run_git('rev-parse', '--git-path', 'shallow', cwd=project_dir).strip())
+        except subprocess.CalledProcessError:
+            return {'mode': 'unavailable', 'files': 0, 'commits': 0, 'undated': 0}
+        if not shallow_file.is_absolute():
+            shallow_file = project_dir / shallow_file
+        boundary = sorted(shallow_file.read_text().split()) if shallow_file.exists() else []
+
+        with self._lock:
+            cached = self.projects.get(name)
+        if cached and cached['head'] == head and cached.get('boundary', []) == boundary:
+            return {'mode': 'cached', 'files': len(cached['files']), 'commits': 0,
+                    'undated': cached.get('undated', 0)}
+
+        files = None
+        if cached and cached.get('boundary', []) == boundary:
+            try:
+                run_git('merge-base', '--is-ancestor', cached['head'], head, cwd=project_dir)
+                new, commits = self.read_log(project_dir, f"{cached['head']}..{head}")
+                files = dict(cached['files'])
+                files.update(new)
+                undated = cached.get('undated', 0)
+                mode = 'incremental'
+            except subprocess.CalledProcessError:
+                files = None
+        if files is None:
+            files, commits = self.read_log(project_dir, head)
+            undated = 0
+            if boundary:
+                dated = {path: entry for path, entry in files.items() if entry[2] not in boundary}
+                undated = len(files) - len(dated)
+                files = dated
+            mode = 'full'
+
+        with self._lock:
+            self.projects[name] = {'head': head, 'boundary': boundary, 'files': files, 'undated': undated}
+        return {'mode': mode, 'files': len(files), 'commits': commits, 'undated': undated}
+
+    def scan(self, names: List[str], jobs: int = 1) -> Dict[str, Dict]:
+        """Update every project concurrently; returns the per-project summaries."""
+        if jobs > 1 and len(names) > 1:
+            with ThreadPoolExecutor(min(jobs, len(names)), thread_name_prefix='git-log') as pool:
+                return dict(zip(names, map_ordered(self.update, names, pool)))
+        return {name: self.update(name) for name in names}
+
+    def lookup(self, project: str, path: str) -> Optional[List[str]]:
+        """Return [date, author, sha] for a path in a project's repository."""
+        with self._lock:
+            return self.projects.get(project, {}).get('files', {}).get(path)
+
+    def save(self) -> None:
+        path = self._path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.json.tmp')
+        with self._lock:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'version': GIT_METADATA_VERSION, 'projects': self.projects}, f)
+        os.replace(tmp, path)
+
+
+class TransformContext:
+    """Describes one file passing through the transform pipeline."""
+
+    def __init__(self, project: str, kind: str, src_rel: str, dest_rel: str, repo_url: Optional[str] = None):
+        self.project = project
+        self.kind = kind  # 'docs' for docs/ trees, 'readme' for README-only projects
+        self.src_rel = src_rel
+        self.dest_rel = dest_rel
+        self.repo_url = repo_url
+        self.snippets = None
+        self.git_metadata = None
+        self.chain = ()
+        self.signature = ''
+
+    @property
+    def page(self) -> str:
+        """Key of the source page, e.g. soliplex/overview.md or chatbot/README.md."""
+        return f'{self.project}/{self.src_rel}'
+
+    @property
+    def repo_path(self) -> str:
+        """Path of the source file inside its project's repository."""
+        return f'docs/{self.src_rel}' if self.kind == 'docs' else self.src_rel
+
+
+class Transform:
+    """
+    A content transform applied to files as they are copied into docs/.
+
+    Bump version whenever apply() changes its output so cached results
+    produced by the old code are not reused.
+    """
+
+    name = ''
+    version = 1
+
+    def applies(self, ctx: TransformContext) -> bool:
+        return False
+
+    def rename(self, dest_rel: str) -> str:
+        return dest_rel
+
+    def signature(self, ctx: TransformContext) -> str:
+        return f'{self.name}@{self.version}'
+
+    def apply(self, text: str, ctx: TransformContext) -> str:
+        return text
+
+
+class SnippetIncludes(Transform):
+    """Inline pymdownx.snippets includes (--8<--) before the page is rendered."""
+
+    name = 'snippets'
+
+    def applies(self, ctx: TransformContext) -> bool:
+        return ctx.snippets is not None and ctx.dest_rel.endswith(('.md', '.mdx'))
+
+    def signature(self, ctx: TransformContext) -> str:
+        return f'{self.name}@{self.version}:{ctx.snippets.signature(ctx.page, ctx.project)}'
+
+    def apply(self, text: str, ctx: TransformContext) -> str:
+        return ctx.snippets.resolve(text, ctx.page, ctx.project)
+
+
+class MdxToMarkdown(Transform):
+    """
+    Convert .mdx pages to plain Markdown pages.
+
+    Conservative: drops top-level import/export statements and turns JSX
+    comments into HTML comments. Components are kept as inline HTML.
+    """
+
+    name = 'mdx'
+
+    def applies(self, ctx: TransformContext) -> bool:
+        return ctx.kind == 'docs' and ctx.dest_rel.endswith('.mdx')
+
+    def rename(self, dest_rel: str) -> str:
+        return dest_rel[:-len('.mdx')] + '.md'
+
+    def apply(self, text: str, ctx: TransformContext) -> str:
+        def line_rewrite(line: str) -> str:
+            if MDX_STATEMENT_RE.match(line):
+                return ''
+            return MDX_COMMENT_RE.sub(lambda m: f'<!--{m.group(1)}-->', line)
+        return rewrite_markdown_lines(text, line_rewrite)
+
+
+class MdxLinks(Transform):
+    """Point relative links at .mdx pages to the .md pages they become."""
+
+    name = 'mdx-links'
+
+    def applies(self, ctx: TransformContext) -> bool:
+        return ctx.kind == 'docs' and ctx.dest_rel.endswith('.md')
+
+    def apply(self, text: str, ctx: TransformContext) -> str:
+        if '.mdx' not in text:
+            return text
+
+        def rewrite(target: str, is_image: bool) -> str:
+            path, suffix = split_link_target(target)
+            if is_relative_target(path) and path.endswith('.mdx'):
+                return path[:-len('.mdx')] + '.md' + suffix
+            return target
+        return rewrite_links(text, rewrite)
+
+
+class ReadmeLinks(Transform):
+    """
+    Fix relative links in a README published as a project's index.md.
+
+    Only the README itself is copied, so links to README.md become
+    index.md and links to other repository files point at the repository
+    on GitHub (raw for images).
+    """
+
+    name = 'readme-links'
+
+    def applies(self, ctx: TransformContext) -> bool:
+        return ctx.kind == 'readme'
+
+    def signature(self, ctx: TransformContext) -> str:
+        return f'{self.name}@{self.version}:{ctx.repo_url or ""}'
+
+    def apply(self, text: str, ctx: TransformContext) -> str:
+        def rewrite(target: str, is_image: bool) -> str:
+            path, suffix = split_link_target(target)
+            if not is_relative_target(path):
+                return target
+            path = posixpath.normpath(path)
+            if path == 'README.md':
+                return 'index.md' + suffix
+            if path.startswith('..') or not ctx.repo_url:
+                return target
+            kind = 'raw' if is_image else 'blob'
+            return f'{ctx.repo_url}/{kind}/HEAD/{path}{suffix}'
+        return rewrite_links(text, rewrite)
+
+
+class SourceFrontMatter(Transform):
+    """Record where each page came from in its front matter."""
+
+    name = 'front-matter'
+
+    def applies(self, ctx: TransformContext) -> bool:
+        return ctx.dest_rel.endswith('.md')
+
+    def signature(self, ctx: TransformContext) -> str:
+        return f'{self.name}@{self.version}:{ctx.project}:{ctx.kind}:{ctx.src_rel}:{ctx.repo_url or ""}'
+
+    def apply(self, text: str, ctx: TransformContext) -> str:
+        path = ctx.repo_path
+        return inject_front_matter(text, {
+            'source_project': ctx.project,
+            'source_path': path,
+            'source_url': f'{ctx.repo_url}/blob/HEAD/{path}' if ctx.repo_url else None,
+        })
+
+
+class GitFrontMatter(Transform):
+    """Add the last change date, author and commit from git history to front matter."""
+
+    name = 'git-metadata'
+
+    def applies(self, ctx: TransformContext) -> bool:
+        return (
+            ctx.git_metadata is not None
+            and ctx.dest_rel.endswith('.md')
+            and ctx.git_metadata.lookup(ctx.project, ctx.repo_path) is not None
+        )
+
+    def signature(self, ctx: TransformContext) -> str:
+        date, author, sha = ctx.git_metadata.lookup(ctx.project, ctx.repo_path)
+        return f'{self.name}@{self.version}:{sha}:{date}:{author}'
+
+    def apply(self, text: str, ctx: TransformContext) -> str:
+        date, author, sha = ctx.git_metadata.lookup(ctx.project, ctx.repo_path)
+        return inject_front_matter(text, {
+            'last_modified': date,
+            'last_author': author,
+            'last_commit': sha,
+        })
+
+
+# Transform groups selectable with --transforms, applied in this order
+TRANSFORMS = {
+    'snippets': [SnippetIncludes()],
+    'mdx': [MdxToMarkdown(), MdxLinks()],
+    'readme-links': [ReadmeLinks()],
+    'front-matter': [SourceFrontMatter()],
+    'git-metadata': [GitFrontMatter()],
+}
+
+
+def repository_urls(repo_root: Path) -> Dict[str, str]:
+    """Map project directory names to their web URLs from .gitmodules."""
+    urls = {}
+    for sub in read_submodules(repo_root):
+        url = sub['url']
+        if url.startswith('git@github.com:'):
+            url = 'https://github.com/' + url[len('git@github.com:'):]
+        if url.startswith(('https://', 'http://')):
+            urls[Path(sub['path']).name] = url[:-len('.git')] if url.endswith('.git') else url
+    return urls
+
+
+class TransformPipeline:
+    """
+    Plans and runs content transforms with a content-addressed output cache.
+
+    Outputs live in .build-cache/transforms/ keyed by the input's sha256 and
+    the signatures of the transforms applied, so an unchanged page is never
+    transformed twice. When a chain leaves a file byte-identical, only a
+    marker is stored and the source is materialized as usual.
+    """
+
+    def __init__(self, names: List[str], repo_urls: Optional[Dict[str, str]] = None,
+                 store: Optional[Path] = None, snippets: Optional[SnippetGraph] = None,
+                 git_metadata: Optional[GitMetadata] = None):
+        unknown = sorted(set(names) - set(TRANSFORMS))
+        if unknown:
+            raise ValueError(f"Unknown transforms: {', '.join(unknown)}")
+        self.names = [name for name in TRANSFORMS if name in names]
+        self.transforms = [t for name in self.names for t in TRANSFORMS[name]]
+        self.repo_urls = repo_urls or {}
+        self.snippets = None
+        if 'snippets' in self.names:
+            self.snippets = snippets or SnippetGraph()
+        self.git_metadata = git_metadata if 'git-metadata' in self.names else None
+        self.store = store or CACHE_DIR / 'transforms'
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def plan(self, project: str, kind: str, src_rel: str, dest_rel: str) -> Tuple[str, Optional[TransformContext]]:
+        """
+        Decide which transforms apply to a file and where it ends up.
+
+        Returns:
+            Tuple of (dest_rel, context); context is None if no transform applies
+        """
+        ctx = TransformContext(project, kind, src_rel, dest_rel, self.repo_urls.get(project))
+        ctx.snippets = self.snippets
+        ctx.git_metadata = self.git_metadata
+        chain = []
+        for transform in self.transforms:
+            if transform.applies(ctx):
+                chain.append(transform)
+                ctx.dest_rel = transform.rename(ctx.dest_rel)
+        if not chain:
+            return dest_rel, None
+        ctx.chain = tuple(chain)
+        ctx.signature = '|'.join(t.signature(ctx) for t in chain)
+        return ctx.dest_rel, ctx
+
+    def render(self, src: Path, ctx: TransformContext, digest: Optional[str] = None) -> Optional[Path]:
+        """
+        Return the cached transformed output for src, transforming it on a miss.
+
+        Returns None when the transforms leave the file unchanged.
+        """
+        digest = digest or hash_file(src)
+        key = hashlib.sha256(f'{digest}\0{ctx.signature}'.encode('utf-8')).hexdigest()
+        out = self.store / key[:2] / key
+        same = out.with_name(f'{key}.same')
+
+        if out.exists() or same.exists():
+            with self._lock:
+                self.hits += 1
+            return out if out.exists() else None
+
+        with self._lock:
+            self.misses += 1
+        data = src.read_bytes()
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            result = data
+        else:
+            for transform in ctx.chain:
+                text = transform.apply(text, ctx)
+            result = text.encode('utf-8')
+
+        out.parent.mkdir(parents=True, exist_ok=True)
+        if result == data:
+            same.touch()
+            return None
+        tmp = out.with_name(f'.{key}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp.write_bytes(result)
+        os.replace(tmp, out)
+        return out
+
+
+class CopyEngine:
+    """
+    Shared state for the copy stages: worker pools, materialization mode
+    and the content transform pipeline.
+
+    Projects fan out onto one pool; files inside large projects fan out onto
+    a second pool so project workers never wait on their own pool. With
+    jobs=1 both are disabled and everything runs serially.
+    """
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        mode: str = 'copy',
+        transforms: Optional[TransformPipeline] = None,
+        keep_manifests: bool = False
+    ):
+        self.jobs = max(1, jobs)
+        self.mode = mode
+        self.transforms = transforms
+        self.manifests = {} if keep_manifests else None
+        self.fallbacks = 0
+        self.copy_stats = {name: {'files': 0, 'bytes': 0, 'seconds': 0.0} for name in COPY_SIZE_CLASSES}
+        self.copy_methods = {}
+        self._lock = threading.Lock()
+        self.projects = None
+        self.files = None
+        if self.jobs > 1:
+            self.projects = ThreadPoolExecutor(self.jobs, thread_name_prefix='project')
+            self.files = ThreadPoolExecutor(self.jobs, thread_name_prefix='file')
+
+    def files_for(self, count: int) -> Optional[ThreadPoolExecutor]:
+        """Return the file pool if a project is large enough to split up."""
+        return self.files if count >= PARALLEL_FILE_THRESHOLD else None
+
+    def copy(self, src: Path, dest: Path, st: Optional[os.stat_result] = None) -> None:
+        """Copy one file with copy_file and account it to its size class."""
+        st = st or os.stat(src)
+        start = time.perf_counter()
+        method = copy_file(src, dest, st)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats = self.copy_stats[size_class(st.st_size)]
+            stats['files'] += 1
+            stats['bytes'] += st.st_size
+            stats['seconds'] += elapsed
+            self.copy_methods[method] = self.copy_methods.get(method, 0) + 1
+
+    def copy_summary(self) -> Dict:
+        """
+        Per size class totals of real copies, for the build report.
+
+        Seconds are summed over copy calls, so with several jobs the
+        throughput is per worker rather than wall-clock.
+        """
+        with self._lock:
+            classes = {}
+            for name, stats in self.copy_stats.items():
+                seconds = stats['seconds']
+                classes[name] = {
+                    'files': stats['files'],
+                    'bytes': stats['bytes'],
+                    'seconds': round(seconds, 4),
+                    'mb_per_second': round(stats['bytes'] / seconds / 1e6, 1) if seconds else None,
+                    'files_per_second': round(stats['files'] / seconds) if seconds else None,
+                }
+            return {'classes': classes, 'methods': dict(self.copy_methods)}
+
+    def materialize(self, src: Path, dest: Path, st: Optional[os.stat_result] = None) -> None:
+        """
+        Create dest from src using the configured mode.
+
+        Falls back to a real copy for this file if linking fails, e.g.
+        across filesystems or on hardlink count limits.
+        """
+        if self.mode != 'copy':
+            try:
+                link_file(src, dest, self.mode)
+                return
+            except OSError:
+                with self._lock:
+                    self.fallbacks += 1
+        self.copy(src, dest, st)
+
+    def materialize_atomic(
+        self,
+        src: Path,
+        dest: Path,
+        ctx: Optional[TransformContext] = None,
+        digest: Optional[str] = None,
+        st: Optional[os.stat_result] = None
+    ) -> None:
+        """Materialize via a temporary sibling so readers never see a partial file."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f'.{dest.name}.tmp')
+        if tmp.is_symlink() or tmp.exists():
+            tmp.unlink()
+        self.materialize_file(src, tmp, ctx, digest, st)
+        os.replace(tmp, dest)
+
+    def load_manifest(self, project: str) -> Dict[str, Dict]:
+        """Load a project's manifest, from memory if this engine keeps them warm."""
+        if self.manifests is None:
+            return load_manifest(project)
+        with self._lock:
+            manifest = self.manifests.get(project)
+        if manifest is None:
+            manifest = load_manifest(project)
+        return dict(manifest)
+
+    def save_manifest(self, project: str, files: Dict[str, Dict]) -> None:
+        """Write a project's manifest to disk, keeping a copy in memory if enabled."""
+        save_manifest(project, files)
+        if self.manifests is not None:
+            with self._lock:
+                self.manifests[project] = dict(files)
+
+    def plan(self, project: str, kind: str, src_rel: str, dest_rel: Optional[str] = None) -> Tuple[str, Optional[TransformContext]]:
+        """Return (dest_rel, transform context) for a source file; see TransformPipeline.plan."""
+        dest_rel = dest_rel or src_rel
+        if self.transforms is None:
+            return dest_rel, None
+        return self.transforms.plan(project, kind, src_rel, dest_rel)
+
+    def materialize_file(
+        self,
+        src: Path,
+        dest: Path,
+        ctx: Optional[TransformContext] = None,
+        digest: Optional[str] = None,
+        st: Optional[os.stat_result] = None
+    ) -> None:
+        """
+        Materialize src at dest, running its transforms first if it has any.
+
+        Transformed output is always written as a real file, never linked,
+        so docs/ does not share inodes with the transform cache.
+        """
+        out = self.transforms.render(src, ctx, digest) if ctx is not None else None
+        if out is not None:
+            self.copy(out, dest)
+        else:
+            self.materialize(src, dest, st)
+
+    def shutdown(self) -> None:
+        for pool in (self.projects, self.files):
+            if pool is not None:
+                pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+def git_head(project_dir: Path) -> Optional[str]:
+    """Return the commit a clean git checkout is at, or None (dirty, not a checkout)."""
+    if not (project_dir / '.git').exists():
+        return None
+    try:
+        head = run_git('rev-parse', 'HEAD', cwd=project_dir).strip()
+        dirty = run_git('status', '--porcelain', cwd=project_dir).strip()
+    except subprocess.CalledProcessError:
+        return None
+    return None if dirty else head
+
+
+def has_markdown(root: Path) -> bool:
+    """Return True as soon as a streaming walk of root finds one .md file."""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.md') and entry.is_file():
+                    return True
+    return False
+
+
+def build_inventory(src: Path) -> Dict:
+    """Walk src once and summarize its files (list, counts, bytes, extensions)."""
+    files = {}
+    extensions = {}
+    total = 0
+    for rel, st in scan_tree(src).items():
+        files[rel] = [st.st_size, st.st_mtime_ns]
+        total += st.st_size
+        ext = posixpath.splitext(rel)[1].lower() or '(none)'
+        extensions[ext] = extensions.get(ext, 0) + 1
+    return {
+        'files': files,
+        'count': len(files),
+        'bytes': total,
+        'markdown': count_markdown(files),
+        'extensions': extensions,
+    }
+
+
+class ProjectInventory:
+    """
+    Per-project file inventory shared by discovery, copy, validation and reporting.
+
+    Each project's docs/ tree is walked at most once per run. Inventories
+    are cached in .build-cache/inventory.json keyed on the project's git
+    HEAD and reused while the checkout is clean and at the same commit.
+    """
+
+    def __init__(self, projects_root: Path, use_cache: bool = True):
+        self.projects_root = projects_root
+        self._cached = self._load() if use_cache else {}
+        self._entries = {}
+        self._revisions = {}
+
+    @staticmethod
+    def _path() -> Path:
+        return CACHE_DIR / 'inventory.json'
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self._path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != INVENTORY_VERSION:
+            return {}
+        return data.get('projects', {})
+
+    def revision(self, name: str) -> Optional[str]:
+        """Return (and memoize) the clean git HEAD of a project."""
+        if name not in self._revisions:
+            self._revisions[name] = git_head(self.projects_root / name)
+        return self._revisions[name]
+
+    def cached(self, name: str) -> Optional[Dict]:
+        """Return the cached inventory for a project if it is still valid."""
+        if name in self._entries:
+            return self._entries[name]
+        entry = self._cached.get(name)
+        revision = self.revision(name)
+        if entry and revision is not None and entry.get('revision') == revision:
+            self._entries[name] = entry
+            return entry
+        return None
+
+    def has_markdown(self, name: str, docs_path: Path) -> bool:
+        """Check whether a project's docs/ contains Markdown, walking only if needed."""
+        entry = self.cached(name)
+        if entry is not None:
+            return entry['markdown'] > 0
+        return has_markdown(docs_path)
+
+    def get(self, name: str, src: Path) -> Dict:
+        """Return the inventory of a project's docs/, walking it if not cached."""
+        entry = self.cached(name)
+        if entry is None:
+            entry = build_inventory(src)
+            entry['revision'] = self.revision(name)
+            self._entries[name] = entry
+        return entry
+
+    def invalidate(self, name: str) -> None:
+        """Forget what is known about a project so it is re-checked (e.g. after a fetch)."""
+        self._entries.pop(name, None)
+        self._revisions.pop(name, None)
+
+    def entries(self) -> Dict[str, Dict]:
+        """Return every inventory resolved during this run."""
+        return dict(self._entries)
+
+    def docs_index(self, docs_dir: Path, rename: Optional[Callable[[str, str], str]] = None) -> Set[str]:
+        """
+        Build the set of files under docs_dir from the inventories.
+
+        Project directories are taken from the inventories instead of being
+        walked again; only hand-maintained files in docs/ are scanned.
+        rename(project, rel) maps a source file to its name in docs/ when
+        transforms rename files (e.g. .mdx to .md).
+        """
+        files = set()
+        with os.scandir(docs_dir) as entries:
+            for entry in entries:
+                if entry.name in self._entries:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    files.update(f'{entry.name}/{rel}' for rel in list_files(Path(entry.path)))
+                elif entry.is_file():
+                    files.add(entry.name)
+        for name, entry in self._entries.items():
+            if rename is None:
+                files.update(f'{name}/{rel}' for rel in entry['files'])
+            else:
+                files.update(f'{name}/{rename(name, rel)}' for rel in entry['files'])
+        return files
+
+    def save(self) -> None:
+        """Persist inventories of clean checkouts for the next run."""
+        projects = dict(self._cached)
+        projects.update({
+            name: entry for name, entry in self._entries.items()
+            if entry.get('revision') is not None
+        })
+        path = self._path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': INVENTORY_VERSION, 'projects': projects}, f)
+        os.replace(tmp, path)
+
+
+def run_projects(
+    names: List[str],
+    worker: Callable[[str], Tuple[bool, str, Optional[str], Tuple[int, int]]],
+    engine: CopyEngine,
+    project_stats: Optional[Dict[str, Dict]] = None
+) -> Tuple[int, List[str]]:
+    """
+    Run a per-project worker over all projects and collect results in order.
+
+    The worker returns (ok, message, error, (files_moved, bytes_moved)).
+    Messages and errors are reported in project order regardless of
+    completion order. Wall time and moved counts are accumulated per
+    project into project_stats.
+    """
+    def timed(name: str):
+        start = time.perf_counter()
+        result = worker(name)
+        return result, time.perf_counter() - start
+
+    done = 0
+    errors = []
+    for name, ((ok, message, error, (files, size)), elapsed) in zip(
+        names, map_ordered(timed, names, engine.projects)
+    ):
+        if project_stats is not None:
+            record = project_stats.setdefault(
+                name, {'seconds': 0.0, 'files_moved': 0, 'bytes_moved': 0}
+            )
+            record['seconds'] += elapsed
+            record['files_moved'] += files
+            record['bytes_moved'] += size
+        if ok:
+            print(f"{message} [{elapsed:.2f}s]")
+            done += 1
+        elif error:
+            errors.append(error)
+
+    return done, errors
+
+
+def copy_record(
+    engine: CopyEngine,
+    src: Path,
+    dest: Path,
+    ctx: Optional[TransformContext] = None
+) -> Dict:
+    """
+    Materialize src at dest and return its sync manifest record.
+
+    The source is not hashed, so the record has no sha256; a later sync
+    trusts it while size and mtime match and recopies the file otherwise.
+    """
+    st = os.stat(src)
+    engine.materialize_file(src, dest, ctx, st=st)
+    record = {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha256': None,
+        'mode': engine.mode,
+    }
+    if ctx is not None and ctx.signature:
+        record['transform'] = ctx.signature
+        record['dest_size'] = dest.stat().st_size
+    return record
+
+
+def copy_tree(
+    src: Path,
+    dest: Path,
+    files: List[str],
+    engine: CopyEngine,
+    executor: Optional[ThreadPoolExecutor] = None,
+    project: str = '',
+    sizes: Optional[Dict[str, int]] = None
+) -> Tuple[int, Dict[str, Dict]]:
+    """
+    Materialize the given files under src into dest.
+
+    sizes (e.g. from the project inventory) lets small files be batched
+    onto the executor; unknown sizes count as small.
+
+    Returns:
+        Tuple of (number of Markdown files, sync manifest of dest), so the
+        next --incremental run starts from what this copy wrote
+    """
+    sizes = sizes or {}
+    plans = {rel: engine.plan(project, 'docs', rel) for rel in sorted(files)}
+    for parent in sorted({str(Path(dest_rel).parent) for dest_rel, _ in plans.values()}):
+        (dest / parent).mkdir(parents=True, exist_ok=True)
+    rels = list(plans)
+    records = map_batched(
+        lambda rel: copy_record(engine, src / rel, dest / plans[rel][0], plans[rel][1]),
+        rels,
+        [sizes.get(rel, 0) for rel in rels],
+        executor
+    )
+    manifest = {plans[rel][0]: record for rel, record in zip(rels, records)}
+    return count_markdown(files), manifest
+
+
+def copy_project_docs(
+    projects_with_docs: Dict[str, str],
+    docs_dir: Path,
+    engine: Optional[CopyEngine] = None,
+    project_stats: Optional[Dict[str, Dict]] = None,
+    inventory: Optional[ProjectInventory] = None,
+    generations: Optional[DocsGenerations] = None
+) -> Tuple[int, List[str]]:
+    """
+    Copy docs/ directories from projects to main docs/.
+
+    With generations, each project is copied into its staging directory
+    and swapped into docs/ only once the copy succeeded.
+    """
+    print("\n📚 Copying documentation from projects...")
+    engine = engine or CopyEngine()
+    inventory = inventory or ProjectInventory(Path('projects'), use_cache=False)
+
+    def worker(name: str):
+        source_path = projects_with_docs[name]
+        src = Path(source_path)
+        if not src.exists():
+            return False, '', f"Source directory not found: {source_path}", (0, 0)
+
+        try:
+            dest = generations.stage(name) if generations else docs_dir / name
+            entry = inventory.get(name, src)
+            files = list(entry['files'])
+            sizes = {rel: meta[0] for rel, meta in entry['files'].items()}
+            file_count, manifest = copy_tree(src, dest, files, engine, engine.files_for(len(files)), name, sizes)
+            if generations:
+                generations.commit(name)
+            engine.save_manifest(name, manifest)
+            moved = (entry['count'], entry['bytes'])
+            return True, f"   ✓ {name:20s} → docs/{name}/ ({file_count} files)", None, moved
+        except Exception as e:
+            if generations:
+                generations.discard(name)
+            return False, '', f"Failed to copy {source_path}: {e}", (0, 0)
+
+    return run_projects(list(projects_with_docs), worker, engine, project_stats)
+
+
+def copy_readme_only_projects(
+    readme_projects: List[str],
+    docs_dir: Path,
+    engine: Optional[CopyEngine] = None,
+    project_stats: Optional[Dict[str, Dict]] = None,
+    generations: Optional[DocsGenerations] = None
+) -> Tuple[int, List[str]]:
+    """Copy README.md as index.md for projects without docs/ directory."""
+    print("\n📄 Copying README.md files for projects without docs/...")
+    engine = engine or CopyEngine()
+
+    def worker(project: str):
+        readme = Path(f'projects/{project}/README.md')
+        if not readme.exists():
+            return False, '', f"README.md not found for project: {project}", (0, 0)
+
+        try:
+            if generations:
+                dest_dir = generations.stage(project)
+            else:
+                dest_dir = docs_dir / project
+                dest_dir.mkdir(exist_ok=True)
+            index = dest_dir / 'index.md'
+            if index.is_symlink() or index.exists():
+                index.unlink()
+            _, ctx = engine.plan(project, 'readme', 'README.md', 'index.md')
+            record = copy_record(engine, readme, index, ctx)
+            if generations:
+                generations.commit(project)
+            engine.save_manifest(project, {'index.md': record})
+            moved = (1, readme.stat().st_size)
+            return True, f"   ✓ {project:20s} → docs/{project}/index.md", None, moved
+        except Exception as e:
+            if generations:
+                generations.discard(project)
+            return False, '', f"Failed to copy README for {project}: {e}", (0, 0)
+
+    return run_projects(readme_projects, worker, engine, project_stats)
+
+
+def sync_file(
+    engine: CopyEngine,
+    rel: str,
+    src: Path,
+    dest: Path,
+    entry: Optional[Dict],
+    dest_st: Optional[os.stat_result],
+    ctx: Optional[TransformContext] = None
+) -> Tuple[Dict, str]:
+    """
+    Bring one destination file up to date with its source.
+
+    A file whose transform signature differs from the manifest's is
+    rewritten even if its source did not change.
+
+    Returns:
+        Tuple of (manifest_record, outcome) where outcome is one of
+        'added', 'updated' or 'unchanged'
+    """
+    st = src.stat()
+    signature = ctx.signature if ctx is not None else ''
+    in_place = (
+        entry is not None
+        and dest_st is not None
+        and dest_st.st_size == entry.get('dest_size', entry['size'])
+        and entry.get('mode', 'copy') == engine.mode
+        and entry.get('transform', '') == signature
+    )
+
+    if in_place and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        return entry, 'unchanged'
+
+    digest = hash_file(src)
+    record = {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha256': digest,
+        'mode': engine.mode,
+    }
+    if signature:
+        record['transform'] = signature
+    if in_place and entry['sha256'] == digest:
+        if 'dest_size' in entry:
+            record['dest_size'] = entry['dest_size']
+        return record, 'unchanged'
+
+    engine.materialize_atomic(src, dest / rel, ctx, digest, st)
+    if signature:
+        record['dest_size'] = (dest / rel).stat().st_size
+    return record, 'updated' if dest_st is not None else 'added'
+
+
+def sync_tree(
+    sources: Dict[str, Path],
+    dest: Path,
+    manifest: Dict[str, Dict],
+    engine: Optional[CopyEngine] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+    plans: Optional[Dict[str, TransformContext]] = None
+) -> Tuple[Dict[str, Dict], Dict[str, int]]:
+    """
+    Make dest contain exactly the given source files, touching only what changed.
+
+    A file is skipped when its size and mtime match the manifest, or when
+    its content hash matches even though its metadata moved (e.g. after a
+    fresh checkout). Files materialized with a different mode than the
+    engine's are recreated. Anything in dest that is not a source is deleted.
+
+    Args:
+        sources: Mapping of destination-relative path to source file
+        dest: Destination directory (e.g. docs/<project>)
+        manifest: Manifest from the previous sync of this destination
+        engine: Copy engine deciding how files are materialized
+        executor: Optional thread pool to check and copy files on
+        plans: Transform contexts by destination-relative path, for the
+            files that are transformed on the way
+
+    Returns:
+        Tuple of (new_manifest, stats) where stats counts
+        added/updated/deleted/unchanged files and the bytes written
+    """
+    stats = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'bytes': 0}
+    engine = engine or CopyEngine()
+    plans = plans or {}
+    existing = scan_tree(dest)
+    rels = sorted(sources)
+
+    # Sizes from the last sync decide batching; new files count as small
+    results = map_batched(
+        lambda rel: sync_file(
+            engine, rel, sources[rel], dest, manifest.get(rel), existing.get(rel), plans.get(rel)
+        ),
+        rels,
+        [manifest.get(rel, {}).get('size', 0) for rel in rels],
+        executor
+    )
+
+    new_manifest = {}
+    for rel, (record, outcome) in zip(rels, results):
+        new_manifest[rel] = record
+        stats[outcome] += 1
+        if outcome != 'unchanged':
+            stats['bytes'] += record['size']
+
+    for rel in sorted(set(existing) - set(sources)):
+        (dest / rel).unlink()
+        stats['deleted'] += 1
+
+    if stats['deleted']:
+        remove_empty_dirs(dest)
+
+    return new_manifest, stats
+
+
+def format_sync_stats(stats: Dict[str, int]) -> str:
+    """Render sync stats as a short human-readable summary."""
+    return (
+        f"+{stats['added']} ~{stats['updated']} "
+        f"-{stats['deleted']} ={stats['unchanged']}"
+    )
+
+
+def plan_sources(
+    engine: CopyEngine,
+    project: str,
+    src: Path,
+    rels
+) -> Tuple[Dict[str, Path], Dict[str, TransformContext]]:
+    """
+    Map a project's docs/ files to their destinations.
+
+    Returns:
+        Tuple of (sources, plans) keyed by destination-relative path, where
+        plans only holds the files that are transformed
+    """
+    sources = {}
+    plans = {}
+    for rel in rels:
+        dest_rel, ctx = engine.plan(project, 'docs', rel)
+        sources[dest_rel] = src / rel
+        if ctx is not None:
+            plans[dest_rel] = ctx
+    return sources, plans
+
+
+def sync_project_docs(
+    projects_with_docs: Dict[str, str],
+    docs_dir: Path,
+    engine: Optional[CopyEngine] = None,
+    project_stats: Optional[Dict[str, Dict]] = None,
+    inventory: Optional[ProjectInventory] = None
+) -> Tuple[int, List[str]]:
+    """Incrementally sync docs/ directories from projects into main docs/."""
+    print("\n🔄 Syncing documentation from projects (incremental)...")
+    engine = engine or CopyEngine()
+    inventory = inventory or ProjectInventory(Path('projects'), use_cache=False)
+
+    def worker(name: str):
+        source_path = projects_with_docs[name]
+        src = Path(source_path)
+        if not src.exists():
+            return False, '', f"Source directory not found: {source_path}", (0, 0)
+
+        try:
+            sources, plans = plan_sources(engine, name, src, inventory.get(name, src)['files'])
+            manifest, stats = sync_tree(
+                sources,
+                docs_dir / name,
+                engine.load_manifest(name),
+                engine,
+                engine.files_for(len(sources)),
+                plans
+            )
+            engine.save_manifest(name, manifest)
+            moved = (stats['added'] + stats['updated'], stats['bytes'])
+            return True, f"   ✓ {name:20s} → docs/{name}/ ({format_sync_stats(stats)})", None, moved
+        except Exception as e:
+            return False, '', f"Failed to sync {source_path}: {e}", (0, 0)
+
+    return run_projects(list(projects_with_docs), worker, engine, project_stats)
+
+
+def sync_readme_only_projects(
+    readme_projects: List[str],
+    docs_dir: Path,
+    engine: Optional[CopyEngine] = None,
+    project_stats: Optional[Dict[str, Dict]] = None
+) -> Tuple[int, List[str]]:
+    """Incrementally sync README.md as index.md for projects without docs/."""
+    print("\n🔄 Syncing README.md files for projects without docs/ (incremental)...")
+    engine = engine or CopyEngine()
+
+    def worker(project: str):
+        readme = Path(f'projects/{project}/README.md')
+        if not readme.exists():
+            return False, '', f"README.md not found for project: {project}", (0, 0)
+
+        try:
+            _, ctx = engine.plan(project, 'readme', 'README.md', 'index.md')
+            manifest, stats = sync_tree(
+                {'index.md': readme},
+                docs_dir / project,
+                engine.load_manifest(project),
+                engine,
+                plans={'index.md': ctx} if ctx is not None else None
+            )
+            engine.save_manifest(project, manifest)
+            moved = (stats['added'] + stats['updated'], stats['bytes'])
+            return True, f"   ✓ {project:20s} → docs/{project}/index.md ({format_sync_stats(stats)})", None, moved
+        except Exception as e:
+            return False, '', f"Failed to sync README for {project}: {e}", (0, 0)
+
+    return run_projects(readme_projects, worker, engine, project_stats)
+
+
+def asset_store_path(digest: str) -> Path:
+    return CACHE_DIR / 'assets' / digest[:2] / digest
+
+
+def load_asset_index() -> Dict[str, List]:
+    """Load cached asset hashes ({docs path: [size, mtime_ns, sha256]})."""
+    try:
+        with open(CACHE_DIR / 'assets.json', 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != ASSET_INDEX_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_asset_index(files: Dict[str, List]) -> None:
+    path = CACHE_DIR / 'assets.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': ASSET_INDEX_VERSION, 'files': files}, f)
+    os.replace(tmp, path)
+
+
+def dedup_assets(
+    docs_dir: Path,
+    inventory: ProjectInventory,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Store identical non-Markdown files in docs/ once and hardlink every copy to it.
+
+    Candidates come from the project inventories; only files whose size
+    matches another file's are hashed, and hashes are reused while a
+    file's size and mtime are unchanged. Each duplicated blob is kept once
+    in .build-cache/assets/ and blobs no longer linked from docs/ are
+    removed. Later syncs replace linked files rather than writing into
+    them, so the store is never modified through docs/.
+
+    Returns:
+        Tuple of (stats, errors) where stats counts assets, hashed files,
+        duplicate files, newly linked files and bytes saved
+    """
+    stats = {'assets': 0, 'hashed': 0, 'duplicates': 0, 'linked': 0, 'bytes_saved': 0}
+    errors = []
+
+    candidates = {}  # docs-relative path -> [size, mtime_ns]
+    for name, entry in inventory.entries().items():
+        for rel, meta in entry['files'].items():
+            if not rel.endswith(('.md', '.mdx')):
+                candidates[f'{name}/{rel}'] = meta
+    stats['assets'] = len(candidates)
+
+    by_size = {}
+    for rel, (size, _) in candidates.items():
+        if size > 0:
+            by_size.setdefault(size, []).append(rel)
+    suspects = sorted(rel for rels in by_size.values() if len(rels) > 1 for rel in rels)
+
+    old_index = load_asset_index()
+    index = {}
+    to_hash = []
+    for rel in suspects:
+        cached = old_index.get(rel)
+        if cached and cached[:2] == candidates[rel]:
+            index[rel] = cached
+        else:
+            to_hash.append(rel)
+    for rel, digest in zip(to_hash, map_ordered(lambda r: hash_file(docs_dir / r), to_hash, executor)):
+        index[rel] = candidates[rel] + [digest]
+    stats['hashed'] = len(to_hash)
+
+    groups = {}
+    for rel in suspects:
+        groups.setdefault(index[rel][2], []).append(rel)
+
+    for digest, rels in sorted(groups.items()):
+        if len(rels) < 2:
+            continue
+        blob = asset_store_path(digest)
+        try:
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp = blob.with_name(f'.{digest}.tmp')
+                shutil.copyfile(docs_dir / rels[0], tmp)
+                os.replace(tmp, blob)
+            blob_st = blob.stat()
+        except OSError as e:
+            errors.append(f"Failed to store asset {rels[0]}: {e}")
+            continue
+
+        stats['duplicates'] += len(rels) - 1
+        stats['bytes_saved'] += (len(rels) - 1) * blob_st.st_size
+        for rel in rels:
+            dest = docs_dir / rel
+            try:
+                if dest.stat().st_ino == blob_st.st_ino:
+                    continue
+                tmp = dest.with_name(f'.{dest.name}.tmp')
+                if tmp.is_symlink() or tmp.exists():
+                    tmp.unlink()
+                os.link(blob, tmp)
+                os.replace(tmp, dest)
+                stats['linked'] += 1
+            except OSError as e:
+                errors.append(f"Failed to link asset {rel}: {e}")
+
+    # Drop blobs that nothing in docs/ links to any more
+    store = CACHE_DIR / 'assets'
+    if store.exists():
+        for rel, st in scan_tree(store).items():
+            if st.st_nlink == 1:
+                (store / rel).unlink()
+
+    save_asset_index(index)
+    return stats, errors
+
+
+def list_files(root: Path) -> Set[str]:
+    """Return the POSIX relative path of every file under root in one scandir pass."""
+    files = set()
+    if not root.is_dir():
+        return files
+
+    stack = [(root, '')]
+    while stack:
+        current, prefix = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((Path(entry.path), f'{prefix}{entry.name}/'))
+                elif entry.is_file() or (entry.is_symlink() and not entry.is_dir()):
+                    files.add(f'{prefix}{entry.name}')
+    return files
+
+
+def load_config(config_file: Path) -> Dict:
+    """Parse zensical.toml and return its [project] table."""
+    with open(config_file, 'rb') as f:
+        return tomllib.load(f).get('project', {})
+
+
+def snippet_base_paths(config_file: Path) -> List[Path]:
+    """Read pymdownx.snippets base_path from zensical.toml (default: the repository root)."""
+    try:
+        extensions = load_config(config_file).get('markdown_extensions', {})
+    except (OSError, tomllib.TOMLDecodeError):
+        return [Path('.')]
+    options = extensions.get('pymdownx', {}).get('snippets', {})
+    base = options.get('base_path', ['.']) if isinstance(options, dict) else ['.']
+    return [Path(path) for path in ([base] if isinstance(base, str) else base)]
+
+
+def iter_nav(
+    nav: List,
+    trail: Tuple[str, ...] = ()
+) -> Iterator[Tuple[Tuple[str, ...], str]]:
+    """
+    Walk a nav tree depth-first.
+
+    Yields:
+        (breadcrumb, target) for every page entry, where breadcrumb is the
+        tuple of section and page titles leading to it
+    """
+    for item in nav:
+        if isinstance(item, str):
+            yield trail, item
+        elif isinstance(item, dict):
+            for title, value in item.items():
+                if isinstance(value, str):
+                    yield trail + (title,), value
+                elif isinstance(value, list):
+                    yield from iter_nav(value, trail + (title,))
+
+
+def nav_target_exists(target: str, files: Set[str]) -> bool:
+    """Check a nav target against the docs/ file index."""
+    path = target[2:] if target.startswith('./') else target
+    if path.endswith('/') or not path:
+        return f'{path}index.md' in files or f'{path}README.md' in files
+    return path in files
+
+
+def validate_nav(
+    config_file: Path,
+    docs_dir: Path,
+    files: Optional[Set[str]] = None
+) -> List[str]:
+    """
+    Validate that all files referenced in navigation exist.
+
+    files is a precomputed index of paths under docs_dir; if omitted,
+    docs_dir is scanned once.
+    """
+    print("\n🔍 Validating navigation references...")
+    errors = []
+
+    if not config_file.exists():
+        errors.append(f"Config file not found at {config_file}")
+        return errors
+
+    try:
+        nav = load_config(config_file).get('nav', [])
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        errors.append(f"Failed to parse {config_file}: {e}")
+        return errors
+
+    if files is None:
+        files = list_files(docs_dir)
+    for breadcrumb, target in iter_nav(nav):
+        if '://' in target or target.startswith('mailto:'):
+            continue
+        if not nav_target_exists(target, files):
+            location = ' › '.join(breadcrumb) or '(untitled)'
+            errors.append(f"Referenced file not found: {target} ({location})")
+
+    if errors:
+        print(f"   ⚠️  Found {len(errors)} broken references")
+    else:
+        print("   ✓ All navigation references valid")
+
+    return errors
+
+
+def filter_nav(nav: List, keep: Callable[[str], bool]) -> List:
+    """Drop nav pages for which keep(target) is false, and sections left empty."""
+    filtered = []
+    for item in nav:
+        if isinstance(item, str):
+            if keep(item):
+                filtered.append(item)
+        elif isinstance(item, dict):
+            entry = {}
+            for title, value in item.items():
+                if isinstance(value, list):
+                    value = filter_nav(value, keep)
+                    if value:
+                        entry[title] = value
+                elif not isinstance(value, str) or keep(value):
+                    entry[title] = value
+            if entry:
+                filtered.append(entry)
+    return filtered
+
+
+def nav_to_toml(nav: List, depth: int = 1) -> str:
+    """Render a nav tree as a TOML array of inline tables, in the style of zensical.toml."""
+    pad = '  ' * depth
+    lines = []
+    for item in nav:
+        if isinstance(item, str):
+            lines.append(f'{pad}{json.dumps(item, ensure_ascii=False)},')
+            continue
+        for title, value in item.items():
+            key = json.dumps(title, ensure_ascii=False)
+            if isinstance(value, list):
+                lines.append(f'{pad}{{ {key} = [')
+                lines.append(nav_to_toml(value, depth + 1))
+                lines.append(f'{pad}]}},')
+            else:
+                lines.append(f'{pad}{{ {key} = {json.dumps(value, ensure_ascii=False)} }},')
+    return '\n'.join(line for line in lines if line)
+
+
+def replace_nav(text: str, nav_toml: str) -> str:
+    """
+    Replace the top-level `nav = [...]` array in a TOML document.
+
+    Only the array is rewritten; comments and every other setting stay
+    exactly as they are.
+    """
+    match = re.search(r'^nav\s*=\s*\[', text, re.MULTILINE)
+    if match is None:
+        raise ValueError("No nav array found")
+
+    depth = 0
+    quote = None
+    i = match.end() - 1
+    while i < len(text):
+        char = text[i]
+        if quote:
+            if char == '\\' and quote == '"':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '#':
+            i = text.find('\n', i)
+            if i < 0:
+                break
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                return text[:match.start()] + f'nav = [\n{nav_toml}\n]' + text[i + 1:]
+        i += 1
+    raise ValueError("Unterminated nav array")
+
+
+def write_only_config(config_file: Path, only: List[str], projects: List[str]) -> Tuple[Path, int, int]:
+    """
+    Write zensical.only.toml: the config with nav trimmed to the selected projects.
+
+    Pages of other projects are removed from nav, along with sections left
+    empty; pages outside any project (e.g. the home page) are kept.
+
+    Returns:
+        Tuple of (path, pages_kept, pages_total)
+    """
+    excluded = set(projects) - set(only)
+
+    def keep(target: str) -> bool:
+        path = target[2:] if target.startswith('./') else target
+        return path.split('/', 1)[0] not in excluded
+
+    nav = load_config(config_file).get('nav', [])
+    trimmed = filter_nav(nav, keep)
+    text = config_file.read_text(encoding='utf-8')
+    header = f'# Generated by build-docs.py --only {",".join(only)} from {config_file.name}; do not edit\n'
+    only_file = config_file.with_name(f'{config_file.stem}.only{config_file.suffix}')
+    only_file.write_text(header + replace_nav(text, nav_to_toml(trimmed)), encoding='utf-8')
+    return only_file, sum(1 for _ in iter_nav(trimmed)), sum(1 for _ in iter_nav(nav))
+
+
+def slugify(text: str) -> str:
+    """Turn heading text into an anchor id the way Python-Markdown's toc does."""
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'!?\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'[`*_~]', '', text)
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r'[^\w\s-]', '', text).strip().lower()
+    return re.sub(r'[-\s]+', '-', text)
+
+
+def parse_markdown_links(text: str) -> Dict[str, List]:
+    """
+    Extract heading anchors and internal link candidates from a Markdown page.
+
+    Fenced code blocks and inline code are ignored. Duplicate heading slugs
+    get _1, _2... suffixes like Python-Markdown's toc extension. Besides
+    [text](url), reference, <a>/<img> and <https://...> links, bare URLs are
+    collected too, since pymdownx.magiclink turns them into links.
+
+    Returns:
+        {'anchors': [anchor ids], 'links': [[line number, target], ...]}
+    """
+    anchors = []
+    seen = {}
+    links = []
+    fence = None
+    previous = ''
+
+    def add_heading(title: str) -> None:
+        custom = LINK_ATTR_ID_RE.search(title)
+        if custom:
+            anchors.append(custom.group(1))
+            return
+        slug = slugify(title)
+        if slug in seen:
+            seen[slug] += 1
+            slug = f'{slug}_{seen[slug]}'
+        else:
+            seen[slug] = 0
+        anchors.append(slug)
+
+    for lineno, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        marker = LINK_FENCE_RE.match(stripped)
+        if fence:
+            if marker and marker.group(1)[0] == fence[0] and len(marker.group(1)) >= len(fence):
+                fence = None
+            previous = ''
+            continue
+        if marker:
+            fence = marker.group(1)
+            previous = ''
+            continue
+
+        line = LINK_CODE_SPAN_RE.sub('', line)
+        heading = LINK_HEADING_RE.match(line)
+        if heading:
+            add_heading(heading.group(1))
+        elif previous and re.match(r'^(=+|-+)\s*$', line) and not previous.startswith(('-', '*', '>')):
+            add_heading(previous)
+
+        rest = line
+        for pattern in (LINK_INLINE_RE, LINK_REFDEF_RE, LINK_HTML_RE, LINK_AUTOLINK_RE):
+            for match in pattern.finditer(line):
+                links.append([lineno, match.group(1)])
+            rest = pattern.sub(' ', rest)
+        for match in LINK_BARE_URL_RE.finditer(rest):
+            url = match.group(0).rstrip(LINK_BARE_URL_TRAIL)
+            # A closing parenthesis belongs to the URL only if it opened one
+            while url.endswith(')') and url.count(')') > url.count('('):
+                url = url[:-1].rstrip(LINK_BARE_URL_TRAIL)
+            links.append([lineno, url])
+        for match in LINK_HTML_ID_RE.finditer(line):
+            anchors.append(match.group(1))
+
+        previous = stripped
+
+    return {'anchors': anchors, 'links': links}
+
+
+def parse_markdown_file(path: str) -> Dict[str, List]:
+    """Process-pool entry point: parse one file from disk."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return parse_markdown_links(f.read())
+
+
+def load_link_cache() -> Dict[str, Dict]:
+    """Load cached parse results keyed by content hash."""
+    try:
+        with open(CACHE_DIR / 'links.json', 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != LINK_CACHE_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_link_cache(entries: Dict[str, Dict]) -> None:
+    """Write cached parse results, keeping only entries seen in this run."""
+    path = CACHE_DIR / 'links.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': LINK_CACHE_VERSION, 'files': entries}, f)
+    os.replace(tmp, path)
+
+
+def resolve_link(page: str, target: str, files: Set[str]) -> Tuple[Optional[str], str]:
+    """
+    Resolve a link target found on page against the docs/ file index.
+
+    Returns:
+        Tuple of (resolved_path, anchor). resolved_path is None if the
+        target does not exist, '' if the link points into the same page.
+    """
+    path, _, anchor = target.partition('#')
+    path = path.split('?', 1)[0]
+    if not path:
+        return page, anchor
+
+    if path.startswith('/'):
+        resolved = posixpath.normpath(path.lstrip('/'))
+    else:
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(page), path))
+    if resolved == '.':
+        resolved = ''
+    if resolved.startswith('../'):
+        return None, anchor
+
+    prefix = f'{resolved}/' if resolved else ''
+    if resolved in files:
+        return resolved, anchor
+    if path.endswith('/') or '.' not in posixpath.basename(resolved):
+        # Directory-style URL: foo/ can be foo.md, foo/index.md or foo/README.md
+        for candidate in (f'{resolved}.md', f'{prefix}index.md', f'{prefix}README.md'):
+            if candidate in files:
+                return candidate, anchor
+    if resolved.endswith('.html'):
+        stem = resolved[:-len('.html')]
+        for candidate in (f'{stem}.md', f'{stem}.mdx'):
+            if candidate in files:
+                return candidate, anchor
+    return None, anchor
+
+
+def parse_pages(
+    docs_dir: Path,
+    jobs: int = 1,
+    files: Optional[Set[str]] = None
+) -> Tuple[List[str], Dict[str, Dict], int]:
+    """
+    Parse the links and anchors of every Markdown page under docs_dir.
+
+    Pages are parsed on a process pool. Parse results are cached in
+    .build-cache/links.json by content hash, so only changed pages are
+    re-parsed.
+
+    Returns:
+        Tuple of (pages, {page: parse result}, number of pages parsed)
+    """
+    files = list_files(docs_dir) if files is None else files
+    pages = sorted(rel for rel in files if rel.endswith(('.md', '.mdx')))
+
+    cache = load_link_cache()
+    hashes = {rel: hash_file(docs_dir / rel) for rel in pages}
+    missing = sorted({digest for digest in hashes.values() if digest not in cache})
+    to_parse = {}
+    for rel in pages:
+        to_parse.setdefault(hashes[rel], rel)
+    paths = [str(docs_dir / to_parse[digest]) for digest in missing]
+
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+            parsed = list(pool.map(parse_markdown_file, paths, chunksize=16))
+    else:
+        parsed = [parse_markdown_file(path) for path in paths]
+    cache.update(zip(missing, parsed))
+    save_link_cache({digest: cache[digest] for digest in set(hashes.values())})
+
+    return pages, {rel: cache[hashes[rel]] for rel in pages}, len(missing)
+
+
+def check_links(docs_dir: Path, jobs: int = 1) -> List[str]:
+    """
+    Check every relative link, image and #anchor in the Markdown under docs_dir.
+
+    Pages are parsed through parse_pages (cached by content hash);
+    resolution against the global page and anchor index is always redone.
+    """
+    print("\n🔗 Checking internal links and anchors...")
+    start = time.perf_counter()
+    files = list_files(docs_dir)
+    pages, results, parsed = parse_pages(docs_dir, jobs, files)
+    anchors = {rel: set(result['anchors']) for rel, result in results.items()}
+
+    errors = []
+    link_count = 0
+    for page in pages:
+        for lineno, raw_target in results[page]['links']:
+            target = raw_target.strip().strip('<>')
+            if not target or LINK_EXTERNAL_RE.match(target) or target.startswith('//'):
+                continue
+            link_count += 1
+            resolved, anchor = resolve_link(page, target, files)
+            if resolved is None:
+                errors.append(f"{page}:{lineno}: broken link '{target}'")
+            elif anchor and resolved in anchors and anchor not in anchors[resolved]:
+                errors.append(f"{page}:{lineno}: missing anchor '#{anchor}' in {resolved}")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"   Checked {link_count} links in {len(pages)} pages "
+        f"({parsed} parsed, {len(pages) - parsed} cached) [{elapsed:.2f}s]"
+    )
+    if errors:
+        print(f"   ⚠️  Found {len(errors)} broken links")
+    else:
+        print("   ✓ All internal links valid")
+    return errors
+
+
+class ExternalLinkChecker:
+    """
+    Checks external http(s) URLs concurrently on asyncio with keep-alive connections.
+
+    Connections are pooled per (scheme, host, port) and reused across
+    requests; at most per_host requests run against one host at a time and
+    at most total overall. Each URL is tried with HEAD first and, if the
+    server rejects or mishandles HEAD, with GET. Redirects are followed.
+    Only the status line and headers are needed, so GET bodies are drained
+    when small and the connection is dropped otherwise.
+    """
+
+    def __init__(
+        self,
+        total: int = EXTERNAL_LINK_CONCURRENCY,
+        per_host: int = EXTERNAL_LINK_PER_HOST,
+        timeout: float = EXTERNAL_LINK_TIMEOUT
+    ):
+        self.total = total
+        self.per_host = per_host
+        self.timeout = timeout
+        self.connections = 0
+        self.requests = 0
+        self._idle = {}
+        self._hosts = {}
+        self._all = None
+        self._ssl = None
+
+    def _host_limit(self, key: Tuple[str, str, int]) -> asyncio.Semaphore:
+        if key not in self._hosts:
+            self._hosts[key] = asyncio.Semaphore(self.per_host)
+        return self._hosts[key]
+
+    async def _connect(self, key: Tuple[str, str, int]):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        scheme, host, port = key
+        if scheme == 'https' and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        self.connections += 1
+        return await asyncio.open_connection(
+            host, port,
+            ssl=self._ssl if scheme == 'https' else None,
+            server_hostname=host if scheme == 'https' else None
+        )
+
+    def _release(self, key: Tuple[str, str, int], reader, writer, reusable: bool) -> None:
+        if reusable:
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+
+    async def _request(self, method: str, url: str) -> Tuple[int, Dict[str, str]]:
+        """Send one request and return (status, lower-cased headers)."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname or '', port)
+        target = parts.path or '/'
+        if parts.query:
+            target += f'?{parts.query}'
+        host = parts.hostname if parts.port is None else f'{parts.hostname}:{parts.port}'
+        request = (
+            f'{method} {target} HTTP/1.1\r\nHost: {host}\r\n'
+            f'User-Agent: {EXTERNAL_LINK_USER_AGENT}\r\nAccept: */*\r\n'
+            f'Connection: keep-alive\r\n\r\n'
+        ).encode('latin-1')
+
+        # Wait for the host's slot first so one busy host cannot hold every global slot
+        async with self._host_limit(key), self._all:
+            # A pooled connection may have been closed by the server; retry once on a new one
+            for attempt in range(2):
+                reader, writer = await self._connect(key)
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status_line = await reader.readline()
+                    if not status_line:
+                        raise ConnectionResetError('connection closed by server')
+                    break
+                except ConnectionError:
+                    writer.close()
+                    if attempt:
+                        raise
+                except BaseException:
+                    writer.close()
+                    raise
+
+            try:
+                self.requests += 1
+                status = int(status_line.split()[1])
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                reusable = headers.get('connection', '').lower() != 'close'
+                if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+                    pass
+                elif 'content-length' in headers:
+                    length = int(headers['content-length'])
+                    if length <= EXTERNAL_LINK_DRAIN_LIMIT:
+                        await reader.readexactly(length)
+                    else:
+                        reusable = False
+                else:
+                    # Chunked or read-until-close bodies are not worth draining
+                    reusable = False
+            except BaseException:
+                writer.close()
+                raise
+            self._release(key, reader, writer, reusable)
+            return status, headers
+
+    async def _fetch(self, method: str, url: str) -> Tuple[int, str]:
+        """Follow redirects; returns (final status, final URL)."""
+        for _ in range(EXTERNAL_LINK_MAX_REDIRECTS + 1):
+            status, headers = await asyncio.wait_for(self._request(method, url), self.timeout)
+            if status in (301, 302, 303, 307, 308) and headers.get('location'):
+                url = urljoin(url, headers['location'])
+                continue
+            return status, url
+        raise RuntimeError('too many redirects')
+
+    async def check(self, url: str) -> Dict:
+        """Check one URL; returns its cache record."""
+        record = {'checked_at': time.time()}
+        try:
+            status, final = await self._fetch('HEAD', url)
+            if status >= 400 and status != 429:
+                # Many servers reject or mishandle HEAD; only trust a GET failure
+                status, final = await self._fetch('GET', url)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, RuntimeError, ValueError, IndexError) as e:
+            record.update(ok=False, error=str(e) or type(e).__name__)
+            return record
+        record.update(ok=status < 400 or status == 429, status=status)
+        if final != url:
+            record['final_url'] = final
+        return record
+
+    async def run(self, urls: List[str]) -> Dict[str, Dict]:
+        self._all = asyncio.Semaphore(self.total)
+        try:
+            records = await asyncio.gather(*(self.check(url) for url in urls))
+        finally:
+            for connections in self._idle.values():
+                for _, writer in connections:
+                    writer.close()
+            self._idle.clear()
+        return dict(zip(urls, records))
+
+
+def load_external_link_cache() -> Dict[str, Dict]:
+    """Load cached external link results ({url: record})."""
+    try:
+        with open(CACHE_DIR / 'external-links.json', 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != EXTERNAL_LINK_CACHE_VERSION:
+        return {}
+    return data.get('urls', {})
+
+
+def save_external_link_cache(entries: Dict[str, Dict]) -> None:
+    path = CACHE_DIR / 'external-links.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': EXTERNAL_LINK_CACHE_VERSION, 'urls': entries}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def external_link_expired(record: Dict, now: float) -> bool:
+    """True once a cached result is older than its TTL (shorter for failures)."""
+    ttl = EXTERNAL_LINK_TTL_OK if record.get('ok') else EXTERNAL_LINK_TTL_FAILED
+    return now - record.get('checked_at', 0) > ttl
+
+
+def check_external_links(docs_dir: Path, jobs: int = 1) -> List[str]:
+    """
+    Check every external http(s) link in the Markdown under docs_dir.
+
+    URLs come from the same cached page parse as check_links. Results are
+    kept in .build-cache/external-links.json; only URLs whose result is
+    missing or past its TTL are requested again.
+    """
+    print("\n🌐 Checking external links...")
+    start = time.perf_counter()
+    pages, results, _ = parse_pages(docs_dir, jobs)
+
+    used_by = {}
+    for page in pages:
+        for lineno, raw_target in results[page]['links']:
+            url = raw_target.strip().strip('<>').split('#', 1)[0]
+            if EXTERNAL_LINK_RE.match(url):
+                used_by.setdefault(url, []).append(f'{page}:{lineno}')
+
+    cache = load_external_link_cache()
+    now = time.time()
+    stale = sorted(url for url in used_by if url not in cache or external_link_expired(cache[url], now))
+    checker = ExternalLinkChecker()
+    if stale:
+        cache.update(asyncio.run(checker.run(stale)))
+    save_external_link_cache({url: cache[url] for url in used_by})
+
+    errors = []
+    for url in sorted(used_by):
+        record = cache[url]
+        if record.get('ok'):
+            continue
+        problem = f"HTTP {record['status']}" if 'status' in record else record.get('error', 'failed')
+        for location in used_by[url]:
+            errors.append(f"{location}: external link '{url}' failed ({problem})")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"   Checked {len(used_by)} URLs ({len(stale)} requested over {checker.connections} "
+        f"connections, {len(used_by) - len(stale)} cached) [{elapsed:.2f}s]"
+    )
+    if errors:
+        print(f"   ⚠️  Found {len(errors)} broken external links")
+    else:
+        print("   ✓ All external links reachable")
+    return errors
+
+
+def project_revision(project_dir: Path) -> Optional[str]:
+    """
+    Return the commit a project checkout is at, or None if it has local changes.
+
+    Projects that are not git checkouts are identified by a hash of their
+    file contents instead.
+    """
+    if not (project_dir / '.git').exists():
+        digest = hashlib.sha256()
+        for rel in sorted(scan_tree(project_dir)):
+            digest.update(rel.encode('utf-8') + b'\0')
+            digest.update(hash_file(project_dir / rel).encode('ascii'))
+        return f'content:{digest.hexdigest()}'
+    return git_head(project_dir)
+
+
+def compute_fingerprint(
+    projects_root: Path,
+    config_file: Path,
+    docs_dir: Path,
+    projects: List[str],
+    inventory: Optional[ProjectInventory] = None,
+    options: Optional[Dict] = None
+) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Hash everything that determines the built site into a single build key.
+
+    The key covers each project's commit, the zensical config, the
+    hand-maintained files in docs/, this script, the post-build pipeline
+    (FINGERPRINT_PIPELINE_FILES) and the build options that change the
+    output (see fingerprint_options). Project revisions are shared with
+    the inventory when one is given.
+
+    Returns:
+        Tuple of (key, components). key is None if any input cannot be
+        identified reliably (e.g. a submodule with uncommitted changes).
+    """
+    components = {}
+    for project in sorted(projects):
+        project_dir = projects_root / project
+        if inventory is not None and (project_dir / '.git').exists():
+            revision = inventory.revision(project)
+        else:
+            revision = project_revision(project_dir)
+        if revision is None:
+            return None, components
+        components[f'project:{project}'] = revision
+
+    if config_file.exists():
+        components['config'] = hash_file(config_file)
+    components['script'] = hash_file(Path(__file__))
+    repo_root = Path(__file__).resolve().parent.parent
+    for rel in FINGERPRINT_PIPELINE_FILES:
+        if (repo_root / rel).is_file():
+            components[f'pipeline:{rel}'] = hash_file(repo_root / rel)
+    if options is not None:
+        components['options'] = json.dumps(options, sort_keys=True)
+
+    generated = set(projects) | {'.gitignore'}
+    for rel, _ in sorted(scan_tree(docs_dir).items()):
+        if rel.split('/', 1)[0] not in generated:
+            components[f'docs:{rel}'] = hash_file(docs_dir / rel)
 
-        dest_dir = docs_dir / project
-        dest_dir.mkdir(exist_ok=True)
-        try:
-            shutil.copy(readme, dest_dir / 'index.md')
-            print(f"   ✓ {project:20s} → docs/{project}/index.md")
-            copied += 1
-        except Exception as e:
-            errors.append(f"Failed to copy README for {project}: {e}")
+    payload = json.dumps(components, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest(), components
 
-    return copied, errors
 
+def fingerprint_options(args) -> Dict:
+    """
+    Return the build options that change the built site, normalized.
 
-def validate_nav(config_file: Path, docs_dir: Path) -> List[str]:
-    """Validate that all files referenced in navigation exist."""
-    print("\n🔍 Validating navigation references...")
-    errors = []
+    Order and spelling do not matter (--git-metadata is the same as
+    --transforms git-metadata); the fetch depth only counts when git
+    metadata is read.
+    """
+    transforms = sorted(set(args.transforms))
+    only = sorted({name.strip() for name in (args.only or '').split(',') if name.strip()})
+    return {
+        'transforms': transforms,
+        'materialize': args.materialize,
+        'depth': args.depth if 'git-metadata' in transforms else None,
+        'only': only,
+    }
 
-    if not config_file.exists():
-        errors.append(f"Config file not found at {config_file}")
-        return errors
 
-    with open(config_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+def fingerprint_path() -> Path:
+    """Return the location of the last successful build's fingerprint."""
+    return CACHE_DIR / 'fingerprint.json'
 
-    import re
-    for match in re.finditer(r'=\s*"([a-zA-Z0-9_/-]+\.md)"', content):
-        file_path = docs_dir / match.group(1)
-        if not file_path.exists():
-            errors.append(f"Referenced file not found: {match.group(1)}")
 
-    if errors:
-        print(f"   ⚠️  Found {len(errors)} broken references")
-    else:
-        print("   ✓ All navigation references valid")
+def load_last_fingerprint() -> Optional[str]:
+    """Return the build key recorded by the last successful build, if any."""
+    try:
+        with open(fingerprint_path(), 'r', encoding='utf-8') as f:
+            return json.load(f).get('key')
+    except (OSError, ValueError):
+        return None
+
+
+def save_fingerprint(key: str, components: Dict[str, str]) -> None:
+    """Record key as the last successful build."""
+    path = fingerprint_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'components': components}, f, indent=2, sort_keys=True)
 
-    return errors
+
+def set_ci_output(name: str, value: str) -> None:
+    """Expose a step output to GitHub Actions when running there."""
+    output_file = os.environ.get('GITHUB_OUTPUT')
+    if output_file:
+        with open(output_file, 'a', encoding='utf-8') as f:
+            f.write(f"{name}={value}\n")
 
 
 def generate_gitignore(docs_dir: Path, projects: List[str]) -> None:
@@ -163,10 +3101,654 @@ def generate_gitignore(docs_dir: Path, projects: List[str]) -> None:
     print(f"\n📝 Updated {gitignore_path}")
 
 
-def discover_projects(projects_root: Path) -> Tuple[Dict[str, str], List[str]]:
+class InotifyWatcher:
+    """
+    Directory watcher backed by Linux inotify (via ctypes, no dependencies).
+
+    Raises OSError on construction if inotify is unavailable, so callers
+    can fall back to PollingWatcher.
+    """
+
+    def __init__(self):
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._dirs = {}  # wd -> (directory, recursive)
+
+    def add(self, root: Path, recursive: bool = True) -> None:
+        """Watch root, and every directory below it if recursive."""
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(root), INOTIFY_MASK | IN_ONLYDIR
+        )
+        if wd < 0:
+            return
+        self._dirs[wd] = (root, recursive)
+        if recursive:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        self.add(Path(entry.path), True)
+
+    def read(self, timeout: Optional[float]) -> Set[Path]:
+        """Wait up to timeout seconds and return the paths that changed."""
+        import select
+
+        changed = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            raw_name = data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length]
+            offset += INOTIFY_EVENT.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: report every root for a rescan
+                changed.update(d for d, _ in self._dirs.values())
+                continue
+
+            watched = self._dirs.get(wd)
+            if watched is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._dirs[wd]
+                continue
+
+            directory, recursive = watched
+            name = os.fsdecode(raw_name.rstrip(b'\0'))
+            path = directory / name if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and recursive:
+                self.add(path, True)
+            changed.add(path)
+
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Portable watcher that diffs file size and mtime snapshots."""
+
+    def __init__(self, interval: float = WATCH_POLL_INTERVAL):
+        self.interval = interval
+        self._roots = {}  # root -> (recursive, snapshot)
+
+    def _snapshot(self, root: Path, recursive: bool) -> Dict[str, Tuple[int, int]]:
+        if recursive:
+            files = scan_tree(root)
+        else:
+            files = {}
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        files[entry.name] = entry.stat()
+        return {rel: (st.st_size, st.st_mtime_ns) for rel, st in files.items()}
+
+    def add(self, root: Path, recursive: bool = True) -> None:
+        self._roots[root] = (recursive, self._snapshot(root, recursive))
+
+    def read(self, timeout: Optional[float]) -> Set[Path]:
+        """Sleep for one poll interval (at most timeout) and return the paths that changed."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        changed = set()
+        for root, (recursive, before) in list(self._roots.items()):
+            try:
+                after = self._snapshot(root, recursive)
+            except OSError:
+                after = {}
+            for rel in set(before) | set(after):
+                if before.get(rel) != after.get(rel):
+                    changed.add(root / rel)
+            self._roots[root] = (recursive, after)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def create_watcher(force_polling: bool = False):
+    """Return an inotify watcher where supported, otherwise a polling one."""
+    if not force_polling and platform.system() == 'Linux':
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher()
+
+
+def wait_for_changes(watcher, debounce: float = WATCH_DEBOUNCE) -> Set[Path]:
+    """
+    Block until something changes, then collect the rest of the burst.
+
+    Returns once no new event has arrived for `debounce` seconds, or after
+    WATCH_MAX_DELAY so a continuous stream of writes cannot starve a sync.
+    """
+    changes = set()
+    while not changes:
+        changes = watcher.read(None)
+
+    deadline = time.monotonic() + WATCH_MAX_DELAY
+    while time.monotonic() < deadline:
+        more = watcher.read(debounce)
+        if not more:
+            break
+        changes |= more
+    return changes
+
+
+def sync_changed_paths(
+    name: str,
+    src_root: Path,
+    dest_root: Path,
+    changed: Set[Path],
+    engine: CopyEngine
+) -> Dict[str, int]:
+    """
+    Propagate only the given changed source paths into dest_root.
+
+    Paths may be files or directories, existing or deleted. Changing the
+    root itself (e.g. after an inotify queue overflow) re-syncs the whole
+    project through sync_tree.
+    """
+    manifest = engine.load_manifest(name)
+    stats = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'bytes': 0}
+
+    if src_root in changed:
+        sources, plans = plan_sources(engine, name, src_root, scan_tree(src_root))
+        manifest, stats = sync_tree(sources, dest_root, manifest, engine, plans=plans)
+        engine.save_manifest(name, manifest)
+        return stats
+
+    dest_files = scan_tree(dest_root)
+    files = {}
+    for path in sorted(changed):
+        rel = path.relative_to(src_root).as_posix()
+        if path.is_dir():
+            files.update({f'{rel}/{sub}': path / sub for sub in scan_tree(path)})
+        elif path.is_file():
+            files[rel] = path
+        else:
+            prefix = f'{rel}/'
+            dest_rel, _ = engine.plan(name, 'docs', rel)
+            gone = [r for r in dest_files if r in (rel, dest_rel) or r.startswith(prefix)]
+            for r in gone:
+                (dest_root / r).unlink()
+                manifest.pop(r, None)
+                del dest_files[r]
+                stats['deleted'] += 1
+
+    sources, plans = plan_sources(engine, name, src_root, sorted(files))
+    for file_rel, src in sorted(sources.items()):
+        record, outcome = sync_file(
+            engine, file_rel, src, dest_root, manifest.get(file_rel),
+            dest_files.get(file_rel), plans.get(file_rel)
+        )
+        manifest[file_rel] = record
+        stats[outcome] += 1
+        if outcome != 'unchanged':
+            stats['bytes'] += record['size']
+
+    if stats['deleted']:
+        remove_empty_dirs(dest_root)
+    engine.save_manifest(name, manifest)
+    return stats
+
+
+def watch_projects(
+    projects_with_docs: Dict[str, str],
+    readme_only_projects: List[str],
+    projects_root: Path,
+    docs_dir: Path,
+    engine: CopyEngine,
+    force_polling: bool = False
+) -> int:
+    """Watch project sources and live-sync changed files into docs/ until interrupted."""
+    watcher = create_watcher(force_polling)
+    kind = 'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'
+
+    roots = {}  # source root -> project name
+    for name, source_path in projects_with_docs.items():
+        watcher.add(Path(source_path), recursive=True)
+        roots[Path(source_path)] = name
+    for project in readme_only_projects:
+        watcher.add(projects_root / project, recursive=False)
+        roots[projects_root / project] = project
+
+    print(f"\n👀 Watching {len(roots)} projects for changes ({kind}), press Ctrl+C to stop...")
+    try:
+        while True:
+            changes = wait_for_changes(watcher)
+            start = time.perf_counter()
+
+            by_project = {}
+            for path in changes:
+                for root, name in roots.items():
+                    if path == root or root in path.parents:
+                        by_project.setdefault((name, root), set()).add(path)
+                        break
+
+            for (name, root), paths in sorted(by_project.items()):
+                try:
+                    if name in projects_with_docs:
+                        stats = sync_changed_paths(name, root, docs_dir / name, paths, engine)
+                    elif root / 'README.md' in paths or root in paths:
+                        _, ctx = engine.plan(name, 'readme', 'README.md', 'index.md')
+                        manifest, stats = sync_tree(
+                            {'index.md': root / 'README.md'},
+                            docs_dir / name,
+                            engine.load_manifest(name),
+                            engine,
+                            plans={'index.md': ctx} if ctx is not None else None
+                        )
+                        engine.save_manifest(name, manifest)
+                    else:
+                        continue
+                    if engine.transforms is not None and engine.transforms.snippets is not None:
+                        engine.transforms.snippets.save()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f"   🔄 {name:20s} {format_sync_stats(stats)} ({elapsed:.0f}ms)")
+                except Exception as e:
+                    print(f"   ❌ Failed to sync {name}: {e}")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+    return 0
+
+
+class RebuildQueue:
+    """
+    Collects rebuild requests and hands them out in coalesced batches.
+
+    A batch is released once no request has arrived for the debounce window,
+    or once the oldest request has waited max_delay, whichever comes first.
+    Requests arriving while a batch is being built go into the next one.
+    """
+
+    def __init__(self, debounce: float = DAEMON_DEBOUNCE, max_delay: float = DAEMON_MAX_DELAY):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.pending = set()
+        self.requests = 0
+        self._first = 0.0
+        self._last = 0.0
+        self._cond = threading.Condition()
+
+    def add(self, names: Set[str]) -> List[str]:
+        """Queue projects for rebuild; returns everything now pending."""
+        with self._cond:
+            now = time.monotonic()
+            if not self.pending:
+                self._first = now
+            self._last = now
+            self.pending |= names
+            self.requests += 1
+            self._cond.notify_all()
+            return sorted(self.pending)
+
+    def snapshot(self) -> Tuple[List[str], int]:
+        with self._cond:
+            return sorted(self.pending), self.requests
+
+    def take(self) -> Tuple[Set[str], int]:
+        """
+        Block until a batch is ready.
+
+        Returns:
+            Tuple of (project names, number of requests coalesced into it)
+        """
+        with self._cond:
+            while True:
+                if not self.pending:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                ready_at = min(self._last + self.debounce, self._first + self.max_delay)
+                if now >= ready_at:
+                    batch, count = self.pending, self.requests
+                    self.pending, self.requests = set(), 0
+                    return batch, count
+                self._cond.wait(ready_at - now)
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    """
+    HTTP endpoint of --daemon mode.
+
+    POST /rebuild queues projects, named by ?project=NAME (repeatable) or a
+    JSON body with "projects": [...], "repository": "org/repo" or a
+    repository_dispatch style {"client_payload": {"repository": ...}}.
+    With no names, every project is queued. GET /status reports the queue
+    and the last batch.
+    """
+
+    server_version = 'build-docs-daemon'
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def send_json(self, code: int, payload: Dict) -> None:
+        body = json.dumps(payload, indent=2).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != '/status':
+            self.send_json(404, {'error': 'not found'})
+            return
+        pending, requests = self.server.queue.snapshot()
+        self.send_json(200, dict(self.server.status, pending=pending, pending_requests=requests))
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != '/rebuild':
+            self.send_json(404, {'error': 'not found'})
+            return
+
+        names = list(parse_qs(url.query).get('project', []))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                self.send_json(400, {'error': 'body is not JSON'})
+                return
+            if isinstance(body, dict):
+                payload = body.get('client_payload') if isinstance(body.get('client_payload'), dict) else body
+                names += list(payload.get('projects', []))
+                if payload.get('repository'):
+                    names.append(payload['repository'])
+
+        projects, unknown = self.server.resolve(names)
+        if unknown:
+            self.send_json(400, {'error': 'unknown projects', 'unknown': unknown})
+            return
+        pending = self.server.queue.add(projects)
+        self.send_json(202, {'queued': sorted(projects), 'pending': pending})
+
+
+def project_aliases(projects_root: Path, projects: List[str]) -> Dict[str, str]:
+    """Map project names and their GitHub repository names (org/repo, repo) to project directories."""
+    aliases = {name.lower(): name for name in projects}
+    for sub in read_submodules(Path('.')):
+        name = Path(sub['path']).name
+        if name not in projects:
+            continue
+        repo = sub['url'].rstrip('/')
+        repo = repo[:-len('.git')] if repo.endswith('.git') else repo
+        parts = repo.replace(':', '/').split('/')
+        aliases.setdefault(parts[-1].lower(), name)
+        if len(parts) >= 2:
+            aliases.setdefault(f'{parts[-2]}/{parts[-1]}'.lower(), name)
+    return aliases
+
+
+def rebuild_projects(
+    names: Set[str],
+    projects_root: Path,
+    docs_dir: Path,
+    config_file: Path,
+    engine: CopyEngine,
+    inventory: ProjectInventory,
+    skip_update: bool,
+    depth: int
+) -> Dict:
+    """
+    Fetch and re-sync only the given projects; returns a summary of the batch.
+
+    Each project is re-classified (docs/ or README-only) after its fetch,
+    since a push may add or remove its docs/ directory.
+    """
+    start = time.perf_counter()
+    errors = []
+    names = sorted(names)
+
+    if not skip_update:
+        subs = {Path(sub['path']).name: sub for sub in read_submodules(Path('.'))}
+        git_dir = Path(run_git('rev-parse', '--git-dir').strip())
+
+        def fetch(name: str):
+            if name not in subs:
+                return None
+            try:
+                fetch_submodule(subs[name], Path('.'), git_dir, depth)
+            except subprocess.CalledProcessError as e:
+                return f"Failed to fetch {name}: {(e.stderr or str(e)).strip()}"
+            return None
+
+        errors += [error for error in map_ordered(fetch, names, engine.projects) if error]
+
+    with_docs = {}
+    readme_only = []
+    for name in names:
+        inventory.invalidate(name)
+        docs_path = projects_root / name / 'docs'
+        if docs_path.is_dir() and inventory.has_markdown(name, docs_path):
+            with_docs[name] = str(docs_path)
+        elif (projects_root / name / 'README.md').exists():
+            readme_only.append(name)
+        else:
+            errors.append(f"Nothing to publish for {name}")
+
+    transforms = engine.transforms
+    if transforms is not None and transforms.snippets is not None:
+        transforms.snippets.seen.clear()
+        transforms.snippets.project_sources.update({name: Path(path) for name, path in with_docs.items()})
+    if transforms is not None and transforms.git_metadata is not None:
+        transforms.git_metadata.scan(names, engine.jobs)
+        transforms.git_metadata.save()
+
+    project_stats = {}
+    if with_docs:
+        _, doc_errors = sync_project_docs(with_docs, docs_dir, engine, project_stats, inventory)
+        errors += doc_errors
+    if readme_only:
+        _, readme_errors = sync_readme_only_projects(readme_only, docs_dir, engine, project_stats)
+        errors += readme_errors
+
+    if transforms is not None and transforms.snippets is not None:
+        transforms.snippets.save()
+        errors += transforms.snippets.errors()
+    inventory.save()
+    nav_errors = validate_nav(config_file, docs_dir)
+
+    return {
+        'projects': names,
+        'seconds': round(time.perf_counter() - start, 4),
+        'files_moved': sum(stats['files_moved'] for stats in project_stats.values()),
+        'errors': errors,
+        'nav_errors': nav_errors,
+        'finished_at': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def serve_daemon(
+    projects: List[str],
+    projects_root: Path,
+    docs_dir: Path,
+    config_file: Path,
+    engine: CopyEngine,
+    inventory: ProjectInventory,
+    args
+) -> int:
+    """Serve rebuild requests on a local HTTP endpoint until interrupted."""
+    aliases = project_aliases(projects_root, projects)
+
+    def resolve(names: List[str]) -> Tuple[Set[str], List[str]]:
+        if not names:
+            return set(projects), []
+        found = {aliases[name.lower()] for name in names if name.lower() in aliases}
+        return found, sorted(name for name in names if name.lower() not in aliases)
+
+    queue = RebuildQueue(args.debounce)
+    server = ThreadingHTTPServer((args.bind, args.port), DaemonHandler)
+    server.daemon_threads = True
+    server.queue = queue
+    server.resolve = resolve
+    server.status = {'building': [], 'batches': 0, 'last': None}
+    threading.Thread(target=server.serve_forever, name='daemon-http', daemon=True).start()
+
+    host, port = server.server_address[:2]
+    print(f"\n🛰️  Daemon listening on http://{host}:{port} "
+          f"(POST /rebuild?project=NAME, GET /status; debounce {args.debounce:g}s), press Ctrl+C to stop...")
+    try:
+        while True:
+            names, requests = queue.take()
+            server.status['building'] = sorted(names)
+            print(f"\n🔁 Rebuilding {', '.join(sorted(names))} ({requests} requests coalesced)")
+            try:
+                result = rebuild_projects(
+                    names, projects_root, docs_dir, config_file, engine, inventory,
+                    args.no_update, args.depth
+                )
+            except Exception as e:
+                result = {'projects': sorted(names), 'errors': [str(e)], 'nav_errors': [], 'seconds': 0, 'files_moved': 0}
+            result['requests'] = requests
+            server.status.update(building=[], batches=server.status['batches'] + 1, last=result)
+
+            for error in result['errors'] + result['nav_errors']:
+                print(f"   - {error}")
+            if result['errors']:
+                print("   ⚠️  Rebuild failed, skipping --on-rebuild")
+                continue
+            print(f"   ✅ Rebuilt in {result['seconds']:.2f}s ({result['files_moved']} files moved)")
+            if args.on_rebuild:
+                hook = subprocess.run(args.on_rebuild, shell=True)
+                if hook.returncode:
+                    print(f"   ❌ --on-rebuild command exited with {hook.returncode}")
+    except KeyboardInterrupt:
+        print("\n👋 Daemon stopped")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return 0
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process and its children."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = 0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        peak = max(peak, resource.getrusage(who).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if platform.system() == 'Darwin' else peak * 1024
+
+
+class BuildReport:
+    """
+    Collects phase timings, per-project counts and errors for --report.
+
+    Writing is a no-op when no report path was given, so callers can
+    record unconditionally.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.phases = {}
+        self.projects = {}
+        self.errors = {}
+        self.info = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block and add it to the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def project(self, name: str) -> Dict:
+        """Return the (mutable) report record for a project."""
+        return self.projects.setdefault(name, {})
+
+    def add_errors(self, stage: str, errors: List[str]) -> None:
+        if errors:
+            self.errors.setdefault(stage, []).extend(errors)
+
+    def to_dict(self, status: int) -> Dict:
+        files = sum(p.get('files', 0) for p in self.projects.values())
+        size = sum(p.get('bytes', 0) for p in self.projects.values())
+        return {
+            'version': REPORT_VERSION,
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            'duration_seconds': round(time.perf_counter() - self._start, 4),
+            'exit_status': status,
+            'phases': {name: round(t, 4) for name, t in self.phases.items()},
+            'projects': self.projects,
+            'totals': {
+                'files': files,
+                'bytes': size,
+                'files_moved': sum(p.get('files_moved', 0) for p in self.projects.values()),
+                'bytes_moved': sum(p.get('bytes_moved', 0) for p in self.projects.values()),
+            },
+            'peak_rss_bytes': peak_rss_bytes(),
+            'errors': self.errors,
+            **self.info,
+        }
+
+    def write(self, status: int) -> None:
+        """Write the report as JSON if a path was configured."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(status), f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n📈 Wrote build report to {self.path}")
+
+
+def first_source_file(
+    projects_with_docs: Dict[str, str],
+    readme_only_projects: List[str]
+) -> Optional[Path]:
+    """Return any one source file, used to probe filesystem capabilities."""
+    for source_path in projects_with_docs.values():
+        for dirpath, _, filenames in os.walk(source_path):
+            if filenames:
+                return Path(dirpath) / filenames[0]
+    for project in readme_only_projects:
+        readme = Path(f'projects/{project}/README.md')
+        if readme.exists():
+            return readme
+    return None
+
+
+def discover_projects(
+    projects_root: Path,
+    inventory: Optional[ProjectInventory] = None
+) -> Tuple[Dict[str, str], List[str]]:
     """
     Automatically discover projects and categorize them.
 
+    A project's docs/ is only walked until the first Markdown file is
+    found, or not at all if the inventory has a valid cached entry.
+
     Returns:
         Tuple of (projects_with_docs, readme_only_projects)
     """
@@ -189,10 +3771,13 @@ def discover_projects(projects_root: Path) -> Tuple[Dict[str, str], List[str]]:
         readme_path = project_dir / 'README.md'
 
         # Check if project has a docs/ directory with content
-        if docs_path.exists() and docs_path.is_dir():
+        if docs_path.is_dir():
             # Verify it has at least one markdown file
-            md_files = list(docs_path.rglob('*.md'))
-            if md_files:
+            if inventory is not None:
+                found = inventory.has_markdown(project_name, docs_path)
+            else:
+                found = has_markdown(docs_path)
+            if found:
                 projects_with_docs[project_name] = str(docs_path)
                 continue
 
@@ -215,13 +3800,202 @@ def main():
         action='store_true',
         help='Skip git submodule update'
     )
+    parser.add_argument(
+        '--depth',
+        type=int,
+        metavar='N',
+        help=f'History depth fetched per submodule (default: {SUBMODULE_DEPTH}, '
+             f'0 with --git-metadata; 0 = full)'
+    )
+    parser.add_argument(
+        '--only',
+        metavar='PROJECTS',
+        help='Comma-separated projects to build; writes zensical.only.toml '
+             'with the nav trimmed to them'
+    )
     parser.add_argument(
         '--validate-only',
         action='store_true',
         help='Only validate navigation, do not copy files'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Sync only changed files using the manifest in .build-cache/ '
+             'instead of a clean copy. Files are replaced one at a time in '
+             'docs/, not staged: a failed sync can leave a project partly '
+             'updated and gives --rollback nothing to swap back'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar='N',
+        help=f'Number of copy worker threads (default: {DEFAULT_JOBS}, 1 = serial)'
+    )
+    parser.add_argument(
+        '--materialize',
+        choices=MATERIALIZE_MODES,
+        default='copy',
+        help='How files are created in docs/: copy bytes, hardlink, reflink '
+             '(copy-on-write clone), symlink, or auto-detect the cheapest '
+             'that works (default: copy)'
+    )
+    parser.add_argument(
+        '--transforms',
+        default=','.join(DEFAULT_TRANSFORMS),
+        metavar='LIST',
+        help=f'Comma-separated content transforms to apply while copying: '
+             f'{", ".join(TRANSFORMS)}, or "none" (default: {",".join(DEFAULT_TRANSFORMS)})'
+    )
+    parser.add_argument(
+        '--git-metadata',
+        action='store_true',
+        help='Add last-modified date, author and commit from each project\'s '
+             'git history to the copied pages\' front matter'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='After building, watch projects/ and live-sync changed files '
+             'into docs/ (implies --incremental, so updates are not staged)'
+    )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='Use polling instead of inotify in --watch mode'
+    )
+    parser.add_argument(
+        '--dedup-assets',
+        action='store_true',
+        help='Store identical non-Markdown files in docs/ once and hardlink '
+             'the duplicates to it'
+    )
+    parser.add_argument(
+        '--rollback',
+        nargs='?',
+        const='',
+        metavar='PROJECTS',
+        help=f'Swap the previous generation of the given comma-separated projects '
+             f'(default: all) back into docs/ from {PREVIOUS_DIR}/ and exit'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='After building, serve rebuild requests on a local HTTP endpoint '
+             'and re-sync only the named projects (implies --incremental, so '
+             'updates are not staged)'
+    )
+    parser.add_argument(
+        '--bind',
+        default=DAEMON_BIND,
+        help=f'Address the --daemon endpoint listens on (default: {DAEMON_BIND})'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=DAEMON_PORT,
+        help=f'Port of the --daemon endpoint (default: {DAEMON_PORT})'
+    )
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=DAEMON_DEBOUNCE,
+        metavar='SECONDS',
+        help=f'Coalesce --daemon requests arriving within this window (default: {DAEMON_DEBOUNCE:g})'
+    )
+    parser.add_argument(
+        '--on-rebuild',
+        metavar='COMMAND',
+        help='Shell command run after each successful --daemon rebuild '
+             '(e.g. "zensical build")'
+    )
+    parser.add_argument(
+        '--check-links',
+        action='store_true',
+        help='Check relative links, images and #anchors in the copied Markdown'
+    )
+    parser.add_argument(
+        '--check-external-links',
+        action='store_true',
+        help='Check external http(s) links in the copied Markdown (results cached in .build-cache/)'
+    )
+    parser.add_argument(
+        '--skip-if-unchanged',
+        action='store_true',
+        help='Exit early (and set the skip=true CI output) when the build '
+             'fingerprint matches the last successful build'
+    )
+    parser.add_argument(
+        '--mark-built',
+        action='store_true',
+        help='Record the current build fingerprint as successfully built '
+             '(run after zensical build and deploy) and exit'
+    )
+    parser.add_argument(
+        '--report',
+        type=Path,
+        metavar='PATH',
+        help='Write a JSON build report (phase timings, per-project counts, '
+             'peak RSS, errors) to PATH'
+    )
     args = parser.parse_args()
+    if args.only and (args.mark_built or args.skip_if_unchanged):
+        parser.error('--only builds a partial site; it cannot be combined with '
+                     '--mark-built or --skip-if-unchanged')
+    if args.watch and args.daemon:
+        parser.error('--watch and --daemon cannot be combined')
+    if args.watch or args.daemon:
+        args.incremental = True
+    args.transforms = [name for name in args.transforms.split(',') if name and name != 'none']
+    if args.git_metadata and 'git-metadata' not in args.transforms:
+        args.transforms.append('git-metadata')
+    if args.depth is None:
+        # Dates need history past the shallow boundary commit
+        args.depth = 0 if 'git-metadata' in args.transforms else SUBMODULE_DEPTH
+    unknown = sorted(set(args.transforms) - set(TRANSFORMS))
+    if unknown:
+        parser.error(f"unknown transforms: {', '.join(unknown)}")
+
+    report = BuildReport(args.report)
+    status = build(args, report)
+    report.write(status)
+    return status
+
+
+def rollback(docs_dir: Path, projects: str) -> int:
+    """
+    Swap the previous generation of projects back into docs/.
+
+    Sync manifests and the build fingerprint of the rolled back projects
+    no longer describe docs/, so they are dropped; the next --incremental
+    or --skip-if-unchanged run then rebuilds them.
+    """
+    generations = DocsGenerations(docs_dir)
+    available = generations.available()
+    names = [name.strip() for name in projects.split(',') if name.strip()] or available
+    if not names:
+        print(f"\n❌ No previous generations in {generations.previous_dir}/")
+        return 1
+    missing = [name for name in names if name not in available]
+    if missing:
+        print(f"\n❌ No previous generation for: {', '.join(missing)}")
+        print(f"   Available: {', '.join(available) or '(none)'}")
+        return 1
+
+    print("\n⏪ Rolling back to the previous generation...")
+    for name in names:
+        method = generations.rollback(name)
+        manifest_path(name).unlink(missing_ok=True)
+        print(f"   ✓ {name:20s} → docs/{name}/ ({method})")
+    fingerprint_path().unlink(missing_ok=True)
+    generations.cleanup()
+    print("\n✅ Rolled back; run --rollback again to return to the newer build")
+    return 0
 
+
+def build(args, report: BuildReport) -> int:
+    """Run the build pipeline for parsed command line arguments."""
     print("=" * 60)
     print("🚀 Soliplex Documentation Build Script")
     print("=" * 60)
@@ -231,9 +4005,25 @@ def main():
     config_file = Path('zensical.toml')
     projects_root = Path('projects')
 
+    if args.rollback is not None:
+        return rollback(docs_dir, args.rollback)
+
+    # Update submodules first so discovery sees the fetched trees
+    if not (args.validate_only or args.mark_built):
+        fetch_times = {}
+        with report.phase('submodule_update'):
+            updated = update_submodules(args.no_update, args.jobs, args.depth, timings=fetch_times)
+        for path, elapsed in fetch_times.items():
+            report.project(Path(path).name)['fetch_seconds'] = round(elapsed, 4)
+        if not updated:
+            report.add_errors('submodule_update', ['Failed to update submodules'])
+            return 1
+
     # Auto-discover projects
     print("\n🔍 Discovering projects...")
-    projects_with_docs, readme_only_projects = discover_projects(projects_root)
+    with report.phase('discovery'):
+        inventory = ProjectInventory(projects_root)
+        projects_with_docs, readme_only_projects = discover_projects(projects_root, inventory)
 
     if projects_with_docs:
         print(f"   Found {len(projects_with_docs)} projects with docs/:")
@@ -246,10 +4036,31 @@ def main():
             print(f"      - {name}")
 
     all_projects = list(projects_with_docs.keys()) + readme_only_projects
+    discovered_projects = all_projects
+
+    # Restrict the build to the requested projects
+    if args.only:
+        only = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = [name for name in only if name not in all_projects]
+        if unknown:
+            print(f"\n❌ Unknown projects: {', '.join(unknown)}")
+            print(f"   Available: {', '.join(sorted(all_projects))}")
+            return 1
+        projects_with_docs = {name: path for name, path in projects_with_docs.items() if name in only}
+        readme_only_projects = [name for name in readme_only_projects if name in only]
+        all_projects = list(projects_with_docs.keys()) + readme_only_projects
+
+        nav_config, kept, total = write_only_config(config_file, only, discovered_projects)
+        print(f"\n🎯 Building only: {', '.join(all_projects)}")
+        print(f"   Wrote {nav_config} ({kept}/{total} nav pages)")
+    else:
+        nav_config = config_file
 
     # Validate only mode
     if args.validate_only:
-        errors = validate_nav(config_file, docs_dir)
+        with report.phase('validation'):
+            errors = validate_nav(nav_config, docs_dir)
+        report.add_errors('navigation', errors)
         if errors:
             print("\n❌ Validation failed:")
             for error in errors:
@@ -258,19 +4069,137 @@ def main():
         print("\n✅ Validation passed!")
         return 0
 
-    # Update submodules
-    if not update_submodules(args.no_update):
-        return 1
+    if args.mark_built:
+        key, components = compute_fingerprint(
+            projects_root, config_file, docs_dir, discovered_projects, inventory,
+            fingerprint_options(args)
+        )
+        if key is None:
+            print("\n⚠️  Build inputs have local changes, fingerprint not recorded")
+            return 0
+        save_fingerprint(key, components)
+        print(f"\n🧮 Recorded build fingerprint {key[:12]}")
+        return 0
+
+    # Compare build inputs with the last successful build
+    with report.phase('fingerprint'):
+        fingerprint, _ = compute_fingerprint(
+            projects_root, config_file, docs_dir, discovered_projects, inventory,
+            fingerprint_options(args)
+        )
+        last_fingerprint = load_last_fingerprint()
+    if fingerprint is None:
+        cache_status = 'uncacheable'
+    elif fingerprint == last_fingerprint:
+        cache_status = 'hit'
+    else:
+        cache_status = 'miss'
+    report.info['fingerprint'] = {'key': fingerprint, 'cache': cache_status}
+    print(f"\n🧮 Build fingerprint: {(fingerprint or '-')[:12]} (cache {cache_status})")
 
-    # Clean existing directories
-    clean_docs_directory(docs_dir, all_projects)
+    if args.skip_if_unchanged:
+        set_ci_output('skip', 'true' if cache_status == 'hit' else 'false')
+        if cache_status == 'hit':
+            print("\n✅ Nothing changed since the last successful build, skipping")
+            return 0
 
-    # Copy documentation
-    copied_docs, doc_errors = copy_project_docs(projects_with_docs, docs_dir)
-    copied_readmes, readme_errors = copy_readme_only_projects(
-        readme_only_projects,
-        docs_dir
-    )
+    mode = args.materialize
+    if mode == 'auto':
+        sample = first_source_file(projects_with_docs, readme_only_projects)
+        mode = probe_materialize_mode(sample, docs_dir)
+        print(f"\n🔗 Materialization mode: {mode} (auto-detected)")
+    elif mode != 'copy':
+        print(f"\n🔗 Materialization mode: {mode}")
+    report.info['options'] = {
+        'jobs': args.jobs,
+        'incremental': args.incremental,
+        'materialize': mode,
+        'depth': args.depth,
+        'transforms': args.transforms,
+    }
+
+    # Last-change metadata from each project's history
+    git_metadata = None
+    if 'git-metadata' in args.transforms:
+        print("\n🕓 Reading git history...")
+        with report.phase('git_metadata'):
+            git_metadata = GitMetadata(projects_root)
+            summaries = git_metadata.scan(all_projects, args.jobs)
+            git_metadata.save()
+        report.info['git_metadata'] = summaries
+        for name, summary in summaries.items():
+            if summary['mode'] == 'unavailable':
+                print(f"   - {name:20s} not a git checkout, skipped")
+                continue
+            detail = f"{summary['commits']} new commits" if summary['mode'] == 'incremental' else summary['mode']
+            print(f"   ✓ {name:20s} {summary['files']} files ({detail})")
+            if summary['undated']:
+                print(f"      ⚠️  {summary['undated']} files only appear in the shallow boundary commit "
+                      f"and get no date; drop --depth/--no-update to fetch full history")
+
+    transforms = None
+    if args.transforms:
+        snippets = None
+        if 'snippets' in args.transforms:
+            snippets = SnippetGraph(snippet_base_paths(config_file), projects_with_docs, docs_dir, projects_root)
+        transforms = TransformPipeline(
+            args.transforms, repository_urls(Path('.')), snippets=snippets, git_metadata=git_metadata
+        )
+
+    project_stats = {}
+    with CopyEngine(args.jobs, mode, transforms) as engine:
+        if args.incremental:
+            # Sync only what changed since the last run
+            with report.phase('copy'):
+                copied_docs, doc_errors = sync_project_docs(
+                    projects_with_docs, docs_dir, engine, project_stats, inventory
+                )
+                copied_readmes, readme_errors = sync_readme_only_projects(
+                    readme_only_projects, docs_dir, engine, project_stats
+                )
+        else:
+            # Copy each project next to docs/ and swap it in when complete
+            generations = DocsGenerations(docs_dir)
+            with report.phase('copy'):
+                copied_docs, doc_errors = copy_project_docs(
+                    projects_with_docs, docs_dir, engine, project_stats, inventory, generations
+                )
+                copied_readmes, readme_errors = copy_readme_only_projects(
+                    readme_only_projects, docs_dir, engine, project_stats, generations
+                )
+            generations.cleanup()
+            report.info['swaps'] = generations.swaps
+
+    # Snippet includes that could not be resolved
+    snippet_errors = []
+    if transforms is not None and transforms.snippets is not None:
+        transforms.snippets.save()
+        snippet_errors = transforms.snippets.errors()
+        report.add_errors('snippets', snippet_errors)
+
+    # Per-project counts for the report
+    for name, entry in inventory.entries().items():
+        report.project(name).update({
+            'type': 'docs',
+            'files': entry['count'],
+            'markdown': entry['markdown'],
+            'bytes': entry['bytes'],
+            'extensions': entry['extensions'],
+        })
+    for name in readme_only_projects:
+        readme = projects_root / name / 'README.md'
+        report.project(name).update({
+            'type': 'readme',
+            'files': 1,
+            'markdown': 1,
+            'bytes': readme.stat().st_size if readme.exists() else 0,
+        })
+    for name, stats in project_stats.items():
+        report.project(name).update({
+            'copy_seconds': round(stats['seconds'], 4),
+            'files_moved': stats['files_moved'],
+            'bytes_moved': stats['bytes_moved'],
+        })
 
     # Report results
     print("\n" + "=" * 60)
@@ -278,34 +4207,142 @@ def main():
     print("=" * 60)
     print(f"✓ Projects with docs copied: {copied_docs}/{len(projects_with_docs)}")
     print(f"✓ README-only projects copied: {copied_readmes}/{len(readme_only_projects)}")
+    print(f"✓ Build fingerprint cache: {cache_status}")
+
+    if report.info.get('swaps'):
+        swaps = report.info['swaps']
+        print(f"✓ Projects swapped into docs/: {sum(swaps.values())} "
+              f"({', '.join(f'{method} {count}' for method, count in sorted(swaps.items()))})")
+    if engine.fallbacks:
+        print(f"✓ Files copied after {mode} failed: {engine.fallbacks}")
+    if transforms is not None:
+        print(f"✓ Transformed files: {transforms.misses} rendered, {transforms.hits} from cache")
+        report.info['transforms'] = {'rendered': transforms.misses, 'cached': transforms.hits}
+
+    copy_summary = engine.copy_summary()
+    report.info['copy'] = copy_summary
+    if any(stats['files'] for stats in copy_summary['classes'].values()):
+        print("\n📦 Copy throughput by file size:")
+        labels = {
+            'small': f"< {COPY_SMALL_FILE // 1024} KiB",
+            'medium': f"< {COPY_LARGE_FILE // (1024 * 1024)} MiB",
+            'large': f">= {COPY_LARGE_FILE // (1024 * 1024)} MiB",
+        }
+        for name, stats in copy_summary['classes'].items():
+            if not stats['files']:
+                continue
+            rate = (
+                f"{stats['mb_per_second']:8.1f} MB/s {stats['files_per_second']:8,d} files/s"
+                if stats['seconds'] else ''
+            )
+            print(f"   {name:6s} {labels[name]:>10s} {stats['files']:7d} files {stats['bytes']:>14,d} bytes {rate}")
+        print("   Methods: " + ', '.join(f"{method} {count}" for method, count in sorted(copy_summary['methods'].items())))
+
+    if project_stats:
+        print(f"\n⏱️  Per-project wall time ({args.jobs} jobs):")
+        for name in all_projects:
+            if name in project_stats:
+                print(f"   {name:20s} {project_stats[name]['seconds']:7.2f}s")
 
     # Report errors
     all_errors = doc_errors + readme_errors
+    report.add_errors('copy', all_errors)
     if all_errors:
         print(f"\n⚠️  Encountered {len(all_errors)} errors:")
         for error in all_errors:
             print(f"   - {error}")
 
-    # Validate navigation
-    nav_errors = validate_nav(config_file, docs_dir)
+    # Collapse duplicate assets onto one stored blob
+    if args.dedup_assets and not all_errors:
+        with report.phase('assets'):
+            with ThreadPoolExecutor(max(1, args.jobs)) as pool:
+                asset_stats, asset_errors = dedup_assets(docs_dir, inventory, pool)
+        report.info['assets'] = asset_stats
+        report.add_errors('assets', asset_errors)
+        all_errors += asset_errors
+        print(
+            f"\n🧩 Assets: {asset_stats['duplicates']} duplicates of "
+            f"{asset_stats['assets']} files, {asset_stats['bytes_saved']:,} bytes saved "
+            f"({asset_stats['linked']} newly linked)"
+        )
+        for error in asset_errors:
+            print(f"   - {error}")
+
+    if snippet_errors:
+        print(f"\n⚠️  Found {len(snippet_errors)} snippet include problems:")
+        for error in snippet_errors:
+            print(f"   - {error}")
+
+    # Validate navigation against the inventory unless the copy went wrong
+    with report.phase('validation'):
+        rename = (lambda name, rel: engine.plan(name, 'docs', rel)[0]) if transforms else None
+        docs_index = None if all_errors else inventory.docs_index(docs_dir, rename)
+        nav_errors = validate_nav(nav_config, docs_dir, docs_index)
+        inventory.save()
+    report.add_errors('navigation', nav_errors)
+
+    # Check links between pages
+    if args.check_links:
+        with report.phase('link_check'):
+            link_errors = check_links(docs_dir, args.jobs)
+        report.add_errors('links', link_errors)
+        for error in link_errors:
+            print(f"   - {error}")
+        nav_errors += link_errors
+
+    if args.check_external_links:
+        with report.phase('external_link_check'):
+            external_errors = check_external_links(docs_dir, args.jobs)
+        report.add_errors('external_links', external_errors)
+        for error in external_errors:
+            print(f"   - {error}")
+        nav_errors += external_errors
 
     # Update .gitignore
-    generate_gitignore(docs_dir, all_projects)
+    with report.phase('gitignore'):
+        generate_gitignore(docs_dir, discovered_projects)
+
+    status = 1 if all_errors or nav_errors or snippet_errors else 0
+
+    if args.watch:
+        report.write(status)
+        with CopyEngine(1, mode, transforms) as engine:
+            return watch_projects(
+                projects_with_docs,
+                readme_only_projects,
+                projects_root,
+                docs_dir,
+                engine,
+                args.poll
+            )
+
+    if args.daemon:
+        report.write(status)
+        with CopyEngine(args.jobs, mode, transforms, keep_manifests=True) as engine:
+            return serve_daemon(
+                all_projects,
+                projects_root,
+                docs_dir,
+                nav_config,
+                engine,
+                inventory,
+                args
+            )
 
     # Final status
     print("\n" + "=" * 60)
-    if all_errors or nav_errors:
+    if status:
         print("⚠️  Build completed with warnings")
-        print("\nTo build documentation, run:")
-        print("   zensical serve    # For local preview")
-        print("   zensical build    # For production build")
-        return 1
     else:
         print("✅ Documentation build completed successfully!")
-        print("\nTo build documentation, run:")
+    print("\nTo build documentation, run:")
+    if args.only:
+        print(f"   zensical serve -f {nav_config}    # For local preview of these projects")
+        print(f"   zensical build -f {nav_config}    # For a partial build")
+    else:
         print("   zensical serve    # For local preview")
         print("   zensical build    # For production build")
-        return 0
+    return status
 
 
 if __name__ == '__main__':
@@ -9,21 +9,38 @@ This script tests and compares three different approaches:
 3. File Copying with Build Script (Method 3)
 
 It provides a detailed comparison of pros/cons, compatibility, and recommendations.
+With --benchmark it instead times the methods against a synthetic corpus.
 """
 
+import contextlib
+import io
+import json
+import math
 import os
 import platform
+import random
 import shutil
+import statistics
 import subprocess
 import sys
+import tempfile
+import time
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Configure stdout for UTF-8 on Windows
 if platform.system() == 'Windows':
-    import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+# Vocabulary for synthetic benchmark pages
+CORPUS_WORDS = (
+    'soliplex ingester agent room document query index vector server client '
+    'config secret token pipeline workflow schema deploy docker oidc rag'
+).split()
+
+# A warm rebuild faster than this is not worth trading reliability for
+FAST_ENOUGH_SECONDS = 1.0
+
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -288,8 +305,295 @@ def test_method3_copy_files() -> Dict[str, any]:
     return result
 
 
-def generate_comparison_table(results: List[Dict[str, any]], info: Dict[str, str]):
-    """Generate a comparison table of all methods."""
+def load_build_docs():
+    """Import scripts/build-docs.py as a module (its file name is not importable)."""
+    import importlib.util
+
+    path = Path(__file__).resolve().with_name('build-docs.py')
+    spec = importlib.util.spec_from_file_location('build_docs', path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle its functions
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_corpus(
+    root: Path,
+    projects: int,
+    files: int,
+    assets: int,
+    asset_size: int,
+    seed: int = 0
+) -> Dict[str, int]:
+    """
+    Generate a synthetic projects/ tree under root.
+
+    Each project gets `files` Markdown pages (with headings, cross-links and
+    image references) spread over subdirectories, plus `assets` binary
+    files of `asset_size` bytes under docs/img/.
+
+    Returns:
+        Counts of generated projects, files and bytes
+    """
+    rng = random.Random(seed)
+    total_files = 0
+    total_bytes = 0
+
+    for p in range(projects):
+        docs = root / 'projects' / f'project-{p:03d}' / 'docs'
+        (docs / 'img').mkdir(parents=True, exist_ok=True)
+
+        for a in range(assets):
+            data = rng.randbytes(asset_size)
+            (docs / 'img' / f'asset-{a:03d}.png').write_bytes(data)
+            total_files += 1
+            total_bytes += len(data)
+
+        for f in range(files):
+            section = docs / f'section-{f // 20:02d}'
+            section.mkdir(exist_ok=True)
+            sibling = f'page-{rng.randrange(files):04d}.md'
+            lines = [f'# Page {f} of project {p}', '']
+            for h in range(3):
+                lines += [
+                    f'## Heading {h}',
+                    '',
+                    ' '.join(rng.choice(CORPUS_WORDS) for _ in range(120)),
+                    '',
+                    f'See [another page](../section-{rng.randrange(files) // 20:02d}/{sibling}#heading-{h}).',
+                    '',
+                ]
+            if assets:
+                lines.append(f'![diagram](../img/asset-{rng.randrange(assets):03d}.png)')
+            text = '\n'.join(lines) + '\n'
+            (section / f'page-{f:04d}.md').write_text(text, encoding='utf-8')
+            total_files += 1
+            total_bytes += len(text)
+
+    return {'projects': projects, 'files': total_files, 'bytes': total_bytes}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_runs(
+    run: Callable[[], None],
+    reset: Callable[[], None],
+    runs: int,
+    cold: bool
+) -> Dict[str, float]:
+    """
+    Time a method repeatedly.
+
+    Cold runs reset the destination before every run; warm runs reset
+    once, do an untimed priming run and then time re-runs over the
+    existing output.
+    """
+    samples = []
+    if not cold:
+        reset()
+        run()
+    for _ in range(runs):
+        if cold:
+            reset()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+
+    return {
+        'median': statistics.median(samples),
+        'p95': percentile(samples, 95),
+        'min': min(samples),
+        'max': max(samples),
+        'samples': samples,
+    }
+
+
+def benchmark_methods(root: Path, runs: int, jobs: int) -> Dict[str, Dict]:
+    """
+    Time every measurable method against the corpus under root.
+
+    Method 2 (monorepo plugin) only runs inside an MkDocs build and is not
+    timed here.
+    """
+    build_docs = load_build_docs()
+    projects_root = root / 'projects'
+    docs_dir = root / 'docs'
+    names = sorted(p.name for p in projects_root.iterdir())
+    sources = {name: str(projects_root / name / 'docs') for name in names}
+
+    def reset():
+        for path in (docs_dir, root / build_docs.CACHE_DIR):
+            if path.exists():
+                shutil.rmtree(path)
+        docs_dir.mkdir()
+
+    def symlinks():
+        for name in names:
+            link = docs_dir / name
+            if link.is_symlink():
+                link.unlink()
+            link.symlink_to(Path(sources[name]).resolve(), target_is_directory=True)
+
+    def copytree():
+        for name in names:
+            dest = docs_dir / name
+            if dest.exists():
+                shutil.rmtree(dest)
+            shutil.copytree(sources[name], dest)
+
+    def build_script(mode: str):
+        def run():
+            with build_docs.CopyEngine(jobs, mode) as engine:
+                inventory = build_docs.ProjectInventory(Path('projects'), use_cache=False)
+                build_docs.sync_project_docs(
+                    {name: f'projects/{name}/docs' for name in names},
+                    Path('docs'),
+                    engine,
+                    None,
+                    inventory
+                )
+        return run
+
+    # Symlinks may fail without privileges on Windows; that is reported per method
+    methods = {
+        'Method 1: Symlinks': symlinks,
+        'Method 3: copytree (clean copy)': copytree,
+    }
+    sample = build_docs.first_source_file(sources, [])
+    auto_mode = build_docs.probe_materialize_mode(sample, docs_dir)
+    methods['Method 3: build-docs.py (copy)'] = build_script('copy')
+    if auto_mode != 'copy':
+        methods[f'Method 3: build-docs.py ({auto_mode})'] = build_script(auto_mode)
+
+    results = {}
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        for label, run in methods.items():
+            results[label] = {}
+            for phase, cold in (('cold', True), ('warm', False)):
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        results[label][phase] = time_runs(run, reset, runs, cold)
+                except OSError as e:
+                    results[label][phase] = {'error': str(e)}
+    finally:
+        os.chdir(previous)
+    return results
+
+
+def method_timings(benchmark: Dict[str, Dict]) -> List[Optional[Dict[str, float]]]:
+    """
+    Reduce benchmark results to cold/warm medians per comparison column.
+
+    Method 3 is represented by its fastest build-docs.py variant, the way
+    it would be run. Method 2 is never timed, and methods that failed have
+    no timing.
+
+    Returns:
+        [method 1, method 2, method 3], each {'cold': s, 'warm': s} or None
+    """
+    def medians(labels: List[str]) -> Optional[Dict[str, float]]:
+        timed = [
+            benchmark[label] for label in labels
+            if all('error' not in benchmark[label][phase] for phase in ('cold', 'warm'))
+        ]
+        if not timed:
+            return None
+        best = min(timed, key=lambda phases: phases['warm']['median'])
+        return {phase: best[phase]['median'] for phase in ('cold', 'warm')}
+
+    return [
+        medians([label for label in benchmark if label.startswith('Method 1:')]),
+        None,
+        medians([label for label in benchmark if label.startswith('Method 3: build-docs.py')]),
+    ]
+
+
+def run_benchmark(args) -> Dict[str, Dict]:
+    """Generate a synthetic corpus, time each method and report the numbers."""
+    print_header("Multi-Project Documentation Method Benchmark")
+
+    work_dir = Path(tempfile.mkdtemp(prefix='docs-bench-', dir=args.work_dir))
+    try:
+        print_section("Corpus")
+        corpus = generate_corpus(
+            work_dir, args.projects, args.files, args.assets, args.asset_size, args.seed
+        )
+        print(f"  Projects:  {corpus['projects']}")
+        print(f"  Files:     {corpus['files']} ({args.files} pages + {args.assets} assets per project)")
+        print(f"  Size:      {corpus['bytes'] / 1024 / 1024:.1f} MiB")
+        print(f"  Runs:      {args.runs} cold + {args.runs} warm per method")
+
+        print_section("Results (seconds)")
+        results = benchmark_methods(work_dir, args.runs, args.jobs)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"  {'Method':40s} {'cold p50':>10s} {'cold p95':>10s} {'warm p50':>10s} {'warm p95':>10s}")
+    print(f"  {'-' * 84}")
+    for label, phases in results.items():
+        cells = []
+        for phase in ('cold', 'warm'):
+            timing = phases[phase]
+            if 'error' in timing:
+                cells += ['error', 'error']
+            else:
+                cells += [f"{timing['median']:.4f}", f"{timing['p95']:.4f}"]
+        print(f"  {label:40s} {cells[0]:>10s} {cells[1]:>10s} {cells[2]:>10s} {cells[3]:>10s}")
+
+    measured = {
+        label: phases['warm']['median']
+        for label, phases in results.items()
+        if 'error' not in phases['warm']
+    }
+    if measured:
+        fastest = min(measured, key=measured.get)
+        print(f"\n  {Colors.OKGREEN}{Colors.BOLD}Fastest warm rebuild: {fastest}{Colors.ENDC}")
+
+    if args.json:
+        payload = {
+            'system': {
+                'platform': platform.system(),
+                'platform_release': platform.release(),
+                'python_version': platform.python_version(),
+            },
+            'corpus': corpus,
+            'parameters': {
+                'projects': args.projects,
+                'files': args.files,
+                'assets': args.assets,
+                'asset_size': args.asset_size,
+                'runs': args.runs,
+                'jobs': args.jobs,
+                'seed': args.seed,
+            },
+            'results': results,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        print(f"\n  Wrote results to {args.json}")
+
+    return results
+
+
+def generate_comparison_table(
+    results: List[Dict[str, any]],
+    info: Dict[str, str],
+    timings: Optional[List[Optional[Dict[str, float]]]] = None
+):
+    """
+    Generate a comparison table of all methods.
+
+    With timings from method_timings (--benchmark), the runtime rating is
+    replaced by the measured medians and they inform the recommendation.
+    """
     print_header("Comparison Summary")
 
     # Overall compatibility
@@ -303,10 +607,21 @@ def generate_comparison_table(results: List[Dict[str, any]], info: Dict[str, str
     # Detailed comparison
     print(f"\n{Colors.BOLD}Detailed Comparison:{Colors.ENDC}\n")
 
+    if timings:
+        def measured(phase: str) -> List[str]:
+            return [f"{timing[phase]:.3f}s" if timing else 'not timed' for timing in timings]
+        performance = [
+            ('Cold Build (p50)', measured('cold')),
+            ('Warm Rebuild (p50)', measured('warm')),
+        ]
+    else:
+        # A rough rating; run with --benchmark for measured numbers
+        performance = [('Runtime Performance', ['Fast', 'Medium', 'Fast'])]
+
     criteria = [
         ('Platform Independence', ['Medium', 'High', 'Very High']),
         ('Setup Complexity', ['Low', 'Medium', 'Medium']),
-        ('Runtime Performance', ['Fast', 'Medium', 'Fast']),
+        *performance,
         ('Maintenance Burden', ['Low', 'Medium', 'Medium']),
         ('CI/CD Compatibility', ['Medium', 'High', 'Very High']),
         ('Special File Support', ['Limited', 'Good', 'Excellent']),
@@ -350,6 +665,22 @@ def generate_comparison_table(results: List[Dict[str, any]], info: Dict[str, str
         reasons.append("✓ Simplest approach")
         reasons.append("⚠ Platform compatibility concerns")
 
+    # Measured numbers override the reliability preference only when the copy is slow
+    copy_timing = timings[2] if timings else None
+    link_timing = timings[0] if timings else None
+    if recommendation and recommendation.startswith('Method 3') and copy_timing:
+        if copy_timing['warm'] <= FAST_ENOUGH_SECONDS or not (results[0]['supported'] and link_timing):
+            reasons.append(f"✓ Measured: warm rebuild {copy_timing['warm']:.3f}s, "
+                           f"cold build {copy_timing['cold']:.3f}s")
+        else:
+            recommendation = "Method 1: Symlinks"
+            reasons = [
+                f"✓ Measured: warm rebuild {link_timing['warm']:.3f}s vs "
+                f"{copy_timing['warm']:.3f}s for the build script",
+                "✓ Symlinks work on this system",
+                "⚠ Copying is slow here; revisit if the site moves to Windows or CI",
+            ]
+
     if recommendation:
         print(f"\n  {Colors.OKGREEN}{Colors.BOLD}Recommended: {recommendation}{Colors.ENDC}\n")
         for reason in reasons:
@@ -365,8 +696,50 @@ def generate_comparison_table(results: List[Dict[str, any]], info: Dict[str, str
     print(f"  5. Update index.md to reference all projects")
 
 
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        import argparse
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Compare multi-project documentation methods'
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='Time the methods against a synthetic corpus and use the '
+             'measurements in the comparison and recommendation'
+    )
+    parser.add_argument('--projects', type=int, default=7, help='Synthetic projects (default: 7)')
+    parser.add_argument('--files', type=int, default=50, help='Markdown pages per project (default: 50)')
+    parser.add_argument('--assets', type=int, default=5, help='Binary assets per project (default: 5)')
+    parser.add_argument(
+        '--asset-size',
+        type=int,
+        default=256 * 1024,
+        help='Size of each binary asset in bytes (default: 262144)'
+    )
+    parser.add_argument('--runs', type=positive_int, default=5, help='Timed runs per method and phase (default: 5)')
+    parser.add_argument('--jobs', type=int, default=4, help='Worker threads for build-docs.py (default: 4)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the corpus (default: 0)')
+    parser.add_argument(
+        '--work-dir',
+        default=None,
+        help='Directory to create the corpus in (default: system temp dir)'
+    )
+    parser.add_argument('--json', metavar='PATH', help='Write benchmark results as JSON to PATH')
+    args = parser.parse_args()
+
+    timings = method_timings(run_benchmark(args)) if args.benchmark else None
+
     print_header("MkDocs Multi-Project Documentation Method Comparison")
 
     # Gather system info
@@ -380,7 +753,7 @@ def main():
     ]
 
     # Generate comparison
-    generate_comparison_table(results, info)
+    generate_comparison_table(results, info, timings)
 
     print(f"\n{Colors.BOLD}{'=' * 70}{Colors.ENDC}\n")
 
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental deploy of the built site/ directory to a gh-pages branch.
+
+Instead of force-pushing a freshly built tree on every run, this script:
+- Fetches the current tip of the target branch
+- Compares git blob hashes of every file in site/ with the tree at that tip
+- Writes only new and changed blobs, builds the new tree through a
+  temporary index and commits it on top of the tip
+- Skips the commit and push entirely when nothing changed
+
+The push is a normal fast-forward, so only the changed objects travel.
+The remote can be any git URL or path, including a local bare repository.
+"""
+
+import hashlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Configure stdout for UTF-8 on Windows
+if platform.system() == 'Windows':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+CACHE_DIR = Path('.build-cache')
+BLOB_CACHE_VERSION = 1
+
+DEFAULT_REMOTE = 'origin'
+DEFAULT_BRANCH = 'gh-pages'
+DEPLOY_REF_PREFIX = 'refs/deploy'
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+
+# git tree entry modes
+MODE_FILE = '100644'
+MODE_EXECUTABLE = '100755'
+MODE_SYMLINK = '120000'
+NULL_SHA = '0' * 40
+
+
+def run_git(*args: str, input: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> str:
+    """Run a git command in the current repository and return its stdout."""
+    result = subprocess.run(
+        ['git', *args],
+        input=input,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env
+    )
+    return result.stdout
+
+
+def blob_sha(data: bytes) -> str:
+    """Compute the git blob id of data without writing it."""
+    digest = hashlib.sha1(f'blob {len(data)}\0'.encode('ascii'))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def load_blob_cache() -> Dict[str, List]:
+    """Load cached blob ids ({site path: [size, mtime_ns, sha]})."""
+    try:
+        with open(CACHE_DIR / 'deploy-blobs.json', 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != BLOB_CACHE_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_blob_cache(files: Dict[str, List]) -> None:
+    path = CACHE_DIR / 'deploy-blobs.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': BLOB_CACHE_VERSION, 'files': files}, f)
+    os.replace(tmp, path)
+
+
+def scan_site(site_dir: Path, jobs: int = DEFAULT_JOBS) -> Dict[str, Tuple[str, str]]:
+    """
+    Build the {path: (mode, blob sha)} manifest of site_dir.
+
+    Blob ids are reused from .build-cache/deploy-blobs.json while a file's
+    size and mtime are unchanged; other files are hashed on a thread pool.
+    """
+    stats = {}
+    for root, dirs, names in os.walk(site_dir):
+        dirs[:] = [d for d in dirs if d != '.git']
+        for name in names:
+            path = Path(root) / name
+            stats[path.relative_to(site_dir).as_posix()] = path.lstat()
+
+    cache = load_blob_cache()
+    manifest = {}
+    to_hash = []
+    for rel, st in stats.items():
+        if os.path.islink(site_dir / rel):
+            target = os.readlink(site_dir / rel).encode('utf-8')
+            manifest[rel] = (MODE_SYMLINK, blob_sha(target))
+            continue
+        mode = MODE_EXECUTABLE if st.st_mode & 0o111 else MODE_FILE
+        cached = cache.get(rel)
+        if cached and cached[:2] == [st.st_size, st.st_mtime_ns]:
+            manifest[rel] = (mode, cached[2])
+        else:
+            to_hash.append((rel, mode))
+
+    with ThreadPoolExecutor(max(1, jobs)) as pool:
+        shas = pool.map(lambda item: blob_sha((site_dir / item[0]).read_bytes()), to_hash)
+        for (rel, mode), sha in zip(to_hash, shas):
+            manifest[rel] = (mode, sha)
+
+    save_blob_cache({
+        rel: [stats[rel].st_size, stats[rel].st_mtime_ns, sha]
+        for rel, (mode, sha) in manifest.items()
+        if mode != MODE_SYMLINK
+    })
+    return manifest
+
+
+def fetch_tip(remote: str, branch: str) -> Optional[str]:
+    """
+    Fetch the tip of remote's branch into DEPLOY_REF_PREFIX/<branch>.
+
+    The fetch is only shallow when the repository already is, since a
+    shallow fetch would otherwise truncate the history of a full clone.
+
+    Returns:
+        The tip commit, or None if the branch does not exist yet
+    """
+    ref = f'{DEPLOY_REF_PREFIX}/{branch}'
+    shallow = run_git('rev-parse', '--is-shallow-repository').strip() == 'true'
+    try:
+        run_git(
+            'fetch', '--quiet', *(['--depth=1'] if shallow else []),
+            remote, f'+refs/heads/{branch}:{ref}'
+        )
+    except subprocess.CalledProcessError as e:
+        if "couldn't find remote ref" in e.stderr:
+            return None
+        raise
+    return run_git('rev-parse', ref).strip()
+
+
+def read_tree(commit: Optional[str]) -> Dict[str, Tuple[str, str]]:
+    """Return the {path: (mode, blob sha)} manifest of a commit's tree."""
+    if commit is None:
+        return {}
+    tree = {}
+    for record in run_git('ls-tree', '-r', '-z', '--full-tree', commit).split('\0'):
+        if not record:
+            continue
+        meta, _, path = record.partition('\t')
+        mode, _, sha = meta.split(' ')
+        tree[path] = (mode, sha)
+    return tree
+
+
+def diff_manifests(
+    old: Dict[str, Tuple[str, str]],
+    new: Dict[str, Tuple[str, str]]
+) -> Tuple[List[str], List[str], List[str]]:
+    """Return (added, changed, deleted) paths between two tree manifests."""
+    added = sorted(set(new) - set(old))
+    deleted = sorted(set(old) - set(new))
+    changed = sorted(path for path in set(old) & set(new) if old[path] != new[path])
+    return added, changed, deleted
+
+
+def write_blobs(site_dir: Path, paths: List[str], manifest: Dict[str, Tuple[str, str]]) -> None:
+    """Store the given files as git objects, in one hash-object call."""
+    regular = [path for path in paths if manifest[path][0] != MODE_SYMLINK]
+    if regular:
+        stdin = ''.join(f'{site_dir / path}\n' for path in regular)
+        shas = run_git('hash-object', '-w', '--no-filters', '--stdin-paths', input=stdin).split()
+        for path, sha in zip(regular, shas):
+            if sha != manifest[path][1]:
+                raise RuntimeError(f"{path} changed while deploying")
+    for path in paths:
+        if manifest[path][0] == MODE_SYMLINK:
+            target = os.readlink(site_dir / path)
+            run_git('hash-object', '-w', '--stdin', input=target)
+
+
+def build_commit(
+    parent: Optional[str],
+    manifest: Dict[str, Tuple[str, str]],
+    updates: List[str],
+    deleted: List[str],
+    message: str
+) -> str:
+    """
+    Create a commit whose tree is parent's tree with the given updates applied.
+
+    Uses a throwaway index (GIT_INDEX_FILE) so the working tree and the
+    repository's own index are never touched.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, GIT_INDEX_FILE=str(Path(tmp) / 'index'))
+        if parent is not None:
+            run_git('read-tree', parent, env=env)
+        info = ''.join(f'{manifest[path][0]} {manifest[path][1]}\t{path}\n' for path in updates)
+        info += ''.join(f'0 {NULL_SHA}\t{path}\n' for path in deleted)
+        run_git('update-index', '--index-info', input=info, env=env)
+        tree = run_git('write-tree', env=env).strip()
+
+    args = ['commit-tree', tree, '-m', message]
+    if parent is not None:
+        args += ['-p', parent]
+    return run_git(*args).strip()
+
+
+def set_ci_output(name: str, value: str) -> None:
+    """Expose a value to later GitHub Actions steps (no-op outside CI)."""
+    output = os.environ.get('GITHUB_OUTPUT')
+    if output:
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write(f'{name}={value}\n')
+
+
+def deploy(args) -> int:
+    """Compare site/ with the target branch and push a commit with only the differences."""
+    site_dir = args.site_dir
+    if not site_dir.is_dir():
+        print(f"\n❌ Site directory not found: {site_dir}")
+        return 1
+
+    start = time.perf_counter()
+    print(f"\n🔍 Fetching {args.remote} {args.branch}...")
+    parent = fetch_tip(args.remote, args.branch)
+    print(f"   Tip: {parent[:12] if parent else '(new branch)'}")
+
+    manifest = scan_site(site_dir, args.jobs)
+    if not args.jekyll:
+        # Same as ghp-import -n: keep GitHub Pages from running Jekyll
+        manifest['.nojekyll'] = (MODE_FILE, blob_sha(b''))
+    current = read_tree(parent)
+    added, changed, deleted = diff_manifests(current, manifest)
+    print(f"   {len(manifest)} files: +{len(added)} ~{len(changed)} -{len(deleted)}")
+
+    if parent is not None and not (added or changed or deleted):
+        set_ci_output('deployed', 'false')
+        print("\n✅ Site unchanged, nothing to deploy")
+        return 0
+
+    if args.dry_run:
+        for label, paths in (('+', added), ('~', changed), ('-', deleted)):
+            for path in paths:
+                print(f"   {label} {path}")
+        return 0
+
+    updates = added + changed
+    if '.nojekyll' in updates:
+        run_git('hash-object', '-w', '--stdin', input='')
+    write_blobs(site_dir, [path for path in updates if path != '.nojekyll'], manifest)
+    commit = build_commit(parent, manifest, updates, deleted, args.message)
+    print(f"\n📦 Created commit {commit[:12]}")
+
+    if args.no_push:
+        print(f"   Not pushing (--no-push); push with: git push {args.remote} {commit}:refs/heads/{args.branch}")
+        return 0
+
+    run_git('push', '--quiet', args.remote, f'{commit}:refs/heads/{args.branch}')
+    set_ci_output('deployed', 'true')
+    elapsed = time.perf_counter() - start
+    print(f"🚀 Pushed to {args.remote} {args.branch} ({elapsed:.2f}s)")
+    return 0
+
+
+def main():
+    """Main entry point for the incremental site deploy."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Deploy site/ to a gh-pages branch, committing only what changed'
+    )
+    parser.add_argument(
+        'site_dir',
+        nargs='?',
+        type=Path,
+        default=Path('site'),
+        help='Directory produced by zensical build (default: site)'
+    )
+    parser.add_argument(
+        '--remote',
+        default=DEFAULT_REMOTE,
+        help=f'Remote name, URL or path to deploy to (default: {DEFAULT_REMOTE})'
+    )
+    parser.add_argument(
+        '--branch',
+        default=DEFAULT_BRANCH,
+        help=f'Branch to deploy to (default: {DEFAULT_BRANCH})'
+    )
+    parser.add_argument(
+        '--message', '-m',
+        default='Update documentation',
+        help='Commit message'
+    )
+    parser.add_argument(
+        '--jekyll',
+        action='store_true',
+        help='Do not add a .nojekyll file'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar='N',
+        help=f'Number of hashing threads (default: {DEFAULT_JOBS})'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Only list what would change'
+    )
+    parser.add_argument(
+        '--no-push',
+        action='store_true',
+        help='Create the commit but do not push it'
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🚀 Soliplex Site Deploy")
+    print("=" * 60)
+
+    try:
+        return deploy(args)
+    except subprocess.CalledProcessError as e:
+        print(f"\n❌ git {' '.join(e.cmd[1:3])} failed: {e.stderr.strip()}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
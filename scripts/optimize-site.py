@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Post-build optimizer for the generated site/ directory.
+
+Run after `zensical build` and before deploying. For every file in site/
+this script:
+- Minifies HTML, CSS and JavaScript conservatively
+- Recompresses PNG and JPEG images losslessly
+- Writes .gz (and .br, if the brotli module is installed) siblings for
+  text assets so servers and CDNs can serve them precompressed
+
+Work is spread over a process pool. Results are cached in
+.build-cache/optimize/ keyed by the content hash of each input, so files
+that did not change since the last run are never processed again.
+
+Optional tools are used when available and skipped otherwise:
+minify-html (HTML), rcssmin (CSS), rjsmin (JS), brotli (.br siblings),
+oxipng (PNG) and jpegtran (JPEG).
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+# Configure stdout for UTF-8 on Windows
+if platform.system() == 'Windows':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import minify_html
+except ImportError:
+    minify_html = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+CACHE_DIR = Path('.build-cache') / 'optimize'
+
+# Bump when any optimization changes its output so old cache entries are ignored
+OPTIMIZE_VERSION = 1
+
+DEFAULT_JOBS = os.cpu_count() or 1
+
+# Files that get precompressed siblings, and the smallest worth compressing
+COMPRESSIBLE = {'.html', '.css', '.js', '.json', '.xml', '.svg', '.txt', '.map'}
+MIN_COMPRESS_SIZE = 256
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+# Siblings this tool wrote, per site directory; only these are ever deleted
+SIBLINGS_FILE = CACHE_DIR / 'siblings.json'
+SIBLINGS_VERSION = 1
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Elements whose content must be kept byte for byte when minifying HTML
+HTML_RAW_RE = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+HTML_COMMENT_RE = re.compile(r'<!--(?!\[if|<!|>).*?-->', re.DOTALL)
+HTML_INDENT_RE = re.compile(r'\n[ \t]+')
+HTML_BLANK_LINES_RE = re.compile(r'\n{2,}')
+
+CSS_STRING_OR_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*(?!!).*?\*/)', re.DOTALL)
+CSS_SPACE_RE = re.compile(r'\s+')
+CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+
+
+def available_tools() -> Dict[str, bool]:
+    """Report which optional optimizers are available in this environment."""
+    return {
+        'minify-html': minify_html is not None,
+        'rcssmin': rcssmin is not None,
+        'rjsmin': rjsmin is not None,
+        'brotli': brotli is not None,
+        'oxipng': shutil.which('oxipng') is not None,
+        'jpegtran': shutil.which('jpegtran') is not None,
+    }
+
+
+def tools_signature() -> str:
+    """Identify the optimizer setup; part of every cache key."""
+    tools = ','.join(name for name, ok in sorted(available_tools().items()) if ok)
+    return f'v{OPTIMIZE_VERSION}:{tools}'
+
+
+def minify_html_text(text: str) -> str:
+    """
+    Minify HTML conservatively.
+
+    Drops comments (except conditional comments), indentation and blank
+    lines. <pre>, <textarea>, <script> and <style> are kept verbatim, and
+    whitespace between inline elements is never removed entirely.
+    """
+    if minify_html is not None:
+        return minify_html.minify(
+            text,
+            keep_closing_tags=True,
+            keep_html_and_head_opening_tags=True,
+            keep_spaces_between_attributes=True,
+        )
+
+    parts = HTML_RAW_RE.split(text)
+    out = []
+    # split() yields text, raw block, tag name, text, ...
+    for i in range(0, len(parts), 3):
+        chunk = HTML_COMMENT_RE.sub('', parts[i])
+        chunk = HTML_INDENT_RE.sub('\n', chunk)
+        out.append(HTML_BLANK_LINES_RE.sub('\n', chunk))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out).strip() + '\n'
+
+
+def minify_css_text(text: str) -> str:
+    """Minify CSS by dropping comments and redundant whitespace; strings are untouched."""
+    if rcssmin is not None:
+        return rcssmin.cssmin(text)
+
+    out = []
+    for i, part in enumerate(CSS_STRING_OR_COMMENT_RE.split(text)):
+        if i % 2:
+            if not part.startswith('/*'):
+                out.append(part)
+            continue
+        part = CSS_SPACE_RE.sub(' ', part)
+        out.append(CSS_PUNCT_RE.sub(r'\1', part))
+    return ''.join(out).strip()
+
+
+def minify_js_text(text: str) -> str:
+    """
+    Minify JavaScript with rjsmin when it is installed.
+
+    Without it the script is left unchanged: stripping whitespace safely
+    needs a real tokenizer (regex literals, template strings, ASI).
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(text)
+    return text
+
+
+def recompress_png(data: bytes) -> bytes:
+    """
+    Losslessly shrink a PNG.
+
+    Uses oxipng when installed. Otherwise the image data is recompressed
+    at the highest zlib level and merged into one IDAT chunk; all other
+    chunks are kept as they are.
+    """
+    if shutil.which('oxipng'):
+        return run_tool(['oxipng', '-o', '4', '--strip', 'safe', '-q'], data, '.png')
+
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    chunks = []
+    idat = []
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if kind == b'IDAT':
+            if not idat:
+                chunks.append((b'IDAT', None))
+            idat.append(body)
+        else:
+            chunks.append((kind, body))
+        pos += 12 + length
+        if kind == b'IEND':
+            break
+
+    try:
+        raw = zlib.decompress(b''.join(idat))
+    except zlib.error:
+        return data
+    packed = zlib.compress(raw, 9)
+
+    out = [PNG_SIGNATURE]
+    for kind, body in chunks:
+        body = packed if body is None else body
+        crc = zlib.crc32(kind + body) & 0xffffffff
+        out.append(struct.pack('>I4s', len(body), kind) + body + struct.pack('>I', crc))
+    return b''.join(out)
+
+
+def recompress_jpeg(data: bytes) -> bytes:
+    """Losslessly optimize a JPEG's Huffman tables with jpegtran, if installed."""
+    if shutil.which('jpegtran'):
+        return run_tool(['jpegtran', '-copy', 'all', '-optimize', '-progressive'], data, '.jpg', stdout=True)
+    return data
+
+
+def run_tool(command: List[str], data: bytes, suffix: str, stdout: bool = False) -> bytes:
+    """
+    Run an external optimizer on data and return its output.
+
+    Tools either rewrite a file in place or, with stdout=True, write the
+    result to standard output. Any failure returns data unchanged.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f'input{suffix}'
+        path.write_bytes(data)
+        try:
+            result = subprocess.run(command + [str(path)], capture_output=True, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return data
+        return result.stdout if stdout else path.read_bytes()
+
+
+def optimize_bytes(suffix: str, data: bytes) -> bytes:
+    """Apply the optimizer for a file type; returns data unchanged if none applies."""
+    try:
+        if suffix in ('.html', '.htm'):
+            return minify_html_text(data.decode('utf-8')).encode('utf-8')
+        if suffix == '.css':
+            return minify_css_text(data.decode('utf-8')).encode('utf-8')
+        if suffix == '.js':
+            return minify_js_text(data.decode('utf-8')).encode('utf-8')
+    except UnicodeDecodeError:
+        return data
+    if suffix == '.png':
+        return recompress_png(data)
+    if suffix in ('.jpg', '.jpeg'):
+        return recompress_jpeg(data)
+    return data
+
+
+def compress_variants(data: bytes) -> Dict[str, bytes]:
+    """Build the .gz (and .br) encodings of data that are smaller than it."""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return {ext: blob for ext, blob in variants.items() if len(blob) < len(data)}
+
+
+def cache_entry(key: str) -> Path:
+    return CACHE_DIR / key[:2] / key
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def optimize_file(path: str, signature: str, precompress: bool = True) -> Tuple[str, int, int, Dict[str, int], bool]:
+    """
+    Optimize one file in place and write its compressed siblings.
+
+    Runs in a worker process. Siblings that are not written are left
+    alone; optimize_site removes the stale ones it wrote earlier. The optimized bytes and compressed variants
+    are cached under a key derived from the input hash and signature.
+
+    Returns:
+        Tuple of (path, bytes_before, bytes_after, {suffix: size}, cache_hit)
+    """
+    file_path = Path(path)
+    data = file_path.read_bytes()
+    suffix = file_path.suffix.lower()
+    key = hashlib.sha256(data + f'{signature}:{precompress}'.encode('utf-8')).hexdigest()
+    entry = cache_entry(key)
+
+    compressible = precompress and suffix in COMPRESSIBLE and len(data) >= MIN_COMPRESS_SIZE
+    hit = entry.exists()
+    if hit:
+        optimized = entry.read_bytes()
+        variants = {
+            ext: entry.with_name(key + ext).read_bytes()
+            for ext in COMPRESSED_SUFFIXES
+            if entry.with_name(key + ext).exists()
+        }
+    else:
+        optimized = optimize_bytes(suffix, data)
+        if len(optimized) >= len(data):
+            optimized = data
+        variants = compress_variants(optimized) if compressible else {}
+        for ext, blob in variants.items():
+            write_atomic(entry.with_name(key + ext), blob)
+        # Written last: its presence marks the entry complete
+        write_atomic(entry, optimized)
+
+    if optimized != data:
+        write_atomic(file_path, optimized)
+    for ext, blob in variants.items():
+        write_atomic(file_path.with_name(file_path.name + ext), blob)
+
+    return path, len(data), len(optimized), {ext: len(blob) for ext, blob in variants.items()}, hit
+
+
+def collect_files(site_dir: Path) -> Tuple[List[Path], List[Path], List[Path]]:
+    """
+    List the files to optimize and the compressed siblings already present.
+
+    Returns:
+        Tuple of (files, orphans, siblings) where orphans are .gz/.br files
+        whose original no longer exists and siblings are those whose
+        original does
+    """
+    files = []
+    orphans = []
+    siblings = []
+    for root, _, names in os.walk(site_dir):
+        for name in names:
+            path = Path(root) / name
+            base = name[:-3]
+            if name.endswith(COMPRESSED_SUFFIXES) and Path(base).suffix.lower() in COMPRESSIBLE:
+                if path.with_name(base).exists():
+                    siblings.append(path)
+                else:
+                    orphans.append(path)
+            else:
+                files.append(path)
+    return sorted(files), sorted(orphans), sorted(siblings)
+
+
+def load_siblings(site_dir: Path) -> Set[str]:
+    """Return the site-relative paths of the siblings written for site_dir by the last run."""
+    try:
+        with open(SIBLINGS_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    if data.get('version') != SIBLINGS_VERSION:
+        return set()
+    return set(data.get('sites', {}).get(str(site_dir.resolve()), []))
+
+
+def save_siblings(site_dir: Path, siblings: Set[str]) -> None:
+    """Record the siblings written for site_dir, keeping other sites' records."""
+    try:
+        with open(SIBLINGS_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    sites = data.get('sites', {}) if data.get('version') == SIBLINGS_VERSION else {}
+    sites[str(site_dir.resolve())] = sorted(siblings)
+    path = SIBLINGS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': SIBLINGS_VERSION, 'sites': sites}, f)
+    os.replace(tmp, path)
+
+
+def optimize_site(site_dir: Path, jobs: int = DEFAULT_JOBS, precompress: bool = True) -> Dict[str, int]:
+    """
+    Optimize every file under site_dir.
+
+    Compressed siblings written by an earlier run that are no longer
+    produced (the original is gone, no longer compresses well, or
+    precompression is off) are removed. Siblings that came with the
+    site, such as sitemap.xml.gz, are never touched.
+
+    Returns:
+        Totals: files, cached, changed, bytes_before, bytes_after and the
+        combined size of the .gz and .br siblings
+    """
+    owned = load_siblings(site_dir)
+    files, orphans, siblings = collect_files(site_dir)
+    for orphan in orphans:
+        if orphan.relative_to(site_dir).as_posix() in owned:
+            orphan.unlink()
+    # Shipped with the site: may be refreshed, but never claimed or deleted
+    foreign = {path.relative_to(site_dir).as_posix() for path in siblings} - owned
+
+    signature = tools_signature()
+    totals = {
+        'files': len(files), 'cached': 0, 'changed': 0,
+        'bytes_before': 0, 'bytes_after': 0, 'gz_bytes': 0, 'br_bytes': 0,
+    }
+    paths = [str(path) for path in files]
+    written = set()
+    with ProcessPoolExecutor(max(1, jobs)) as pool:
+        results = pool.map(
+            optimize_file, paths, [signature] * len(paths), [precompress] * len(paths), chunksize=16
+        )
+        for file_path, (_, before, after, variants, hit) in zip(files, results):
+            rel = file_path.relative_to(site_dir).as_posix()
+            for ext in COMPRESSED_SUFFIXES:
+                if ext in variants:
+                    if rel + ext not in foreign:
+                        written.add(rel + ext)
+                elif rel + ext in owned:
+                    file_path.with_name(file_path.name + ext).unlink(missing_ok=True)
+            totals['bytes_before'] += before
+            totals['bytes_after'] += after
+            totals['gz_bytes'] += variants.get('.gz', 0)
+            totals['br_bytes'] += variants.get('.br', 0)
+            totals['cached'] += hit
+            totals['changed'] += after != before
+    save_siblings(site_dir, written)
+    return totals
+
+
+def main():
+    """Main entry point for the site optimizer."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Minify, recompress and precompress the built site'
+    )
+    parser.add_argument(
+        'site_dir',
+        nargs='?',
+        type=Path,
+        default=Path('site'),
+        help='Directory produced by zensical build (default: site)'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar='N',
+        help=f'Number of worker processes (default: {DEFAULT_JOBS})'
+    )
+    parser.add_argument(
+        '--no-precompress',
+        action='store_true',
+        help='Do not write .gz/.br siblings (e.g. for hosts that compress on the fly)'
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🗜️  Soliplex Site Optimizer")
+    print("=" * 60)
+
+    if not args.site_dir.is_dir():
+        print(f"\n❌ Site directory not found: {args.site_dir}")
+        return 1
+
+    tools = available_tools()
+    print("\n🧰 Optional tools:")
+    for name, ok in tools.items():
+        print(f"   {'✓' if ok else '-'} {name}")
+
+    start = time.perf_counter()
+    totals = optimize_site(args.site_dir, args.jobs, not args.no_precompress)
+    elapsed = time.perf_counter() - start
+
+    saved = totals['bytes_before'] - totals['bytes_after']
+    percent = 100.0 * saved / totals['bytes_before'] if totals['bytes_before'] else 0.0
+    print("\n" + "=" * 60)
+    print("📊 Summary")
+    print("=" * 60)
+    print(f"✓ Files: {totals['files']} ({totals['cached']} from cache, {totals['changed']} rewritten)")
+    print(f"✓ Size: {totals['bytes_before']:,} → {totals['bytes_after']:,} bytes (-{percent:.1f}%)")
+    print(f"✓ Precompressed: .gz {totals['gz_bytes']:,} bytes", end='')
+    print(f", .br {totals['br_bytes']:,} bytes" if tools['brotli'] else " (.br needs brotli)")
+    print(f"✓ Time: {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
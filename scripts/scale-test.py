@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scale test for the documentation build pipeline.
+
+This script generates synthetic projects/ trees of growing size, together
+with a zensical.toml whose nav lists every generated page, and runs the
+stages of scripts/build-docs.py against them. For each size it records
+the wall time and peak Python memory of every stage, so scaling cliffs show
+up before the real project count gets there.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# Configure stdout for UTF-8 on Windows
+if platform.system() == 'Windows':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DEFAULT_SIZES = '7x50,25x100,50x200,100x500'
+
+# Flag a stage when its per-file cost grows by more than this factor
+SUPERLINEAR_FACTOR = 2.0
+
+
+def load_script(name: str):
+    """Import a sibling script whose file name is not a valid module name."""
+    import importlib.util
+
+    path = Path(__file__).resolve().with_name(name)
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle its functions
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_sizes(value: str) -> List[Tuple[int, int]]:
+    """Parse 'PROJECTSxFILES,...' into a list of (projects, files) pairs."""
+    sizes = []
+    for item in value.split(','):
+        projects, _, files = item.strip().partition('x')
+        sizes.append((int(projects), int(files)))
+    return sizes
+
+
+def write_config(root: Path) -> int:
+    """
+    Write docs/index.md and a zensical.toml whose nav lists every generated page.
+
+    Returns:
+        Number of nav entries written
+    """
+    docs = root / 'docs'
+    docs.mkdir(exist_ok=True)
+    (docs / 'index.md').write_text('# Scale test\n', encoding='utf-8')
+
+    entries = 1
+    lines = ['[project]', 'site_name = "Scale test"', '', 'nav = [', '  { "Home" = "index.md" },']
+    for project_dir in sorted((root / 'projects').iterdir()):
+        name = project_dir.name
+        lines.append(f'  {{ "{name}" = [')
+        for page in sorted((project_dir / 'docs').rglob('*.md')):
+            rel = page.relative_to(project_dir / 'docs').as_posix()
+            lines.append(f'    {{ "{page.stem}" = "{name}/{rel}" }},')
+            entries += 1
+        lines.append('  ]},')
+    lines.append(']')
+
+    (root / 'zensical.toml').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return entries
+
+
+def run_stages(
+    build_docs,
+    jobs: int,
+    check_links: bool,
+    trace_memory: bool
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run the build stages in order in the current directory.
+
+    Returns:
+        Mapping of stage name to {'seconds': ..., 'peak_bytes': ...}
+        (peak_bytes only when trace_memory is set)
+    """
+    docs_dir = Path('docs')
+    config_file = Path('zensical.toml')
+    projects_root = Path('projects')
+    state = {}
+    results = {}
+
+    def discover():
+        state['inventory'] = build_docs.ProjectInventory(projects_root, use_cache=False)
+        state['projects'], state['readmes'] = build_docs.discover_projects(
+            projects_root, state['inventory']
+        )
+
+    def copy():
+        generations = build_docs.DocsGenerations(docs_dir)
+        with build_docs.CopyEngine(jobs) as engine:
+            build_docs.copy_project_docs(
+                state['projects'], docs_dir, engine, None, state['inventory'], generations
+            )
+        generations.cleanup()
+
+    def cold_sync():
+        # Without manifests every file is hashed and rewritten
+        shutil.rmtree(build_docs.CACHE_DIR / 'manifests', ignore_errors=True)
+        sync()
+
+    def sync():
+        with build_docs.CopyEngine(jobs) as engine:
+            build_docs.sync_project_docs(
+                state['projects'], docs_dir, engine, None, state['inventory']
+            )
+
+    def resync():
+        # Second incremental pass: nothing changed, so this is the steady state
+        sync()
+
+    def validate():
+        index = state['inventory'].docs_index(docs_dir)
+        state['nav_errors'] = build_docs.validate_nav(config_file, docs_dir, index)
+
+    def links():
+        build_docs.check_links(docs_dir, jobs)
+
+    def gitignore():
+        build_docs.generate_gitignore(docs_dir, list(state['projects']))
+
+    stages: List[Tuple[str, Callable[[], None]]] = [
+        ('discover', discover),
+        ('copy', copy),
+        ('sync_cold', cold_sync),
+        ('sync_warm', resync),
+        ('validate_nav', validate),
+    ]
+    if check_links:
+        stages.append(('check_links', links))
+    stages.append(('gitignore', gitignore))
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        for name, stage in stages:
+            if trace_memory:
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                stage()
+            results[name] = {'seconds': time.perf_counter() - start}
+            if trace_memory:
+                results[name]['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    if state.get('nav_errors'):
+        print(f"   ⚠️  {len(state['nav_errors'])} nav errors (generator bug?)")
+    return results
+
+
+def measure_size(
+    build_docs,
+    compare_methods,
+    work_dir: Path,
+    projects: int,
+    files: int,
+    args
+) -> Dict:
+    """Generate one corpus, run the stages for time and then for memory."""
+    root = Path(tempfile.mkdtemp(prefix='docs-scale-', dir=work_dir))
+    previous = os.getcwd()
+    try:
+        start = time.perf_counter()
+        corpus = compare_methods.generate_corpus(
+            root, projects, files, args.assets, args.asset_size, args.seed
+        )
+        corpus['pages_per_project'] = files
+        corpus['nav_entries'] = write_config(root)
+        corpus['generate_seconds'] = time.perf_counter() - start
+
+        os.chdir(root)
+        timed = run_stages(build_docs, args.jobs, args.links, trace_memory=False)
+        if args.memory:
+            shutil.rmtree(root / build_docs.CACHE_DIR, ignore_errors=True)
+            traced = run_stages(build_docs, args.jobs, args.links, trace_memory=True)
+            for stage, values in traced.items():
+                timed[stage]['peak_bytes'] = values['peak_bytes']
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {'corpus': corpus, 'stages': timed}
+
+
+def report(results: List[Dict]) -> List[str]:
+    """Print per-stage time, per-file cost and memory; return scaling warnings."""
+    stages = list(results[0]['stages'])
+    warnings = []
+
+    print(f"\n{'Stage':14s}" + ''.join(
+        f"{r['corpus']['projects']:>5d}×{r['corpus']['pages_per_project']:<8d}" for r in results
+    ))
+    print(f"{'Total files':14s}" + ''.join(f"{r['corpus']['files']:>13d} " for r in results))
+    print('-' * (14 + 14 * len(results)))
+    for stage in stages:
+        row = f"{stage:14s}"
+        for r in results:
+            row += f"{r['stages'][stage]['seconds']:>12.3f}s "
+        print(row)
+
+    print("\nPer-file cost (µs/file):")
+    for stage in stages:
+        costs = [
+            r['stages'][stage]['seconds'] / max(1, r['corpus']['files']) * 1e6
+            for r in results
+        ]
+        print(f"{stage:14s}" + ''.join(f"{c:>13.1f} " for c in costs))
+        if costs[0] > 0 and costs[-1] / costs[0] > SUPERLINEAR_FACTOR:
+            warnings.append(
+                f"{stage}: per-file cost grew {costs[-1] / costs[0]:.1f}x "
+                f"from smallest to largest corpus"
+            )
+
+    if 'peak_bytes' in results[0]['stages'][stages[0]]:
+        print("\nPeak traced memory (MiB):")
+        for stage in stages:
+            print(f"{stage:14s}" + ''.join(
+                f"{r['stages'][stage]['peak_bytes'] / 1024 / 1024:>13.1f} " for r in results
+            ))
+
+    return warnings
+
+
+def main():
+    """Main entry point for the scale test."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Scale test the documentation build pipeline on synthetic corpora'
+    )
+    parser.add_argument(
+        '--sizes',
+        default=DEFAULT_SIZES,
+        help=f'Comma-separated PROJECTSxFILES corpus sizes (default: {DEFAULT_SIZES})'
+    )
+    parser.add_argument('--assets', type=int, default=2, help='Binary assets per project (default: 2)')
+    parser.add_argument(
+        '--asset-size',
+        type=int,
+        default=64 * 1024,
+        help='Size of each binary asset in bytes (default: 65536)'
+    )
+    parser.add_argument('--jobs', type=int, default=4, help='Worker threads/processes (default: 4)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the corpus (default: 0)')
+    parser.add_argument('--links', action='store_true', help='Also run the link checker stage')
+    parser.add_argument(
+        '--no-memory',
+        dest='memory',
+        action='store_false',
+        help='Skip the second, tracemalloc-instrumented pass'
+    )
+    parser.add_argument('--work-dir', default=None, help='Directory to create corpora in')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON to PATH')
+    args = parser.parse_args()
+
+    build_docs = load_script('build-docs.py')
+    compare_methods = load_script('compare-methods.py')
+
+    print("=" * 60)
+    print("📏 Documentation Build Scale Test")
+    print("=" * 60)
+
+    results = []
+    for projects, files in parse_sizes(args.sizes):
+        print(f"\n🏗️  {projects} projects × {files} pages...")
+        result = measure_size(build_docs, compare_methods, args.work_dir, projects, files, args)
+        corpus = result['corpus']
+        print(
+            f"   {corpus['files']} files, {corpus['bytes'] / 1024 / 1024:.1f} MiB, "
+            f"{corpus['nav_entries']} nav entries (generated in {corpus['generate_seconds']:.1f}s)"
+        )
+        results.append(result)
+
+    warnings = report(results)
+    if warnings:
+        print("\n⚠️  Possible scaling cliffs:")
+        for warning in warnings:
+            print(f"   - {warning}")
+    else:
+        print("\n✅ All stages scale roughly linearly")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'sizes': results, 'warnings': warnings}, f, indent=2)
+        print(f"\n📈 Wrote results to {args.json}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
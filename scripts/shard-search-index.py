@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyze how the built site's search index would split into per-section shards.
+
+Run after `zensical build`. The single search index covering every project
+is split by top-level nav section from zensical.toml (or by project
+directory with --by project). Each shard is written next to a manifest that
+lists its size, document count, parse time and the URL prefixes it covers.
+
+This is an analysis tool: the theme's built-in search still loads the full
+index and nothing on the client reads the shards, so it is not part of the
+deploy. Use it to judge whether a lazy-loading search would pay off.
+"""
+
+import gzip
+import io
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+import tomllib
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Configure stdout for UTF-8 on Windows
+if platform.system() == 'Windows':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+MANIFEST_VERSION = 1
+
+# Where themes put the search index, checked in order before a full scan
+SEARCH_INDEX_CANDIDATES = [
+    'search/search_index.json',
+    'search_index.json',
+    'search.json',
+    'search/search.json',
+]
+
+# Key holding the document list: zensical writes "items", mkdocs "docs"
+INDEX_KEYS = ('items', 'docs')
+
+SHARDS_DIR = 'search/shards'
+PARSE_RUNS = 5
+UNSECTIONED = 'Other'
+
+
+def slugify(text: str) -> str:
+    """Turn a section title into a file name ("Core Platform" -> "core-platform")."""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'section'
+
+
+def index_key(data) -> Optional[str]:
+    """
+    Find the key holding the documents of a search index.
+
+    A search index looks like {"items": [{"location": ...}, ...]} (zensical)
+    or {"docs": [...]} (mkdocs). Returns None if data is neither.
+    """
+    if not isinstance(data, dict):
+        return None
+    for key in INDEX_KEYS:
+        docs = data.get(key)
+        if isinstance(docs, list) and all(isinstance(doc, dict) and 'location' in doc for doc in docs[:10]):
+            return key
+    return None
+
+
+def is_search_index(data) -> bool:
+    """True if data looks like a search index (see index_key)."""
+    return index_key(data) is not None
+
+
+def find_search_index(site_dir: Path) -> Optional[Path]:
+    """
+    Locate the search index in site_dir.
+
+    Known locations are tried first; otherwise every JSON file outside the
+    shards directory is checked for the index's shape.
+    """
+    for rel in SEARCH_INDEX_CANDIDATES:
+        path = site_dir / rel
+        if path.is_file():
+            return path
+
+    shards = (site_dir / SHARDS_DIR).resolve()
+    for path in sorted(site_dir.rglob('*.json')):
+        if shards in path.resolve().parents:
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if is_search_index(json.load(f)):
+                    return path
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def page_location(target: str, directory_urls: bool = True) -> str:
+    """Turn a nav target (e.g. soliplex/overview.md) into its site location (soliplex/overview/)."""
+    stem = target[:-len('.md')] if target.endswith('.md') else target
+    if stem == 'index' or stem.endswith('/index'):
+        return stem[:-len('index')]
+    if not directory_urls:
+        return f'{stem}.html'
+    if stem.lower() == 'readme' or stem.lower().endswith('/readme'):
+        return stem[:-len('readme')]
+    return f'{stem}/'
+
+
+def iter_nav_pages(nav) -> List[str]:
+    """Flatten a nav subtree into its page targets, in order."""
+    pages = []
+    for item in nav:
+        if isinstance(item, str):
+            pages.append(item)
+        elif isinstance(item, dict):
+            for value in item.values():
+                if isinstance(value, list):
+                    pages.extend(iter_nav_pages(value))
+                elif isinstance(value, str):
+                    pages.append(value)
+    return pages
+
+
+def load_sections(config_file: Path) -> Tuple[Dict[str, str], List[str], bool]:
+    """
+    Map page locations to their top-level nav section.
+
+    A page listed under several sections belongs to the first one.
+    Top-level pages (e.g. Home) form a section of their own.
+
+    Returns:
+        Tuple of (location -> section title, section titles in nav order,
+        whether directory URLs are used)
+    """
+    with open(config_file, 'rb') as f:
+        project = tomllib.load(f).get('project', {})
+    directory_urls = project.get('use_directory_urls', True)
+
+    locations = {}
+    order = []
+    for item in project.get('nav', []):
+        entries = item.items() if isinstance(item, dict) else [(item, item)]
+        for title, value in entries:
+            pages = iter_nav_pages(value) if isinstance(value, list) else [value]
+            if title not in order:
+                order.append(title)
+            for page in pages:
+                if '://' not in page:
+                    locations.setdefault(page_location(page, directory_urls), title)
+    return locations, order, directory_urls
+
+
+def section_for(location: str, sections: Dict[str, str], by_prefix: Dict[str, str]) -> str:
+    """Find the section of a search document; anchors and unknown pages fall back by project."""
+    page = location.split('#', 1)[0]
+    if page in sections:
+        return sections[page]
+    project = page.split('/', 1)[0] if '/' in page else ''
+    return by_prefix.get(project, UNSECTIONED)
+
+
+def measure_parse(data: bytes, runs: int = PARSE_RUNS) -> float:
+    """Median time in milliseconds to parse a shard, a proxy for client load time."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        json.loads(data)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def shard_index(
+    index: Dict,
+    by: str,
+    sections: Dict[str, str],
+    order: List[str]
+) -> Dict[str, List[Dict]]:
+    """
+    Group the documents of a search index into shards.
+
+    Returns:
+        Mapping of shard title to its documents, in nav order
+    """
+    # Project directory -> section of its first nav page, for unlisted pages
+    by_prefix = {}
+    for location, title in sections.items():
+        if '/' in location:
+            by_prefix.setdefault(location.split('/', 1)[0], title)
+
+    shards = {}
+    for doc in index[index_key(index)]:
+        location = doc['location']
+        if by == 'project':
+            page = location.split('#', 1)[0]
+            key = page.split('/', 1)[0] if '/' in page else UNSECTIONED
+        else:
+            key = section_for(location, sections, by_prefix)
+        shards.setdefault(key, []).append(doc)
+
+    ranked = {title: i for i, title in enumerate(order)}
+    return dict(sorted(shards.items(), key=lambda item: (ranked.get(item[0], len(ranked)), item[0])))
+
+
+def write_shards(
+    site_dir: Path,
+    index_path: Path,
+    index: Dict,
+    shards: Dict[str, List[Dict]],
+    by: str
+) -> Dict:
+    """Write one JSON file per shard plus manifest.json; returns the manifest."""
+    out_dir = site_dir / SHARDS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob('*.json'):
+        stale.unlink()
+
+    key = index_key(index)
+    config = index.get('config', {})
+    entries = []
+    used = set()
+    for title, docs in shards.items():
+        name = slugify(title)
+        while name in used:
+            name += '-1'
+        used.add(name)
+
+        data = json.dumps({'config': config, key: docs}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        (out_dir / f'{name}.json').write_bytes(data)
+        prefixes = sorted({
+            doc['location'].split('#', 1)[0].split('/', 1)[0] + '/'
+            for doc in docs if '/' in doc['location'].split('#', 1)[0]
+        })
+        entries.append({
+            'title': title,
+            'file': f'{name}.json',
+            'docs': len(docs),
+            'pages': len({doc['location'].split('#', 1)[0] for doc in docs}),
+            'prefixes': prefixes,
+            'bytes': len(data),
+            'gzip_bytes': len(gzip.compress(data, mtime=0)),
+            'parse_ms': round(measure_parse(data), 3),
+        })
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': index_path.relative_to(site_dir).as_posix(),
+        'source_bytes': index_path.stat().st_size,
+        'by': by,
+        'key': key,
+        'shards': entries,
+    }
+    with open(out_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    return manifest
+
+
+def main():
+    """Main entry point for search index sharding."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Analyze splitting the search index into per-section shards'
+    )
+    parser.add_argument(
+        'site_dir',
+        nargs='?',
+        type=Path,
+        default=Path('site'),
+        help='Directory produced by zensical build (default: site)'
+    )
+    parser.add_argument(
+        '--config',
+        type=Path,
+        default=Path('zensical.toml'),
+        help='Config file with the nav (default: zensical.toml)'
+    )
+    parser.add_argument(
+        '--index',
+        type=Path,
+        metavar='PATH',
+        help='Search index file (default: auto-detect inside site_dir)'
+    )
+    parser.add_argument(
+        '--by',
+        choices=['section', 'project'],
+        default='section',
+        help='Shard by top-level nav section or by project directory (default: section)'
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔎 Soliplex Search Index Sharding")
+    print("=" * 60)
+
+    index_path = args.index or find_search_index(args.site_dir)
+    if index_path is None or not index_path.is_file():
+        print(f"\n⚠️  No search index found in {args.site_dir}, skipping sharding")
+        return 0
+    if not args.config.exists():
+        print(f"\n❌ Config file not found: {args.config}")
+        return 1
+
+    with open(index_path, 'rb') as f:
+        raw = f.read()
+    index = json.loads(raw)
+    key = index_key(index)
+    if key is None:
+        print(f"\n⚠️  {index_path} is not a search index, skipping sharding")
+        return 0
+    print(f"\n📄 Search index: {index_path} ({len(raw):,} bytes, {len(index[key])} entries, "
+          f"parse {measure_parse(raw):.1f}ms)")
+
+    sections, order, _ = load_sections(args.config)
+    shards = shard_index(index, args.by, sections, order)
+    manifest = write_shards(args.site_dir, index_path, index, shards, args.by)
+
+    print(f"\n🧩 Shards ({args.by}) → {args.site_dir / SHARDS_DIR}/")
+    print(f"   {'Shard':24s} {'Docs':>6s} {'Bytes':>10s} {'Gzip':>9s} {'Parse':>8s}")
+    for entry in manifest['shards']:
+        print(
+            f"   {entry['title'][:24]:24s} {entry['docs']:6d} {entry['bytes']:10,d} "
+            f"{entry['gzip_bytes']:9,d} {entry['parse_ms']:7.2f}ms"
+        )
+    largest = max((entry['bytes'] for entry in manifest['shards']), default=0)
+    if raw:
+        print(f"\n✓ Largest shard is {100.0 * largest / len(raw):.0f}% of the full index")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
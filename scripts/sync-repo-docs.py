@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batched documentation sync from remote repositories.
+
+Drives the same sparse sync as sync-repo-docs.sh, but for a whole list of
+repositories at once:
+- Resolves every remote HEAD with one cheap `git ls-remote` per repository,
+  all concurrently
+- Skips entries whose remote SHA matches the one recorded at their last
+  successful sync (state in .build-cache/repo-sync.json)
+- Fetches the remaining repositories concurrently into reusable, blobless,
+  sparse mirrors under .build-cache/mirrors/, so later syncs only transfer
+  new objects instead of cloning from scratch
+- Replaces each target directory in one rename once its copy is complete
+
+The list file has one entry per line with the same arguments as
+sync-repo-docs.sh; blank lines and # comments are ignored:
+
+    soliplex/soliplex  docs/soliplex  docs
+    soliplex/chatbot   docs/chatbot   README.md
+
+Repositories are fetched from --base-url (default https://github.com/), so
+the driver can be pointed at a directory of local bare repositories.
+"""
+
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Configure stdout for UTF-8 on Windows
+if platform.system() == 'Windows':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+CACHE_DIR = Path('.build-cache')
+MIRRORS_DIR = CACHE_DIR / 'mirrors'
+STATE_VERSION = 1
+
+DEFAULT_BASE_URL = 'https://github.com/'
+DEFAULT_REF = 'HEAD'
+DEFAULT_JOBS = min(16, (os.cpu_count() or 1) + 4)
+
+
+def run_git(*args: str, cwd: Optional[Path] = None) -> str:
+    """Run a git command and return its stdout, raising CalledProcessError on failure."""
+    result = subprocess.run(
+        ['git', *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout
+
+
+def read_entries(list_file: str) -> List[Dict[str, str]]:
+    """
+    Parse the repository list into {repo, target, source} entries.
+
+    Raises:
+        ValueError: If a line does not have exactly three fields
+    """
+    if list_file == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        lines = Path(list_file).read_text(encoding='utf-8').splitlines()
+
+    entries = []
+    for lineno, line in enumerate(lines, 1):
+        fields = line.split('#', 1)[0].split()
+        if not fields:
+            continue
+        if len(fields) != 3:
+            raise ValueError(f"{list_file}:{lineno}: expected REPO TARGET_DIR SOURCE_PATH")
+        repo, target, source = fields
+        entries.append({'repo': repo, 'target': target, 'source': source.strip('/')})
+    return entries
+
+
+def repo_url(base_url: str, repo: str) -> str:
+    """Build the clone URL of a repository ("soliplex/soliplex" -> .../soliplex/soliplex.git)."""
+    return f"{base_url.rstrip('/')}/{repo}.git"
+
+
+def entry_key(entry: Dict[str, str]) -> str:
+    return f"{entry['repo']}:{entry['source']}->{entry['target']}"
+
+
+def load_state() -> Dict[str, Dict]:
+    """Load the last synced SHA per entry."""
+    try:
+        with open(CACHE_DIR / 'repo-sync.json', 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != STATE_VERSION:
+        return {}
+    return data.get('entries', {})
+
+
+def save_state(entries: Dict[str, Dict]) -> None:
+    path = CACHE_DIR / 'repo-sync.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': STATE_VERSION, 'entries': entries}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def remote_sha(url: str, ref: str) -> str:
+    """Resolve a remote ref to its commit with ls-remote (no objects are transferred)."""
+    output = run_git('ls-remote', url, ref)
+    for line in output.splitlines():
+        sha, _, name = line.partition('\t')
+        if name == ref or name in (f'refs/heads/{ref}', f'refs/tags/{ref}'):
+            return sha
+    raise RuntimeError(f"{ref} not found")
+
+
+def mirror_path(repo: str) -> Path:
+    return MIRRORS_DIR / repo.replace('/', '__')
+
+
+def update_mirror(repo: str, url: str, ref: str, paths: List[str]) -> str:
+    """
+    Bring a repository's local mirror to the tip of ref, checking out only paths.
+
+    Mirrors are shallow, blobless clones with a sparse checkout, so a fetch
+    downloads the new commit and trees and the checkout then pulls only the
+    blobs under the synced paths. Returns the commit checked out.
+    """
+    mirror = mirror_path(repo)
+    if not (mirror / '.git').exists():
+        if mirror.exists():
+            shutil.rmtree(mirror)
+        mirror.parent.mkdir(parents=True, exist_ok=True)
+        run_git('clone', '--quiet', '--no-checkout', '--depth=1', '--filter=blob:none', url, str(mirror))
+    else:
+        run_git('remote', 'set-url', 'origin', url, cwd=mirror)
+
+    run_git('sparse-checkout', 'set', '--no-cone', *[f'/{path}' for path in paths], cwd=mirror)
+    run_git('fetch', '--quiet', '--depth=1', '--filter=blob:none', 'origin', ref, cwd=mirror)
+    run_git('checkout', '--quiet', '--force', '--detach', 'FETCH_HEAD', cwd=mirror)
+    return run_git('rev-parse', 'HEAD', cwd=mirror).strip()
+
+
+def replace_target(source: Path, target: Path) -> int:
+    """
+    Copy source (a directory or a single file) to target and swap it in.
+
+    The new tree is assembled next to target and renamed into place, so
+    target is never missing or half-written. Returns the number of files.
+    """
+    staging = target.with_name(f'.{target.name}.sync')
+    if staging.exists():
+        shutil.rmtree(staging)
+    if source.is_dir():
+        shutil.copytree(source, staging)
+    else:
+        staging.mkdir(parents=True)
+        shutil.copy2(source, staging / source.name)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    old = target.with_name(f'.{target.name}.old')
+    if old.exists():
+        shutil.rmtree(old)
+    if target.exists():
+        os.rename(target, old)
+    os.rename(staging, target)
+    if old.exists():
+        shutil.rmtree(old)
+    return sum(len(files) for _, _, files in os.walk(target))
+
+
+def sync_repo(repo: str, entries: List[Dict[str, str]], url: str, ref: str) -> Tuple[str, List[Tuple[Dict, int]], Optional[str]]:
+    """
+    Update one repository's mirror and copy every entry that uses it.
+
+    Returns:
+        Tuple of (commit, [(entry, file_count)], error)
+    """
+    try:
+        commit = update_mirror(repo, url, ref, sorted({entry['source'] for entry in entries}))
+        copied = []
+        for entry in entries:
+            source = mirror_path(repo) / entry['source']
+            if not source.exists():
+                return commit, copied, f"{repo}: source path '{entry['source']}' not found"
+            copied.append((entry, replace_target(source, Path(entry['target']))))
+        return commit, copied, None
+    except subprocess.CalledProcessError as e:
+        return '', [], f"{repo}: git {e.cmd[1]} failed: {(e.stderr or '').strip()}"
+    except OSError as e:
+        return '', [], f"{repo}: {e}"
+
+
+def sync_all(entries: List[Dict[str, str]], args) -> int:
+    """Resolve remote HEADs, skip unchanged entries and sync the rest concurrently."""
+    start = time.perf_counter()
+    state = load_state()
+    repos = sorted({entry['repo'] for entry in entries})
+    urls = {repo: repo_url(args.base_url, repo) for repo in repos}
+
+    print(f"\n🔍 Resolving {args.ref} of {len(repos)} repositories...")
+
+    def resolve(repo: str):
+        try:
+            return remote_sha(urls[repo], args.ref), None
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            detail = e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) else str(e)
+            return None, f"{repo}: ls-remote failed: {detail}"
+
+    with ThreadPoolExecutor(max(1, min(args.jobs, len(repos) or 1))) as pool:
+        resolved = dict(zip(repos, pool.map(resolve, repos)))
+
+    errors = [error for _, error in resolved.values() if error]
+    pending = {}
+    skipped = 0
+    synced = 0
+    for entry in entries:
+        sha = resolved[entry['repo']][0]
+        if sha is None:
+            continue
+        last = state.get(entry_key(entry), {})
+        if not args.force and last.get('sha') == sha and Path(entry['target']).exists():
+            skipped += 1
+            print(f"   = {entry['repo']:30s} {sha[:12]} unchanged → {entry['target']}")
+            continue
+        pending.setdefault(entry['repo'], []).append(entry)
+        print(f"   ~ {entry['repo']:30s} {(last.get('sha') or '-')[:12]} → {sha[:12]}")
+
+    if pending:
+        print(f"\n📥 Syncing {len(pending)} repositories...")
+        names = sorted(pending)
+        with ThreadPoolExecutor(max(1, min(args.jobs, len(names)))) as pool:
+            results = list(pool.map(lambda repo: sync_repo(repo, pending[repo], urls[repo], args.ref), names))
+
+        now = datetime.now(timezone.utc).isoformat()
+        for repo, (commit, copied, error) in zip(names, results):
+            for entry, count in copied:
+                state[entry_key(entry)] = {'sha': commit, 'synced_at': now}
+                synced += 1
+                print(f"   ✓ {repo:30s} {commit[:12]} → {entry['target']} ({count} files)")
+            if error:
+                errors.append(error)
+        save_state(state)
+
+    elapsed = time.perf_counter() - start
+    print("\n" + "=" * 60)
+    print(f"✓ Entries: {len(entries)} ({skipped} unchanged, {synced} synced)")
+    print(f"✓ Time: {elapsed:.2f}s")
+    if errors:
+        print(f"\n⚠️  Encountered {len(errors)} errors:")
+        for error in errors:
+            print(f"   - {error}")
+        return 1
+    return 0
+
+
+def main():
+    """Main entry point for the batched repository sync."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Sync documentation from many repositories, skipping unchanged ones'
+    )
+    parser.add_argument(
+        'list_file',
+        help='File with one "REPO TARGET_DIR SOURCE_PATH" entry per line ("-" for stdin)'
+    )
+    parser.add_argument(
+        '--base-url',
+        default=DEFAULT_BASE_URL,
+        help=f'URL or directory repositories are fetched from (default: {DEFAULT_BASE_URL})'
+    )
+    parser.add_argument(
+        '--ref',
+        default=DEFAULT_REF,
+        help=f'Remote ref to sync (default: {DEFAULT_REF})'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar='N',
+        help=f'Number of repositories resolved and fetched concurrently (default: {DEFAULT_JOBS})'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Sync every entry even if its remote SHA did not change'
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔄 Soliplex Repository Docs Sync")
+    print("=" * 60)
+
+    try:
+        entries = read_entries(args.list_file)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ {e}")
+        return 1
+    if not entries:
+        print("\n⚠️  No repositories listed")
+        return 0
+    return sync_all(entries, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
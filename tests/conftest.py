@@ -0,0 +1,62 @@
+"""Shared fixtures for the build script tests."""
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+
+
+def load_script(name: str):
+    """Import a script from scripts/ whose file name is not a valid module name."""
+    module_name = name[:-len('.py')].replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / name)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle its functions
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def git(*args: str, cwd: Path) -> str:
+    """Run git in cwd and return its stdout."""
+    result = subprocess.run(
+        ['git', '-c', 'init.defaultBranch=main', *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout
+
+
+def write(path: Path, text: str) -> Path:
+    """Write text to path, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch):
+    """Give git (here and in the scripts under test) a fixed identity."""
+    for role in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{role}_NAME', 'Test')
+        monkeypatch.setenv(f'GIT_{role}_EMAIL', 'test@example.com')
+
+
+@pytest.fixture(scope='session')
+def build_docs():
+    return load_script('build-docs.py')
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the test inside an empty directory, like the repository root."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
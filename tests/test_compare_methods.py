@@ -0,0 +1,71 @@
+"""Tests for feeding benchmark measurements into the method comparison."""
+
+import argparse
+
+import pytest
+
+from conftest import load_script
+
+
+@pytest.fixture
+def compare_methods():
+    return load_script('compare-methods.py')
+
+
+def timing(median):
+    return {'median': median, 'p95': median, 'min': median, 'max': median, 'samples': [median]}
+
+
+BENCHMARK = {
+    'Method 1: Symlinks': {'cold': timing(0.01), 'warm': timing(0.01)},
+    'Method 3: copytree (clean copy)': {'cold': timing(0.5), 'warm': timing(0.5)},
+    'Method 3: build-docs.py (copy)': {'cold': timing(0.8), 'warm': timing(0.3)},
+    'Method 3: build-docs.py (hardlink)': {'cold': timing(0.4), 'warm': {'error': 'EXDEV'}},
+}
+
+INFO = {'platform': 'Linux', 'has_symlink': True}
+
+
+def method_results(tested=True):
+    return [
+        {'name': 'Symlinks', 'supported': True, 'tested': True},
+        {'name': 'MkDocs Monorepo Plugin', 'supported': False, 'tested': False, 'plugin_installed': False},
+        {'name': 'Copy Files with Build Script', 'supported': True, 'tested': tested},
+    ]
+
+
+def test_method_timings_use_the_fastest_working_build_script_variant(compare_methods):
+    timings = compare_methods.method_timings(BENCHMARK)
+
+    assert timings == [{'cold': 0.01, 'warm': 0.01}, None, {'cold': 0.8, 'warm': 0.3}]
+
+
+def test_table_and_recommendation_show_measured_numbers(compare_methods, capsys):
+    compare_methods.generate_comparison_table(method_results(), INFO, compare_methods.method_timings(BENCHMARK))
+
+    out = capsys.readouterr().out
+    assert 'Runtime Performance' not in out
+    assert 'Warm Rebuild (p50)' in out and '0.300s' in out and 'not timed' in out
+    assert 'Recommended: Method 3' in out
+    assert 'Measured: warm rebuild 0.300s, cold build 0.800s' in out
+
+
+def test_slow_copy_changes_the_recommendation(compare_methods, capsys):
+    slow = dict(BENCHMARK)
+    slow['Method 3: build-docs.py (copy)'] = {'cold': timing(9.0), 'warm': timing(4.0)}
+
+    compare_methods.generate_comparison_table(method_results(), INFO, compare_methods.method_timings(slow))
+
+    assert 'Recommended: Method 1: Symlinks' in capsys.readouterr().out
+
+
+def test_without_benchmark_the_rating_is_printed(compare_methods, capsys):
+    compare_methods.generate_comparison_table(method_results(), INFO)
+
+    assert 'Runtime Performance' in capsys.readouterr().out
+
+
+def test_runs_must_be_at_least_one(compare_methods):
+    assert compare_methods.positive_int('3') == 3
+    with pytest.raises(argparse.ArgumentTypeError):
+        compare_methods.positive_int('0')
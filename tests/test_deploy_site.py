@@ -0,0 +1,92 @@
+"""Tests for the incremental gh-pages deploy against a local bare remote."""
+
+import argparse
+
+import pytest
+
+from conftest import git, load_script, write
+
+
+@pytest.fixture
+def deploy_site():
+    return load_script('deploy-site.py')
+
+
+@pytest.fixture
+def repo(workdir):
+    """A working repository with one commit and a bare remote, like a CI checkout."""
+    remote = workdir / 'remote.git'
+    git('init', '--quiet', '--bare', str(remote), cwd=workdir)
+    work = workdir / 'work'
+    work.mkdir()
+    git('init', '--quiet', cwd=work)
+    write(work / 'README.md', '# Docs\n')
+    git('add', 'README.md', cwd=work)
+    git('commit', '--quiet', '-m', 'Initial commit', cwd=work)
+    git('remote', 'add', 'origin', str(remote), cwd=work)
+    return work, remote
+
+
+def deploy(deploy_site, site_dir, monkeypatch, work, output):
+    monkeypatch.chdir(work)
+    monkeypatch.setenv('GITHUB_OUTPUT', str(output))
+    args = argparse.Namespace(
+        site_dir=site_dir, remote='origin', branch='gh-pages', message='Update documentation',
+        jekyll=False, jobs=2, dry_run=False, no_push=False
+    )
+    assert deploy_site.deploy(args) == 0
+
+
+def remote_files(remote):
+    listing = git('ls-tree', '-r', '--name-only', 'gh-pages', cwd=remote)
+    return {name: git('show', f'gh-pages:{name}', cwd=remote) for name in listing.split()}
+
+
+def test_deploys_added_changed_and_deleted_files(deploy_site, repo, workdir, monkeypatch):
+    work, remote = repo
+    site = workdir / 'site'
+    write(site / 'index.html', '<h1>Home</h1>\n')
+    write(site / 'guide/index.html', '<h1>Guide</h1>\n')
+    output = workdir / 'output.txt'
+
+    deploy(deploy_site, site, monkeypatch, work, output)
+    assert remote_files(remote) == {
+        '.nojekyll': '', 'index.html': '<h1>Home</h1>\n', 'guide/index.html': '<h1>Guide</h1>\n',
+    }
+
+    write(site / 'index.html', '<h1>Home, updated</h1>\n')
+    (site / 'guide/index.html').unlink()
+    write(site / 'about/index.html', '<h1>About</h1>\n')
+    deploy(deploy_site, site, monkeypatch, work, output)
+
+    assert remote_files(remote) == {
+        '.nojekyll': '', 'index.html': '<h1>Home, updated</h1>\n', 'about/index.html': '<h1>About</h1>\n',
+    }
+    assert git('rev-list', '--count', 'gh-pages', cwd=remote).strip() == '2'
+    assert output.read_text().splitlines() == ['deployed=true', 'deployed=true']
+
+
+def test_unchanged_site_skips_commit_and_push(deploy_site, repo, workdir, monkeypatch):
+    work, remote = repo
+    site = workdir / 'site'
+    write(site / 'index.html', '<h1>Home</h1>\n')
+    output = workdir / 'output.txt'
+    deploy(deploy_site, site, monkeypatch, work, output)
+    tip = git('rev-parse', 'gh-pages', cwd=remote)
+
+    deploy(deploy_site, site, monkeypatch, work, output)
+
+    assert git('rev-parse', 'gh-pages', cwd=remote) == tip
+    assert output.read_text().splitlines()[-1] == 'deployed=false'
+
+
+def test_fetching_the_tip_keeps_a_full_clone_unshallow(deploy_site, repo, workdir, monkeypatch):
+    work, _ = repo
+    site = workdir / 'site'
+    write(site / 'index.html', '<h1>Home</h1>\n')
+    output = workdir / 'output.txt'
+    deploy(deploy_site, site, monkeypatch, work, output)
+    deploy(deploy_site, site, monkeypatch, work, output)
+
+    assert git('rev-parse', '--is-shallow-repository', cwd=work).strip() == 'false'
+    assert git('rev-parse', 'refs/deploy/gh-pages', cwd=work).strip()
@@ -0,0 +1,110 @@
+"""Tests for the external link checker against a local HTTP server."""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import write
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self, send_body: bool) -> None:
+        self.server.requests.append((self.command, self.path))
+        if self.path == '/slow':
+            time.sleep(1.0)
+        if self.path == '/redirect':
+            self.send_response(301)
+            self.send_header('Location', '/ok')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        status = 200 if self.path in ('/ok', '/slow', '/auto', '/bare') else 404
+        body = b'hello' if status == 200 else b'not found'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base_url(server) -> str:
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def test_status_redirect_and_timeout(build_docs, server):
+    base = base_url(server)
+    checker = build_docs.ExternalLinkChecker(timeout=0.3)
+
+    records = asyncio.run(checker.run([f'{base}/ok', f'{base}/missing', f'{base}/redirect', f'{base}/slow']))
+
+    assert records[f'{base}/ok']['ok'] and records[f'{base}/ok']['status'] == 200
+    assert not records[f'{base}/missing']['ok'] and records[f'{base}/missing']['status'] == 404
+    assert records[f'{base}/redirect']['ok']
+    assert records[f'{base}/redirect']['final_url'] == f'{base}/ok'
+    assert not records[f'{base}/slow']['ok'] and 'error' in records[f'{base}/slow']
+
+
+def test_missing_page_is_confirmed_with_get(build_docs, server):
+    base = base_url(server)
+    asyncio.run(build_docs.ExternalLinkChecker().run([f'{base}/missing']))
+
+    assert server.requests == [('HEAD', '/missing'), ('GET', '/missing')]
+
+
+def test_check_external_links_reports_failures_and_caches_results(build_docs, workdir, server):
+    base = base_url(server)
+    docs_dir = workdir / 'docs'
+    write(docs_dir / 'index.md', '\n'.join([
+        f'[ok]({base}/ok) and [gone]({base}/missing)',
+        f'Autolink <{base}/auto> and bare {base}/bare.',
+        f'Moved: [redirect]({base}/redirect)',
+    ]))
+
+    errors = build_docs.check_external_links(docs_dir)
+
+    assert errors == [f"index.md:1: external link '{base}/missing' failed (HTTP 404)"]
+    requested = {path for _, path in server.requests}
+    assert {'/ok', '/missing', '/auto', '/bare', '/redirect'} <= requested
+
+    server.requests.clear()
+    assert build_docs.check_external_links(docs_dir) == errors
+    assert server.requests == []
+
+
+def test_bare_urls_and_autolinks_are_extracted(build_docs):
+    text = (
+        'See <https://a.example/x>, https://b.example/y. and (https://c.example/z)\n'
+        '`https://code.example/` [t](https://d.example/q)\n'
+    )
+
+    links = [target for _, target in build_docs.parse_markdown_links(text)['links']]
+
+    assert sorted(links) == [
+        'https://a.example/x', 'https://b.example/y', 'https://c.example/z', 'https://d.example/q',
+    ]
@@ -0,0 +1,87 @@
+"""Tests for the build fingerprint used to skip unchanged builds."""
+
+from argparse import Namespace
+
+from conftest import git, write
+
+
+def make_tree(root):
+    write(root / 'zensical.toml', '[project]\nsite_name = "Test"\n')
+    write(root / 'docs/index.md', '# Home\n')
+    write(root / 'projects/alpha/docs/index.md', '# Alpha\n')
+
+
+def fingerprint(build_docs, root, options=None):
+    key, _ = build_docs.compute_fingerprint(
+        root / 'projects', root / 'zensical.toml', root / 'docs', ['alpha'], options=options
+    )
+    return key
+
+
+def options(**overrides):
+    args = Namespace(transforms=[], materialize='copy', depth=1, only=None)
+    for name, value in overrides.items():
+        setattr(args, name, value)
+    return args
+
+
+def test_fingerprint_is_stable_for_unchanged_inputs(build_docs, workdir):
+    make_tree(workdir)
+    assert fingerprint(build_docs, workdir) == fingerprint(build_docs, workdir)
+
+
+def test_fingerprint_changes_with_project_content(build_docs, workdir):
+    make_tree(workdir)
+    before = fingerprint(build_docs, workdir)
+    write(workdir / 'projects/alpha/docs/index.md', '# Alpha, edited\n')
+    assert fingerprint(build_docs, workdir) != before
+
+
+def test_fingerprint_changes_with_config_and_hand_written_docs(build_docs, workdir):
+    make_tree(workdir)
+    before = fingerprint(build_docs, workdir)
+    write(workdir / 'zensical.toml', '[project]\nsite_name = "Other"\n')
+    after_config = fingerprint(build_docs, workdir)
+    write(workdir / 'docs/about.md', '# About\n')
+
+    assert after_config != before
+    assert fingerprint(build_docs, workdir) != after_config
+
+
+def test_fingerprint_ignores_generated_project_copies(build_docs, workdir):
+    make_tree(workdir)
+    before = fingerprint(build_docs, workdir)
+    write(workdir / 'docs/alpha/index.md', '# Alpha\n')
+    write(workdir / 'docs/.gitignore', 'alpha/\n')
+    assert fingerprint(build_docs, workdir) == before
+
+
+def test_fingerprint_is_none_for_dirty_checkout(build_docs, workdir):
+    make_tree(workdir)
+    project = workdir / 'projects/alpha'
+    git('init', '-q', cwd=project)
+    git('add', '-A', cwd=project)
+    git('commit', '-q', '-m', 'init', cwd=project)
+    assert fingerprint(build_docs, workdir) is not None
+
+    write(project / 'docs/index.md', '# Alpha, uncommitted\n')
+
+    assert fingerprint(build_docs, workdir) is None
+
+
+def test_fingerprint_changes_with_build_options(build_docs, workdir):
+    make_tree(workdir)
+    plain = build_docs.fingerprint_options(options())
+    with_metadata = build_docs.fingerprint_options(options(transforms=['git-metadata']))
+
+    assert fingerprint(build_docs, workdir, plain) != fingerprint(build_docs, workdir, with_metadata)
+
+
+def test_fingerprint_options_are_normalized(build_docs):
+    a = build_docs.fingerprint_options(options(transforms=['mdx', 'snippets'], only='beta, alpha', depth=5))
+    b = build_docs.fingerprint_options(options(transforms=['snippets', 'mdx', 'mdx'], only='alpha,beta', depth=1))
+    assert a == b
+
+    deep = build_docs.fingerprint_options(options(transforms=['git-metadata'], depth=5))
+    shallow = build_docs.fingerprint_options(options(transforms=['git-metadata'], depth=1))
+    assert deep != shallow
@@ -0,0 +1,86 @@
+"""Tests for staged project builds and rollback."""
+
+import pytest
+
+from conftest import write
+
+
+@pytest.fixture
+def docs_dir(workdir):
+    docs = workdir / 'docs'
+    write(docs / 'alpha/index.md', 'old\n')
+    return docs
+
+
+def stage_page(generations, name, text):
+    staged = generations.stage(name)
+    write(staged / 'index.md', text)
+    return staged
+
+
+def test_commit_swaps_in_and_keeps_previous_generation(build_docs, docs_dir):
+    generations = build_docs.DocsGenerations(docs_dir)
+    stage_page(generations, 'alpha', 'new\n')
+
+    method = generations.commit('alpha')
+
+    assert method in ('exchange', 'rename')
+    assert (docs_dir / 'alpha/index.md').read_text() == 'new\n'
+    assert (generations.previous_dir / 'alpha/index.md').read_text() == 'old\n'
+    assert not (generations.staging_dir / 'alpha').exists()
+    assert generations.available() == ['alpha']
+
+
+def test_new_project_is_renamed_into_place(build_docs, docs_dir):
+    generations = build_docs.DocsGenerations(docs_dir)
+    stage_page(generations, 'beta', 'beta\n')
+
+    assert generations.commit('beta') == 'new'
+    assert (docs_dir / 'beta/index.md').read_text() == 'beta\n'
+    assert generations.available() == []
+
+
+def test_rename_fallback_without_exchange(build_docs, docs_dir, monkeypatch):
+    monkeypatch.setattr(build_docs, 'exchange_paths', lambda a, b: False)
+    generations = build_docs.DocsGenerations(docs_dir)
+    stage_page(generations, 'alpha', 'new\n')
+
+    assert generations.commit('alpha') == 'rename'
+    assert (docs_dir / 'alpha/index.md').read_text() == 'new\n'
+    assert (generations.previous_dir / 'alpha/index.md').read_text() == 'old\n'
+
+
+def test_rollback_swaps_generations_back_and_forth(build_docs, docs_dir):
+    generations = build_docs.DocsGenerations(docs_dir)
+    stage_page(generations, 'alpha', 'new\n')
+    generations.commit('alpha')
+
+    generations.rollback('alpha')
+    assert (docs_dir / 'alpha/index.md').read_text() == 'old\n'
+    assert (generations.previous_dir / 'alpha/index.md').read_text() == 'new\n'
+
+    generations.rollback('alpha')
+    assert (docs_dir / 'alpha/index.md').read_text() == 'new\n'
+
+
+def test_rollback_without_previous_generation_fails(build_docs, docs_dir):
+    with pytest.raises(FileNotFoundError):
+        build_docs.DocsGenerations(docs_dir).rollback('alpha')
+
+
+def test_failed_copy_leaves_docs_untouched(build_docs, docs_dir, workdir, monkeypatch):
+    write(workdir / 'projects/alpha/docs/index.md', 'new\n')
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(build_docs, 'copy_record', fail)
+    generations = build_docs.DocsGenerations(docs_dir)
+
+    copied, errors = build_docs.copy_project_docs(
+        {'alpha': 'projects/alpha/docs'}, docs_dir, generations=generations
+    )
+
+    assert copied == 0 and 'disk full' in errors[0]
+    assert (docs_dir / 'alpha/index.md').read_text() == 'old\n'
+    assert not (generations.staging_dir / 'alpha').exists()
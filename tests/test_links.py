@@ -0,0 +1,99 @@
+"""Tests for the Markdown link parser and the internal link checker."""
+
+from conftest import write
+
+
+def test_heading_anchors_follow_toc_slugs(build_docs):
+    text = (
+        '# Getting Started\n'
+        '## Install `pip`\n'
+        '## Getting Started\n'
+        '## Custom {#my-anchor}\n'
+        'Setext Title\n'
+        '============\n'
+        'Second Setext\n'
+        '---\n'
+        '<div id="raw-id"></div>\n'
+    )
+
+    anchors = build_docs.parse_markdown_links(text)['anchors']
+
+    assert anchors == [
+        'getting-started',
+        'install',
+        'getting-started_1',
+        'my-anchor',
+        'setext-title',
+        'second-setext',
+        'raw-id',
+    ]
+
+
+def test_links_are_collected_with_line_numbers(build_docs):
+    text = (
+        'See [setup](guide/setup.md#install) and ![logo](img/logo.png).\n'
+        '\n'
+        '[ref]: other.md\n'
+        '<a href="page.md">page</a>\n'
+    )
+
+    links = build_docs.parse_markdown_links(text)['links']
+
+    assert links == [
+        [1, 'guide/setup.md#install'],
+        [1, 'img/logo.png'],
+        [3, 'other.md'],
+        [4, 'page.md'],
+    ]
+
+
+def test_code_is_ignored(build_docs):
+    text = (
+        '```python\n'
+        '# not a heading\n'
+        '[not](a-link.md)\n'
+        '```\n'
+        'Inline `[nope](nope.md)` code.\n'
+        '~~~~\n'
+        '```\n'
+        '# still code\n'
+        '~~~~\n'
+        '# Real\n'
+    )
+
+    result = build_docs.parse_markdown_links(text)
+
+    assert result == {'anchors': ['real'], 'links': []}
+
+
+def test_check_links_reports_broken_links_and_anchors(build_docs, workdir):
+    docs = workdir / 'docs'
+    write(docs / 'index.md', (
+        '# Home\n'
+        '[ok](guide/setup.md#install)\n'
+        '[bad anchor](guide/setup.md#nowhere)\n'
+        '[missing](guide/gone.md)\n'
+        '[self](#home)\n'
+        '[external](https://example.com/)\n'
+    ))
+    write(docs / 'guide/setup.md', '# Setup\n## Install\n')
+
+    errors = build_docs.check_links(docs)
+
+    assert errors == [
+        "index.md:3: missing anchor '#nowhere' in guide/setup.md",
+        "index.md:4: broken link 'guide/gone.md'",
+    ]
+
+
+def test_check_links_reuses_cached_parses(build_docs, workdir, capsys):
+    docs = workdir / 'docs'
+    write(docs / 'index.md', '# Home\n[setup](setup.md)\n')
+    write(docs / 'setup.md', '# Setup\n')
+    build_docs.check_links(docs)
+    capsys.readouterr()
+
+    write(docs / 'setup.md', '# Setup, edited\n')
+    assert build_docs.check_links(docs) == []
+
+    assert '(1 parsed, 1 cached)' in capsys.readouterr().out
@@ -0,0 +1,33 @@
+"""Tests for building a subset of projects with --only."""
+
+import subprocess
+import sys
+
+from conftest import SCRIPTS_DIR, write
+
+CONFIG = '''[project]
+site_name = "Test"
+nav = [
+  { "Home" = "index.md" },
+  { "Alpha" = "alpha/index.md" },
+  { "Beta" = "beta/index.md" },
+]
+'''
+
+
+def test_only_leaves_other_projects_in_docs(workdir):
+    write(workdir / 'zensical.toml', CONFIG)
+    write(workdir / 'docs/index.md', '# Home\n')
+    for name in ('alpha', 'beta'):
+        write(workdir / f'projects/{name}/docs/index.md', f'# {name}\n')
+    build = [sys.executable, str(SCRIPTS_DIR / 'build-docs.py'), '--no-update']
+    subprocess.run(build, cwd=workdir, check=True, capture_output=True)
+    write(workdir / 'projects/alpha/docs/index.md', '# alpha, edited\n')
+
+    subprocess.run(build + ['--only', 'alpha'], cwd=workdir, check=True, capture_output=True)
+
+    assert (workdir / 'docs/alpha/index.md').read_text() == '# alpha, edited\n'
+    assert (workdir / 'docs/beta/index.md').read_text() == '# beta\n'
+    only_config = (workdir / 'zensical.only.toml').read_text()
+    assert 'alpha/index.md' in only_config
+    assert 'beta/index.md' not in only_config
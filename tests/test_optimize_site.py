@@ -0,0 +1,52 @@
+"""Tests for the compressed siblings written by optimize-site.py."""
+
+import gzip
+
+import pytest
+
+from conftest import load_script, write
+
+PAGE = '<html>\n  <body>\n' + '    <p>Soliplex documentation page.</p>\n' * 40 + '  </body>\n</html>\n'
+
+
+@pytest.fixture
+def optimize_site():
+    return load_script('optimize-site.py')
+
+
+@pytest.fixture
+def site(workdir):
+    site_dir = workdir / 'site'
+    write(site_dir / 'index.html', PAGE)
+    write(site_dir / 'sitemap.xml', '<urlset></urlset>\n')
+    (site_dir / 'sitemap.xml.gz').write_bytes(gzip.compress(b'<urlset></urlset>\n'))
+    return site_dir
+
+
+def test_no_precompress_keeps_siblings_shipped_with_the_site(optimize_site, site):
+    optimize_site.optimize_site(site, jobs=1, precompress=False)
+
+    assert (site / 'sitemap.xml.gz').exists()
+    assert not (site / 'index.html.gz').exists()
+
+
+def test_precompress_writes_siblings_and_turning_it_off_removes_only_ours(optimize_site, site):
+    totals = optimize_site.optimize_site(site, jobs=1, precompress=True)
+    assert totals['gz_bytes'] > 0
+    assert (site / 'index.html.gz').exists()
+
+    optimize_site.optimize_site(site, jobs=1, precompress=False)
+
+    assert not (site / 'index.html.gz').exists()
+    assert (site / 'sitemap.xml.gz').exists()
+
+
+def test_orphans_are_removed_only_when_written_by_the_optimizer(optimize_site, site):
+    (site / 'feed.xml.gz').write_bytes(gzip.compress(b'<feed/>'))
+    optimize_site.optimize_site(site, jobs=1, precompress=True)
+    (site / 'index.html').unlink()
+
+    optimize_site.optimize_site(site, jobs=1, precompress=True)
+
+    assert not (site / 'index.html.gz').exists()
+    assert (site / 'feed.xml.gz').exists()
@@ -0,0 +1,49 @@
+"""Tests for splitting a zensical search index into shards."""
+
+import json
+
+import pytest
+
+from conftest import load_script, write
+
+CONFIG = '''
+[project]
+nav = [
+  { "Home" = "index.md" },
+  { "Core Platform" = [ { "Overview" = "soliplex/index.md" }, "soliplex/setup.md" ] },
+]
+'''
+
+
+@pytest.fixture
+def shard():
+    return load_script('shard-search-index.py')
+
+
+def test_zensical_items_index_is_sharded_by_section(shard, workdir):
+    site = workdir / 'site'
+    write(site / 'search.json', json.dumps({'config': {'lang': ['en']}, 'items': [
+        {'location': '', 'title': 'Home', 'text': ''},
+        {'location': 'soliplex/', 'title': 'Overview', 'text': ''},
+        {'location': 'soliplex/setup/#install', 'title': 'Install', 'text': ''},
+        {'location': 'soliplex/unlisted/', 'title': 'Unlisted', 'text': ''},
+    ]}))
+    config = write(workdir / 'zensical.toml', CONFIG)
+
+    index_path = shard.find_search_index(site)
+    index = json.loads(index_path.read_text())
+    sections, order, _ = shard.load_sections(config)
+    shards = shard.shard_index(index, 'section', sections, order)
+    manifest = shard.write_shards(site, index_path, index, shards, 'section')
+
+    assert list(shards) == ['Home', 'Core Platform']
+    assert len(shards['Core Platform']) == 3
+    assert manifest['key'] == 'items'
+    written = json.loads((site / 'search/shards/core-platform.json').read_text())
+    assert written['config'] == {'lang': ['en']}
+    assert [doc['title'] for doc in written['items']] == ['Overview', 'Install', 'Unlisted']
+
+
+def test_mkdocs_docs_layout_is_still_recognized(shard):
+    assert shard.index_key({'docs': [{'location': 'a/'}]}) == 'docs'
+    assert shard.index_key({'config': {}}) is None
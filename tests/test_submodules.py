@@ -0,0 +1,85 @@
+"""Tests for the shallow, sparse, concurrent submodule update."""
+
+import pytest
+
+from conftest import git, write
+
+SUBMODULES = ['alpha', 'beta']
+
+
+def commit_all(work, message):
+    git('add', '-A', cwd=work)
+    git('commit', '--quiet', '-m', message, cwd=work)
+    git('push', '--quiet', 'origin', 'HEAD:refs/heads/main', cwd=work)
+
+
+@pytest.fixture
+def superproject(workdir):
+    """A repository whose .gitmodules points at local bare remotes with three commits each."""
+    works = {}
+    for name in SUBMODULES:
+        bare = workdir / 'remotes' / f'{name}.git'
+        bare.parent.mkdir(parents=True, exist_ok=True)
+        git('init', '--quiet', '--bare', str(bare), cwd=workdir)
+        work = workdir / 'work' / name
+        work.mkdir(parents=True)
+        git('init', '--quiet', cwd=work)
+        git('remote', 'add', 'origin', str(bare), cwd=work)
+        write(work / 'README.md', f'# {name}\n')
+        write(work / 'src/main.py', 'print()\n')
+        for i in range(3):
+            write(work / 'docs/index.md', f'# {name} {i}\n')
+            commit_all(work, f'Commit {i}')
+        works[name] = work
+
+    root = workdir / 'super'
+    root.mkdir()
+    git('init', '--quiet', cwd=root)
+    write(root / '.gitmodules', ''.join(
+        f'[submodule "projects/{name}"]\n'
+        f'\tpath = projects/{name}\n'
+        f'\turl = file://{workdir}/remotes/{name}.git\n'
+        f'\tbranch = main\n'
+        for name in SUBMODULES
+    ))
+    return root, works
+
+
+def test_shallow_sparse_concurrent_update(build_docs, superproject):
+    root, _ = superproject
+
+    assert build_docs.update_submodules(jobs=2, depth=1, repo_root=root)
+
+    for name in SUBMODULES:
+        path = root / 'projects' / name
+        assert (path / 'docs/index.md').read_text() == f'# {name} 2\n'
+        assert (path / 'README.md').exists()
+        assert not (path / 'src').exists()
+        assert git('rev-parse', '--is-shallow-repository', cwd=path).strip() == 'true'
+        assert git('rev-list', '--count', 'HEAD', cwd=path).strip() == '1'
+
+
+def test_existing_submodule_moves_to_new_tip(build_docs, superproject):
+    root, works = superproject
+    build_docs.update_submodules(jobs=2, depth=1, repo_root=root)
+    write(works['alpha'] / 'docs/index.md', '# alpha 3\n')
+    commit_all(works['alpha'], 'Commit 3')
+
+    assert build_docs.update_submodules(jobs=2, depth=1, repo_root=root)
+
+    path = root / 'projects/alpha'
+    assert (path / 'docs/index.md').read_text() == '# alpha 3\n'
+    assert not (path / 'src').exists()
+
+
+def test_depth_zero_unshallows_existing_submodules(build_docs, superproject):
+    root, _ = superproject
+    build_docs.update_submodules(jobs=2, depth=1, repo_root=root)
+
+    assert build_docs.update_submodules(jobs=2, depth=0, repo_root=root)
+
+    for name in SUBMODULES:
+        path = root / 'projects' / name
+        assert git('rev-parse', '--is-shallow-repository', cwd=path).strip() == 'false'
+        assert git('rev-list', '--count', 'HEAD', cwd=path).strip() == '3'
+        assert not (path / 'src').exists()
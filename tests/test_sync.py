@@ -0,0 +1,103 @@
+"""Tests for the manifest-driven sync of project docs into docs/."""
+
+import os
+from pathlib import Path
+
+from conftest import write
+
+
+def sources_of(root: Path):
+    return {p.relative_to(root).as_posix(): p for p in root.rglob('*') if p.is_file()}
+
+
+def test_first_sync_adds_everything_and_records_it(build_docs, workdir):
+    src = workdir / 'src'
+    write(src / 'index.md', '# Home\n')
+    write(src / 'guide/setup.md', '# Setup\n')
+
+    manifest, stats = build_docs.sync_tree(sources_of(src), workdir / 'dest', {})
+
+    assert stats['added'] == 2 and stats['unchanged'] == 0
+    assert (workdir / 'dest/guide/setup.md').read_text() == '# Setup\n'
+    record = manifest['guide/setup.md']
+    st = (src / 'guide/setup.md').stat()
+    assert record['size'] == st.st_size
+    assert record['mtime_ns'] == st.st_mtime_ns
+    assert record['sha256'] == build_docs.hash_file(src / 'guide/setup.md')
+    assert record['mode'] == 'copy'
+
+
+def test_second_sync_skips_unchanged_files(build_docs, workdir):
+    src = workdir / 'src'
+    write(src / 'index.md', '# Home\n')
+    manifest, _ = build_docs.sync_tree(sources_of(src), workdir / 'dest', {})
+
+    _, stats = build_docs.sync_tree(sources_of(src), workdir / 'dest', manifest)
+
+    assert stats == {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 1, 'bytes': 0}
+
+
+def test_touched_file_with_same_content_is_not_rewritten(build_docs, workdir):
+    src = workdir / 'src'
+    page = write(src / 'index.md', '# Home\n')
+    manifest, _ = build_docs.sync_tree(sources_of(src), workdir / 'dest', {})
+    dest_inode = (workdir / 'dest/index.md').stat().st_ino
+    os.utime(page, ns=(1, 1))
+
+    new_manifest, stats = build_docs.sync_tree(sources_of(src), workdir / 'dest', manifest)
+
+    assert stats['unchanged'] == 1
+    assert (workdir / 'dest/index.md').stat().st_ino == dest_inode
+    assert new_manifest['index.md']['mtime_ns'] == 1
+
+
+def test_changed_and_deleted_sources(build_docs, workdir):
+    src = workdir / 'src'
+    write(src / 'index.md', '# Home\n')
+    write(src / 'old/page.md', '# Old\n')
+    manifest, _ = build_docs.sync_tree(sources_of(src), workdir / 'dest', {})
+    write(src / 'index.md', '# Home, longer\n')
+    (src / 'old/page.md').unlink()
+
+    new_manifest, stats = build_docs.sync_tree(sources_of(src), workdir / 'dest', manifest)
+
+    assert stats['updated'] == 1 and stats['deleted'] == 1
+    assert (workdir / 'dest/index.md').read_text() == '# Home, longer\n'
+    assert not (workdir / 'dest/old').exists()
+    assert set(new_manifest) == {'index.md'}
+
+
+def test_files_from_another_mode_are_recreated(build_docs, workdir):
+    src = workdir / 'src'
+    write(src / 'index.md', '# Home\n')
+    manifest, _ = build_docs.sync_tree(sources_of(src), workdir / 'dest', {})
+
+    engine = build_docs.CopyEngine(mode='hardlink')
+    new_manifest, stats = build_docs.sync_tree(sources_of(src), workdir / 'dest', manifest, engine)
+
+    assert stats['updated'] == 1
+    assert new_manifest['index.md']['mode'] == 'hardlink'
+    assert (workdir / 'dest/index.md').stat().st_ino == (src / 'index.md').stat().st_ino
+
+
+def test_clean_copy_writes_manifest_for_incremental_sync(build_docs, workdir):
+    write(workdir / 'projects/alpha/docs/index.md', '# Alpha\n')
+    write(workdir / 'projects/alpha/docs/api/ref.md', '# Ref\n')
+    write(workdir / 'projects/beta/README.md', '# Beta\n')
+    docs_dir = workdir / 'docs'
+    docs_dir.mkdir()
+    projects = {'alpha': 'projects/alpha/docs'}
+
+    generations = build_docs.DocsGenerations(docs_dir)
+    build_docs.copy_project_docs(projects, docs_dir, generations=generations)
+    build_docs.copy_readme_only_projects(['beta'], docs_dir, generations=generations)
+
+    assert set(build_docs.load_manifest('alpha')) == {'index.md', 'api/ref.md'}
+    assert set(build_docs.load_manifest('beta')) == {'index.md'}
+
+    stats = {}
+    build_docs.sync_project_docs(projects, docs_dir, project_stats=stats)
+    build_docs.sync_readme_only_projects(['beta'], docs_dir, project_stats=stats)
+
+    assert stats['alpha']['files_moved'] == 0
+    assert stats['beta']['files_moved'] == 0
@@ -0,0 +1,104 @@
+"""Tests for the batched repository docs sync against local bare repositories."""
+
+import argparse
+
+import pytest
+
+from conftest import git, load_script, write
+
+
+@pytest.fixture
+def sync_repo_docs():
+    return load_script('sync-repo-docs.py')
+
+
+def make_remote(root, repo, files):
+    """Create root/<repo>.git with one commit holding files; returns its work tree."""
+    bare = root / f'{repo}.git'
+    bare.parent.mkdir(parents=True, exist_ok=True)
+    git('init', '--quiet', '--bare', str(bare), cwd=root)
+    work = root / 'work' / repo
+    work.mkdir(parents=True)
+    git('init', '--quiet', cwd=work)
+    for rel, text in files.items():
+        write(work / rel, text)
+    git('add', '-A', cwd=work)
+    git('commit', '--quiet', '-m', 'Initial commit', cwd=work)
+    git('remote', 'add', 'origin', str(bare), cwd=work)
+    git('push', '--quiet', 'origin', 'HEAD:refs/heads/main', cwd=work)
+    return work
+
+
+def push_change(work, rel, text):
+    write(work / rel, text)
+    git('commit', '--quiet', '-am', f'Update {rel}', cwd=work)
+    git('push', '--quiet', 'origin', 'HEAD:refs/heads/main', cwd=work)
+
+
+@pytest.fixture
+def remotes(workdir):
+    root = workdir / 'remotes'
+    alpha = make_remote(root, 'soliplex/alpha', {
+        'docs/index.md': '# Alpha\n', 'docs/guide.md': '# Guide\n', 'src/big.bin': 'x' * 4096,
+    })
+    make_remote(root, 'soliplex/beta', {'README.md': '# Beta\n', 'src/main.py': 'print()\n'})
+    entries = [
+        {'repo': 'soliplex/alpha', 'target': 'out/alpha', 'source': 'docs'},
+        {'repo': 'soliplex/beta', 'target': 'out/beta', 'source': 'README.md'},
+    ]
+    return root, alpha, entries
+
+
+def run(sync_repo_docs, root, entries, force=False):
+    args = argparse.Namespace(base_url=f'file://{root}', ref='main', jobs=4, force=force)
+    return sync_repo_docs.sync_all(entries, args)
+
+
+def test_first_sync_copies_only_the_listed_paths(sync_repo_docs, workdir, remotes, capsys):
+    root, _, entries = remotes
+
+    assert run(sync_repo_docs, root, entries) == 0
+
+    assert sorted(p.name for p in (workdir / 'out/alpha').iterdir()) == ['guide.md', 'index.md']
+    assert (workdir / 'out/beta/README.md').read_text() == '# Beta\n'
+    assert '(0 unchanged, 2 synced)' in capsys.readouterr().out
+    mirror = sync_repo_docs.mirror_path('soliplex/alpha')
+    assert not (mirror / 'src').exists()
+    assert git('rev-parse', '--is-shallow-repository', cwd=mirror).strip() == 'true'
+
+
+def test_second_run_is_answered_by_ls_remote(sync_repo_docs, workdir, remotes, capsys, monkeypatch):
+    root, _, entries = remotes
+    run(sync_repo_docs, root, entries)
+    capsys.readouterr()
+    monkeypatch.setattr(sync_repo_docs, 'update_mirror', lambda *args: pytest.fail('fetched'))
+
+    assert run(sync_repo_docs, root, entries) == 0
+
+    out = capsys.readouterr().out
+    assert out.count(' unchanged → ') == 2
+    assert '(2 unchanged, 0 synced)' in out
+
+
+def test_only_changed_repositories_are_fetched_again(sync_repo_docs, workdir, remotes, capsys):
+    root, alpha, entries = remotes
+    run(sync_repo_docs, root, entries)
+    push_change(alpha, 'docs/index.md', '# Alpha, updated\n')
+    capsys.readouterr()
+
+    assert run(sync_repo_docs, root, entries) == 0
+
+    assert (workdir / 'out/alpha/index.md').read_text() == '# Alpha, updated\n'
+    assert '(1 unchanged, 1 synced)' in capsys.readouterr().out
+
+
+def test_force_syncs_unchanged_entries(sync_repo_docs, workdir, remotes, capsys):
+    root, _, entries = remotes
+    run(sync_repo_docs, root, entries)
+    (workdir / 'out/alpha/stray.md').write_text('left over\n')
+    capsys.readouterr()
+
+    assert run(sync_repo_docs, root, entries, force=True) == 0
+
+    assert '(0 unchanged, 2 synced)' in capsys.readouterr().out
+    assert not (workdir / 'out/alpha/stray.md').exists()
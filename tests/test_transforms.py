@@ -0,0 +1,71 @@
+"""Tests for the content transform pipeline and its output cache."""
+
+import pytest
+
+from conftest import write
+
+
+def make_pipeline(build_docs, root, names=('front-matter',), repo_urls=None):
+    return build_docs.TransformPipeline(list(names), repo_urls, store=root / 'store')
+
+
+def test_plan_renames_mdx_and_skips_untouched_files(build_docs, workdir):
+    pipeline = make_pipeline(build_docs, workdir, ['mdx'])
+
+    dest_rel, ctx = pipeline.plan('alpha', 'docs', 'guide.mdx', 'alpha/guide.mdx')
+    assert dest_rel == 'alpha/guide.md'
+    assert [t.name for t in ctx.chain] == ['mdx', 'mdx-links']
+
+    assert pipeline.plan('alpha', 'docs', 'logo.png', 'alpha/logo.png') == ('alpha/logo.png', None)
+
+
+def test_render_is_cached_until_the_source_changes(build_docs, workdir):
+    src = write(workdir / 'page.md', '# Page\n')
+    pipeline = make_pipeline(build_docs, workdir)
+    _, ctx = pipeline.plan('alpha', 'docs', 'page.md', 'alpha/page.md')
+
+    first = pipeline.render(src, ctx)
+    second = pipeline.render(src, ctx)
+    assert (pipeline.hits, pipeline.misses) == (1, 1)
+    assert first == second
+    assert 'source_project: "alpha"' in first.read_text()
+
+    write(src, '# Page, edited\n')
+    third = pipeline.render(src, ctx)
+    assert (pipeline.hits, pipeline.misses) == (1, 2)
+    assert third != first and '# Page, edited' in third.read_text()
+
+
+def test_changed_transform_signature_invalidates_cache(build_docs, workdir, monkeypatch):
+    src = write(workdir / 'page.md', '# Page\n')
+    pipeline = make_pipeline(build_docs, workdir, repo_urls={'alpha': 'https://example.com/a'})
+    _, ctx = pipeline.plan('alpha', 'docs', 'page.md', 'alpha/page.md')
+    pipeline.render(src, ctx)
+
+    moved = make_pipeline(build_docs, workdir, repo_urls={'alpha': 'https://example.com/b'})
+    _, ctx = moved.plan('alpha', 'docs', 'page.md', 'alpha/page.md')
+    out = moved.render(src, ctx)
+    assert moved.misses == 1
+    assert 'https://example.com/b/blob/HEAD/docs/page.md' in out.read_text()
+
+    monkeypatch.setattr(build_docs.SourceFrontMatter, 'version', 2)
+    bumped = make_pipeline(build_docs, workdir, repo_urls={'alpha': 'https://example.com/b'})
+    _, ctx = bumped.plan('alpha', 'docs', 'page.md', 'alpha/page.md')
+    bumped.render(src, ctx)
+    assert (bumped.hits, bumped.misses) == (0, 1)
+
+
+def test_unchanged_output_is_cached_as_marker(build_docs, workdir):
+    src = write(workdir / 'page.md', '# Page\n')
+    pipeline = make_pipeline(build_docs, workdir, ['mdx'])
+    _, ctx = pipeline.plan('alpha', 'docs', 'page.md', 'alpha/page.md')
+
+    assert pipeline.render(src, ctx) is None
+    assert pipeline.render(src, ctx) is None
+    assert (pipeline.hits, pipeline.misses) == (1, 1)
+    assert not [p for p in (workdir / 'store').rglob('*') if p.is_file() and p.suffix != '.same']
+
+
+def test_unknown_transform_is_rejected(build_docs, workdir):
+    with pytest.raises(ValueError, match='nope'):
+        make_pipeline(build_docs, workdir, ['nope'])
@@ -0,0 +1,53 @@
+"""Tests for the TOML-parsed navigation validation."""
+
+from conftest import write
+
+CONFIG = '''[project]
+site_name = "Test"
+nav = [
+  { "Home" = "index.md" },
+  { "Guide" = [
+    { "Setup" = "guide/setup.md" },
+    "guide/",
+    { "Missing" = "guide/missing.md" },
+  ] },
+  { "Elsewhere" = "https://example.com/" },
+]
+'''
+
+
+def test_valid_nav_passes(build_docs, workdir):
+    write(workdir / 'zensical.toml', CONFIG.replace('guide/missing.md', 'guide/setup.md'))
+    write(workdir / 'docs/index.md', '# Home\n')
+    write(workdir / 'docs/guide/setup.md', '# Setup\n')
+    write(workdir / 'docs/guide/README.md', '# Guide\n')
+
+    assert build_docs.validate_nav(workdir / 'zensical.toml', workdir / 'docs') == []
+
+
+def test_missing_page_is_reported_with_its_breadcrumb(build_docs, workdir):
+    write(workdir / 'zensical.toml', CONFIG)
+    write(workdir / 'docs/index.md', '# Home\n')
+    write(workdir / 'docs/guide/setup.md', '# Setup\n')
+
+    errors = build_docs.validate_nav(workdir / 'zensical.toml', workdir / 'docs')
+
+    assert errors == [
+        'Referenced file not found: guide/ (Guide)',
+        'Referenced file not found: guide/missing.md (Guide › Missing)',
+    ]
+
+
+def test_precomputed_file_index_is_used(build_docs, workdir):
+    write(workdir / 'zensical.toml', CONFIG)
+    files = {'index.md', 'guide/setup.md', 'guide/index.md', 'guide/missing.md'}
+
+    assert build_docs.validate_nav(workdir / 'zensical.toml', workdir / 'docs', files) == []
+
+
+def test_unparseable_config_is_reported(build_docs, workdir):
+    write(workdir / 'zensical.toml', 'nav = [\n')
+
+    errors = build_docs.validate_nav(workdir / 'zensical.toml', workdir / 'docs')
+
+    assert len(errors) == 1 and errors[0].startswith('Failed to parse')